@@ -1,36 +1,99 @@
-from flask import Flask, render_template, request, jsonify, send_file, session
-import os
+from flask import (
+    Flask,
+    render_template,
+    request,
+    jsonify,
+    send_file,
+    session,
+    Response,
+    stream_with_context,
+    g,
+)
+import io
+import queue
+import re
+import time
 import json
-from datetime import datetime, timedelta
-from openai import OpenAI
-import traceback
+import uuid
+import threading
+from datetime import timedelta
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+import logging
 from navertts import NaverTTS
 import secrets
 
 # 프로젝트 모듈 import
 from config import Config
 from services.conversation_service import (
-    save_conversation_history,
+    append_conversation_message,
+    clear_conversation_history,
     load_conversation_history,
+    save_conversation_history,
+)
+from services.tts_job_service import submit_audio_job, get_audio_job
+from services.tts_service import get_cached_playlist, get_tts_cache_stats
+from services.llm_service import complete_chat, stream_chat
+from services.logging_service import (
+    bind_request_id,
+    log_payload,
+    reset_request_id,
+    setup_logging,
+)
+from services.metrics_service import (
+    begin_trace,
+    end_trace,
+    record_request,
+    register_collector,
+    render_metrics,
 )
-from services.tts_service import create_audio_response
-from services.pdf_service import export_conversation_to_pdf, export_conversation_to_txt
+from services.resilience_service import CircuitOpenError
+from services.response_cache_service import get_response_cache
+from services.semantic_cache_service import get_semantic_cache, split_request
+from services.singleflight_service import SingleFlight, make_flight_key
+from services.bulk_export_service import (
+    export_archive_filename,
+    generate_sessions_zip,
+    resolve_session_filenames,
+)
+from services.pdf_service import (
+    export_filename,
+    get_conversation_export,
+    get_export_cache,
+)
+from services.session_store_service import (
+    ServerSideSessionInterface,
+    create_session_interface,
+)
+from services.notification_service import get_scheduler, public_notification
 from services.session_service import (
     save_session,
-    list_sessions,
+    list_sessions_page,
     load_session,
     delete_session,
 )
+from services.context_service import build_context_messages, message_tokens
+from services.summary_service import get_summary_context, schedule_summary_refresh
+from services.search_service import (
+    search,
+    index_conversation,
+    append_to_conversation,
+    index_session,
+    remove_session,
+    is_conversation_indexed,
+)
 from utils import (
-    parse_notification_time,
-    search_in_conversation,
+    parse_notification_times,
     limit_conversation_history,
     validate_session_name,
 )
 
 # 설정 검증 및 디렉토리 생성
-Config.validate_config()
 Config.setup_directories()
+setup_logging()
+Config.validate_config()
+
+logger = logging.getLogger(__name__)
 
 # Initialize Flask app
 app = Flask(__name__, template_folder="app/templates", static_folder="app/static")
@@ -40,12 +103,52 @@ app.config["PERMANENT_SESSION_LIFETIME"] = timedelta(
     days=Config.PERMANENT_SESSION_LIFETIME_DAYS
 )
 
-# Initialize OpenAI client
-client = OpenAI(api_key=Config.OPENAI_API_KEY)
+# 대화 기록이 쿠키에 담기지 않도록 서버 측 세션 저장소 사용
+session_interface = create_session_interface(Config.SESSION_TYPE)
+if session_interface is not None:
+    app.session_interface = session_interface
+
+
+REQUEST_ID_PATTERN = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+
+def make_request_id(header_value: Optional[str]) -> str:
+    """클라이언트/프록시가 보낸 X-Request-ID를 사용하고, 없거나 형식이 다르면 새로 생성"""
+    if header_value and REQUEST_ID_PATTERN.match(header_value):
+        return header_value
+    return uuid.uuid4().hex[:16]
+
+
+@app.before_request
+def start_request_timer():
+    g.request_id = make_request_id(request.headers.get("X-Request-ID"))
+    g.request_id_token = bind_request_id(g.request_id)
+    g.request_started = time.perf_counter()
+    g.trace = begin_trace(f"{request.method} {request.path}", g.request_id)
+
+
+@app.after_request
+def remember_response_status(response):
+    g.response_status = response.status_code
+    response.headers["X-Request-ID"] = g.get("request_id", "")
+    return response
+
+
+@app.teardown_request
+def finish_request_timer(error=None):
+    """요청 처리 시간 기록 (스트리밍 응답은 전송이 끝난 뒤 호출됨)"""
+    started = g.pop("request_started", None)
+    if started is None:
+        return
+    status = 500 if error is not None else g.pop("response_status", 200)
+    record_request(request.endpoint or "unknown", status, time.perf_counter() - started)
+    end_trace(g.pop("trace", None), status)
+    reset_request_id(g.pop("request_id_token"))
+
 
 # Configure Naver TTS
 if Config.NAVER_CLIENT_ID and Config.NAVER_CLIENT_SECRET:
-    print("Naver TTS 설정이 확인되었습니다.")
+    logger.info("Naver TTS 설정이 확인되었습니다.")
     NaverTTS.configure(
         client_id=Config.NAVER_CLIENT_ID,
         client_secret=Config.NAVER_CLIENT_SECRET,
@@ -53,13 +156,43 @@ if Config.NAVER_CLIENT_ID and Config.NAVER_CLIENT_SECRET:
     )
 
 
+# 재시작 전에 예약된 알림도 발송되도록 시작할 때 불러옴
+get_scheduler()
+
 # 중복 함수 제거됨 - 서비스 모듈 사용
 
+# 스트리밍 응답은 쿠키가 이미 전송된 뒤에 완료되므로, 완료된 대화는 서버 측 세션
+# 저장소에 바로 반영한다. 쿠키 세션이면 세션 ID별로 (보관 시각, 메시지)를 보관했다가
+# 다음 요청에서 세션에 반영한다 (이 워커의 메모리에만 있으므로 쿠키 세션은 워커 하나로 실행).
+_pending_history: "OrderedDict[str, Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+_pending_history_lock = threading.Lock()
+# 동시에 들어온 같은 /ask 요청(중복 클릭, 재시도)은 하나만 처리
+_ask_flight = SingleFlight()
+
+
+def get_session_id() -> str:
+    """현재 브라우저 세션의 식별자 반환 (없으면 생성)"""
+    if "session_id" not in session:
+        session["session_id"] = uuid.uuid4().hex
+    return session["session_id"]
+
 
 def get_conversation_history():
-    """세션에서 대화 기록 가져오기 (없으면 파일에서 로드)"""
+    """세션에서 대화 기록 가져오기 (없으면 사용자별 파일에서 로드)"""
     if "conversation_history" not in session:
-        session["conversation_history"] = load_conversation_history()
+        session["conversation_history"] = load_conversation_history(get_session_id())
+
+    with _pending_history_lock:
+        entry = _pending_history.pop(session.get("session_id"), None)
+    pending = None
+    if entry and time.time() - entry[0] < Config.PENDING_HISTORY_TTL_SECONDS:
+        pending = entry[1]
+    if pending:
+        session["conversation_history"] = limit_conversation_history(
+            session["conversation_history"] + pending, Config.MAX_CONTEXT_MESSAGES
+        )
+        session.modified = True
+
     return session["conversation_history"]
 
 
@@ -70,6 +203,7 @@ def update_conversation_history(role: str, content: str, audio_url: str = None):
         message = {"role": role, "content": content}
         if audio_url and role == "assistant":
             message["audio_url"] = audio_url
+        message_tokens(message)
 
         history.append(message)
 
@@ -79,13 +213,192 @@ def update_conversation_history(role: str, content: str, audio_url: str = None):
         session["conversation_history"] = history
         session.modified = True
 
-        # 파일에도 저장
-        save_conversation_history(history)
+        # 파일에는 새 메시지만 추가
+        append_conversation_message(message, get_session_id())
+        append_to_conversation(get_session_id(), history, 1)
+
+        logger.debug("대화 내용 업데이트 완료: %d개의 메시지", len(history))
+    except Exception:
+        logger.exception("대화 내용 업데이트 중 오류 발생")
+
+
+def defer_session_history(
+    session_id: str, messages: List[Dict[str, Any]], store_sid: Optional[str] = None
+) -> None:
+    """응답 전송 후 추가된 메시지를 세션에 반영 (쿠키 세션이면 다음 요청에서 반영)"""
+    if store_sid is not None and isinstance(
+        app.session_interface, ServerSideSessionInterface
+    ):
+
+        def append_messages(data: Dict[str, Any]) -> None:
+            # 세션에 기록이 없으면 다음 요청에서 파일로부터 불러오므로 반영할 필요 없음
+            if "conversation_history" in data:
+                data["conversation_history"] = limit_conversation_history(
+                    data["conversation_history"] + messages,
+                    Config.MAX_CONTEXT_MESSAGES,
+                )
+
+        app.session_interface.update_stored_session(app, store_sid, append_messages)
+        return
+
+    now = time.time()
+    with _pending_history_lock:
+        _, pending = _pending_history.pop(session_id, (now, []))
+        _pending_history[session_id] = (now, pending + messages)
+        # 버려진 스트림의 대화가 계속 쌓이지 않도록 오래된 것부터 정리
+        while _pending_history:
+            oldest_id, (created_at, _) = next(iter(_pending_history.items()))
+            if (
+                len(_pending_history) <= Config.PENDING_HISTORY_MAX_SESSIONS
+                and now - created_at < Config.PENDING_HISTORY_TTL_SECONDS
+            ):
+                break
+            del _pending_history[oldest_id]
+
+
+def record_completed_turn(
+    session_id: str,
+    history: List[Dict[str, Any]],
+    user_input: str,
+    assistant_response: str,
+    store_sid: Optional[str] = None,
+) -> None:
+    """완료된 질문/응답을 저장하고 세션에 반영 (요청 컨텍스트 밖에서 사용)
+
+    store_sid는 서버 측 세션 저장소의 세션 ID (요청 중에 session.sid로 얻음).
+    """
+    turn = [
+        {"role": "user", "content": user_input},
+        {"role": "assistant", "content": assistant_response},
+    ]
+    for message in turn:
+        message_tokens(message)
+        append_conversation_message(message, session_id)
+    defer_session_history(session_id, turn, store_sid)
+    append_to_conversation(
+        session_id,
+        limit_conversation_history(history + turn, Config.MAX_CONTEXT_MESSAGES),
+        len(turn),
+    )
+    logger.debug("대화 내용 업데이트 완료 (세션 %s)", session_id)
+
+
+def get_cached_answer(messages: List[Dict[str, Any]]) -> Optional[str]:
+    """같은 요청 또는 유사한 질문에 대한 캐시된 응답 반환 (없으면 None)"""
+    cache = get_response_cache()
+    if cache is not None:
+        cached = cache.get(messages, Config.OPENAI_MODEL)
+        if cached is not None:
+            logger.info("응답 캐시 적중")
+            return cached
+
+    semantic_cache = get_semantic_cache()
+    request_key = split_request(messages)
+    if semantic_cache is not None and request_key is not None:
+        match = semantic_cache.lookup(*request_key)
+        if match is not None:
+            logger.info("유사 질문 캐시 적중 (유사도 %.3f)", match[1])
+            return match[0]
+    return None
+
+
+def cache_answer(messages: List[Dict[str, Any]], assistant_response: str) -> None:
+    """응답을 캐시에 저장 (캐시 미사용이면 무시)"""
+    cache = get_response_cache()
+    if cache is not None:
+        cache.set(messages, Config.OPENAI_MODEL, assistant_response)
+
+    semantic_cache = get_semantic_cache()
+    request_key = split_request(messages)
+    if semantic_cache is not None and request_key is not None:
+        semantic_cache.store(*request_key, assistant_response)
+
+
+def start_audio(
+    assistant_response: str, style_settings: Dict[str, Any], cached: bool = False
+) -> Dict[str, Any]:
+    """응답 음성 준비: 캐시된 응답의 음성이 남아 있으면 바로 사용, 아니면 작업 등록"""
+    if cached and Config.RESPONSE_CACHE_REUSE_AUDIO:
+        playlist = get_cached_playlist(assistant_response, style_settings)
+        if playlist:
+            logger.info("캐시된 음성 재사용: %d개 구간", len(playlist))
+            return {
+                "audio_url": playlist[0],
+                "audio_urls": playlist,
+                "audio_job_id": None,
+            }
+
+    audio_job_id = submit_audio_job(assistant_response, style_settings)
+    logger.debug("음성 변환 작업 등록: %s", audio_job_id)
+    return {"audio_url": None, "audio_job_id": audio_job_id}
 
-        print(f"대화 내용 업데이트 완료: {len(history)}개의 메시지")
-    except Exception as e:
-        print(f"대화 내용 업데이트 중 오류 발생: {str(e)}")
-        traceback.print_exc()
+
+def schedule_reminders(
+    user_id: str, user_input: str, notification_delays: List[int]
+) -> List[Dict[str, Any]]:
+    """질문에서 감지한 알림을 서버에 예약하고 응답에 담을 알림 정보 목록 반환"""
+    notifications = []
+    for delay in notification_delays:
+        try:
+            notification = get_scheduler().schedule(user_id, user_input, delay)
+        except ValueError as e:
+            logger.warning("알림 예약 실패: %s", e)
+            continue
+        notifications.append({"delay": delay, **public_notification(notification)})
+    return notifications
+
+
+def build_done_event(
+    assistant_response: str,
+    audio: Dict[str, Any],
+    notifications: List[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """스트리밍 완료 이벤트 구성"""
+    done_event = {"type": "done", "response": assistant_response, **audio}
+    if notifications:
+        done_event["notifications"] = notifications
+    return done_event
+
+
+def build_chat_messages(user_input: str):
+    """현재 스타일/페르소나와 대화 기록으로 API 요청 메시지 구성"""
+    style_settings = session.get("ai_style_settings", {"response_length": "normal"})
+    current_persona = session.get("ai_persona", "professional")
+    logger.debug(
+        "현재 설정 - 스타일: %s, 페르소나: %s", style_settings, current_persona
+    )
+
+    # Create system prompt from style and persona settings
+    system_prompt = (
+        f"{Config.AI_PERSONAS[current_persona]['instruction']}\n"
+        f"{Config.AI_STYLE_SETTINGS[style_settings['response_length']]['instruction']}"
+    )
+    log_payload(logger, "시스템 프롬프트", system_prompt)
+
+    # 이전 대화는 요약으로, 요약되지 않은 최근 대화는 토큰 예산 안에서 포함
+    history = get_conversation_history()
+    summary, recent = get_summary_context(get_session_id(), history)
+    messages = build_context_messages(
+        system_prompt, recent, user_input, summary=summary
+    )
+    # 토큰 수가 새로 계산된 메시지가 있으면 세션에 저장되도록 표시
+    session.modified = True
+    logger.debug(
+        "대화 히스토리 메시지 수: %d/%d (요약 %s)",
+        len(recent),
+        len(history),
+        "있음" if summary else "없음",
+    )
+
+    # 요약되지 않은 이전 대화가 쌓였으면 다음 요청을 위해 백그라운드에서 요약
+    schedule_summary_refresh(get_session_id(), history, len(recent))
+
+    return messages, style_settings
+
+
+def sse_event(payload: Dict[str, Any]) -> str:
+    """Server-Sent Events 형식의 이벤트 문자열 생성"""
+    return f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
 
 
 @app.route("/")
@@ -97,7 +410,8 @@ def home():
 def clear_context():
     """Clear conversation context from both session and file"""
     session["conversation_history"] = []
-    save_conversation_history([])  # 파일에서도 대화 내용 삭제
+    clear_conversation_history(get_session_id())  # 파일에서도 대화 내용 삭제
+    index_conversation(get_session_id(), [])
     return jsonify(
         {"status": "success", "message": "대화 컨텍스트가 초기화되었습니다."}
     )
@@ -105,10 +419,13 @@ def clear_context():
 
 # parse_notification_time 함수 제거됨 - utils 모듈에서 import
 
+# 알림 스트림이 끊기면 브라우저가 다시 연결하기까지 기다리는 시간 (밀리초)
+NOTIFICATION_STREAM_RETRY = "retry: 1000\n\n"
+
 
 @app.route("/schedule_notification", methods=["POST"])
 def schedule_notification():
-    """Schedule a notification"""
+    """Schedule a notification (delivered through /notification_stream)"""
     try:
         data = request.json
         delay = data.get("delay")  # delay in seconds
@@ -119,16 +436,14 @@ def schedule_notification():
                 {"status": "error", "message": "필수 파라미터가 누락되었습니다."}
             )
 
-        # Schedule the notification
-        notification_time = datetime.now().timestamp() + delay
+        try:
+            notification = get_scheduler().schedule(
+                get_session_id(), message, float(delay)
+            )
+        except ValueError as e:
+            return jsonify({"status": "error", "message": str(e)})
 
-        return jsonify(
-            {
-                "status": "success",
-                "notification_time": notification_time,
-                "message": message,
-            }
-        )
+        return jsonify({"status": "success", **public_notification(notification)})
 
     except Exception as e:
         return jsonify(
@@ -139,6 +454,74 @@ def schedule_notification():
         )
 
 
+@app.route("/list_notifications", methods=["GET"])
+def list_notifications():
+    """List notifications that have not been sent yet"""
+    notifications = get_scheduler().list_pending(get_session_id())
+    return jsonify(
+        {
+            "status": "success",
+            "notifications": [public_notification(n) for n in notifications],
+        }
+    )
+
+
+@app.route("/cancel_notification/<notification_id>", methods=["POST"])
+def cancel_notification(notification_id):
+    """Cancel a scheduled notification"""
+    if not get_scheduler().cancel(get_session_id(), notification_id):
+        return (
+            jsonify({"status": "error", "message": "해당 알림을 찾을 수 없습니다."}),
+            404,
+        )
+    return jsonify({"status": "success", "message": "알림이 취소되었습니다."})
+
+
+@app.route("/notification_stream", methods=["GET"])
+def notification_stream():
+    """Push due notifications to the browser (Server-Sent Events)
+
+    WSGI에서는 연결 하나가 스레드 하나를 점유하므로 NOTIFICATION_STREAM_TIMEOUT_SECONDS가
+    지나면 응답을 끝내고 브라우저(EventSource)가 다시 연결하게 한다.
+    ASGI(asgi.py)에서는 이벤트 루프에서 처리하므로 이 제한이 없다.
+    """
+    user_id = get_session_id()
+    scheduler = get_scheduler()
+    subscriber = scheduler.subscribe(user_id)
+    closes_at = time.monotonic() + Config.NOTIFICATION_STREAM_TIMEOUT_SECONDS
+
+    def generate():
+        try:
+            yield NOTIFICATION_STREAM_RETRY
+            while True:
+                remaining = closes_at - time.monotonic()
+                if remaining <= 0:
+                    return
+                try:
+                    notification = subscriber.get(
+                        timeout=min(Config.NOTIFICATION_KEEPALIVE_SECONDS, remaining)
+                    )
+                except queue.Empty:
+                    if time.monotonic() >= closes_at:
+                        return
+                    # 프록시가 유휴 연결을 끊지 않도록 주석 줄 전송
+                    yield ": keepalive\n\n"
+                    continue
+                yield sse_event(
+                    {"type": "notification", **public_notification(notification)}
+                )
+                # 전송이 끝난 뒤에 전달 완료로 기록 (연결이 끊겼으면 다시 연결할 때 전달)
+                scheduler.acknowledge(user_id, notification["id"])
+        finally:
+            scheduler.unsubscribe(user_id, subscriber)
+
+    return Response(
+        generate(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.route("/get_ai_style_settings", methods=["GET"])
 def get_ai_style_settings():
     """Get available AI style settings"""
@@ -227,91 +610,42 @@ def update_persona():
 @app.route("/ask", methods=["POST"])
 def ask():
     try:
-        print("\n=== 새로운 요청 시작 ===")
         data = request.json
         user_input = data.get("question", "")
-        print(f"사용자 입력: {user_input}")
+        log_payload(logger, "사용자 입력", user_input)
 
         if not Config.OPENAI_API_KEY:
             raise ValueError("OpenAI API 키가 설정되지 않았습니다.")
 
         # Check for notification request
-        notification_seconds = parse_notification_time(user_input)
-        has_notification = False
-
-        if notification_seconds:
-            has_notification = True
-            print(f"알림 요청 감지: {notification_seconds}초")
-
-        # Get current AI style and persona settings
-        style_settings = session.get("ai_style_settings", {"response_length": "normal"})
-        current_persona = session.get("ai_persona", "professional")
-        print(f"현재 설정 - 스타일: {style_settings}, 페르소나: {current_persona}")
-
-        # Create system prompt from style and persona settings
-        system_prompt = (
-            f"{Config.AI_PERSONAS[current_persona]['instruction']}\n"
-            f"{Config.AI_STYLE_SETTINGS[style_settings['response_length']]['instruction']}"
-        )
-        print(f"시스템 프롬프트: {system_prompt}")
-
-        # Prepare messages for API call
-        messages = [{"role": "system", "content": system_prompt}]
-
-        # Add conversation history
-        history = get_conversation_history()
-        messages.extend(history)
-        print(f"대화 히스토리 메시지 수: {len(history)}")
+        notification_delays = parse_notification_times(user_input)
+        if notification_delays:
+            logger.info("알림 요청 감지: %s초", notification_delays)
 
-        # Add current user input
-        messages.append({"role": "user", "content": user_input})
+        # 같은 세션에서 같은 요청이 처리 중이면 새로 처리하지 않고 그 결과를 받음
+        flight_key = make_flight_key(session.get("session_id"), data)
 
-        # Call OpenAI API
-        try:
-            print("\n=== API 호출 시작 ===")
-            response = client.chat.completions.create(
-                model=Config.OPENAI_MODEL, messages=messages
+        if data.get("stream"):
+            events = _ask_flight.stream(
+                flight_key, lambda: stream_answer(user_input, notification_delays)
+            )
+            return Response(
+                stream_with_context(events),
+                mimetype="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
             )
-            print("API 호출 성공")
-        except Exception as api_error:
-            print(f"OpenAI API 오류: {str(api_error)}")
-            raise
-
-        # Extract the response
-        assistant_response = response.choices[0].message.content
-        print(f"\n=== AI 응답 ===\n{assistant_response}\n")
-
-        # Generate audio response before updating conversation history
-        print("\n=== 음성 변환 시작 ===")
-        audio_url = create_audio_response(assistant_response, style_settings)
-        print(f"음성 변환 결과: {'성공' if audio_url else '실패'}")
-
-        # Update conversation history after audio generation
-        print("\n=== 대화 히스토리 업데이트 ===")
-        update_conversation_history("user", user_input)
-        update_conversation_history("assistant", assistant_response)
-
-        response_data = {
-            "status": "success",
-            "response": assistant_response,
-            "audio_url": audio_url,
-        }
-
-        if has_notification:
-            response_data["notification"] = {
-                "delay": notification_seconds,
-                "message": user_input,
-            }
 
-        print("\n=== 요청 처리 완료 ===")
+        response_data = _ask_flight.do(
+            flight_key, lambda: answer_question(user_input, notification_delays)
+        )
         return jsonify(response_data)
 
+    except CircuitOpenError as e:
+        logger.warning("요청 차단: %s", e)
+        return jsonify({"status": "error", "message": str(e)}), 503
+
     except Exception as e:
-        error_trace = traceback.format_exc()
-        print(f"\n=== 오류 발생 ===")
-        print(f"에러 타입: {type(e).__name__}")
-        print(f"에러 메시지: {str(e)}")
-        print(f"상세 오류 내용:\n{error_trace}")
+        logger.exception("질문 처리 중 오류 발생")
         return (
             jsonify(
                 {
@@ -324,6 +658,150 @@ def ask():
         )
 
 
+def answer_question(user_input: str, notification_delays: List[int]) -> Dict[str, Any]:
+    """질문에 대한 응답을 받아 음성 변환 등록 및 대화 기록 반영 후 응답 데이터 반환"""
+    messages, style_settings = build_chat_messages(user_input)
+
+    assistant_response = get_cached_answer(messages)
+    cached = assistant_response is not None
+
+    # Call OpenAI API
+    if not cached:
+        assistant_response = complete_chat(messages)
+        cache_answer(messages, assistant_response)
+    log_payload(logger, "AI 응답", assistant_response)
+
+    # 음성 변환은 백그라운드 작업으로 등록하고 결과는 /audio_status로 조회
+    audio = start_audio(assistant_response, style_settings, cached)
+
+    update_conversation_history("user", user_input)
+    update_conversation_history("assistant", assistant_response)
+
+    response_data = {
+        "status": "success",
+        "response": assistant_response,
+        **audio,
+    }
+
+    notifications = schedule_reminders(
+        get_session_id(), user_input, notification_delays
+    )
+    if notifications:
+        response_data["notifications"] = notifications
+    return response_data
+
+
+def stream_answer(user_input: str, notification_delays: List[int]):
+    """OpenAI 응답 토큰을 SSE 이벤트로 생성하고, 완료 시 음성 변환 등록 및 대화 기록 반영"""
+    messages, style_settings = build_chat_messages(user_input)
+    session_id = get_session_id()
+    store_sid = getattr(session, "sid", None)
+    history = list(get_conversation_history())
+
+    def generate():
+        chunks = []
+        try:
+            cached_response = get_cached_answer(messages)
+            if cached_response is not None:
+                chunks.append(cached_response)
+                yield sse_event({"type": "token", "content": cached_response})
+            else:
+                for token in stream_chat(messages):
+                    chunks.append(token)
+                    yield sse_event({"type": "token", "content": token})
+
+            assistant_response = "".join(chunks)
+            log_payload(logger, "AI 응답 (스트리밍)", assistant_response)
+            if cached_response is None:
+                cache_answer(messages, assistant_response)
+
+            audio = start_audio(
+                assistant_response, style_settings, cached_response is not None
+            )
+
+            # 응답 헤더(쿠키)가 이미 전송되었으므로 세션 반영은 다음 요청으로 미룸
+            record_completed_turn(
+                session_id, history, user_input, assistant_response, store_sid
+            )
+
+            notifications = schedule_reminders(
+                session_id, user_input, notification_delays
+            )
+            yield sse_event(build_done_event(assistant_response, audio, notifications))
+
+        except Exception as e:
+            logger.exception("스트리밍 중 오류 발생")
+            yield sse_event(
+                {
+                    "type": "error",
+                    "message": f"서버 처리 중 오류가 발생했습니다: {str(e)}",
+                }
+            )
+
+    return generate()
+
+
+@app.route("/audio_status/<job_id>", methods=["GET"])
+def audio_status(job_id):
+    """Get the status of a background TTS job"""
+    job = get_audio_job(job_id)
+    if job is None:
+        return jsonify(
+            {"status": "error", "message": "해당 음성 작업을 찾을 수 없습니다."}
+        )
+    return jsonify({"status": "success", "job": job})
+
+
+def collect_cache_stats() -> Dict[str, Optional[Dict[str, Any]]]:
+    """캐시별 통계 (사용하지 않는 캐시는 None)"""
+    cache = get_response_cache()
+    semantic_cache = get_semantic_cache()
+    export_cache = get_export_cache()
+    return {
+        "response_cache": cache.stats() if cache is not None else None,
+        "semantic_cache": (
+            semantic_cache.stats() if semantic_cache is not None else None
+        ),
+        "tts_cache": get_tts_cache_stats(),
+        "export_cache": export_cache.stats() if export_cache is not None else None,
+    }
+
+
+def cache_metrics():
+    """캐시 적중/실패 횟수와 적중률을 /metrics 형식으로 변환"""
+    hits, misses, ratios = [], [], []
+    for name, stats in collect_cache_stats().items():
+        if stats is None:
+            continue
+        labels = {"cache": name[: -len("_cache")]}
+        lookups = stats["hits"] + stats["misses"]
+        hits.append((labels, stats["hits"]))
+        misses.append((labels, stats["misses"]))
+        ratios.append((labels, stats["hits"] / lookups if lookups else 0.0))
+    return [
+        ("assistant_cache_hits_total", "counter", "Cache hits", hits),
+        ("assistant_cache_misses_total", "counter", "Cache misses", misses),
+        ("assistant_cache_hit_ratio", "gauge", "Cache hit ratio since start", ratios),
+    ]
+
+
+register_collector(cache_metrics)
+
+
+@app.route("/cache_stats", methods=["GET"])
+def cache_stats():
+    """응답 캐시, 음성 캐시, 내보내기 캐시의 적중률 등 통계"""
+    return jsonify({"status": "success", **collect_cache_stats()})
+
+
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    """단계별 소요 시간, 외부 API 오류, 캐시 적중률 (Prometheus 텍스트 형식)"""
+    return Response(
+        render_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 @app.route("/export_conversation", methods=["POST"])
 def export_conversation():
     """Export conversation history as a text or PDF file"""
@@ -334,25 +812,20 @@ def export_conversation():
 
         # Get export format from request
         export_format = request.json.get("format", "txt")
+        if export_format != "pdf":  # txt format
+            export_format = "txt"
 
-        if export_format == "pdf":
-            filepath = export_conversation_to_pdf(history)
-            filename = os.path.basename(filepath)
-        else:  # txt format
-            filepath = export_conversation_to_txt(history)
-            filename = os.path.basename(filepath)
-
-        # Return file
+        # 파일로 저장하지 않고 메모리에서 만든 결과를 전송 (같은 내용이면 캐시 사용)
+        data = get_conversation_export(history, export_format)
         return send_file(
-            filepath,
+            io.BytesIO(data),
             as_attachment=True,
-            download_name=filename,
+            download_name=export_filename(export_format),
             mimetype="application/pdf" if export_format == "pdf" else "text/plain",
         )
 
     except Exception as e:
-        print(f"대화 내보내기 중 오류 발생: {str(e)}")
-        traceback.print_exc()
+        logger.exception("대화 내보내기 중 오류 발생")
         return jsonify(
             {
                 "status": "error",
@@ -360,40 +833,76 @@ def export_conversation():
             }
         )
 
-        # Return file
-        return send_file(
-            filepath,
-            as_attachment=True,
-            download_name=filename,
-            mimetype="application/pdf" if export_format == "pdf" else "text/plain",
+
+@app.route("/export_sessions", methods=["POST"])
+def export_sessions():
+    """Export selected (or all) saved sessions as a streamed ZIP archive"""
+    try:
+        data = request.json or {}
+        try:
+            filenames = resolve_session_filenames(data.get("sessions"))
+            if not filenames:
+                return jsonify(
+                    {"status": "error", "message": "내보낼 세션이 없습니다."}
+                )
+            body = generate_sessions_zip(filenames, data.get("formats", ["txt"]))
+        except ValueError as e:
+            return jsonify({"status": "error", "message": str(e)})
+
+        logger.info("세션 일괄 내보내기: %d개", len(filenames))
+        return Response(
+            body,
+            mimetype="application/zip",
+            headers={
+                "Content-Disposition": (
+                    f"attachment; filename={export_archive_filename()}"
+                )
+            },
         )
 
     except Exception as e:
-        print(f"대화 내보내기 중 오류 발생: {str(e)}")
+        logger.exception("세션 일괄 내보내기 중 오류 발생")
         return jsonify(
             {
                 "status": "error",
-                "message": "대화 내용을 내보내는 중에 오류가 발생했습니다.",
+                "message": "세션을 내보내는 중에 오류가 발생했습니다.",
             }
         )
 
 
 @app.route("/search_conversation", methods=["POST"])
 def search_conversation():
-    """Search through conversation history"""
+    """Search the current conversation and saved sessions"""
     try:
-        query = request.json.get("query", "").strip()
+        data = request.json
+        query = data.get("query", "").strip()
         if not query:
             return jsonify({"status": "error", "message": "검색어를 입력해주세요."})
 
+        offset = max(int(data.get("offset", 0)), 0)
+        limit = min(max(int(data.get("limit", Config.SEARCH_PAGE_SIZE)), 1), 100)
+        include_sessions = data.get("scope", "all") != "current"
+
+        # 서버 재시작 후 처음 검색하는 경우 현재 대화를 색인
+        session_id = get_session_id()
         history = get_conversation_history()
-        results = search_in_conversation(history, query)
+        if not is_conversation_indexed(session_id):
+            index_conversation(session_id, history)
 
-        return jsonify({"status": "success", "results": results, "count": len(results)})
+        page = search(query, session_id, include_sessions, offset, limit)
+
+        return jsonify(
+            {
+                "status": "success",
+                "results": page["results"],
+                "count": len(page["results"]),
+                "total": page["total"],
+                "offset": offset,
+            }
+        )
 
     except Exception as e:
-        print(f"대화 검색 중 오류 발생: {str(e)}")
-        traceback.print_exc()
+        logger.exception("대화 검색 중 오류 발생")
         return jsonify(
             {"status": "error", "message": "대화 내용 검색 중에 오류가 발생했습니다."}
         )
@@ -403,10 +912,10 @@ def search_conversation():
 def load_conversation():
     """Load conversation history for the client"""
     try:
-        history = session.get("conversation_history", [])
+        history = get_conversation_history()
         return jsonify({"status": "success", "conversation": history})
     except Exception as e:
-        print(f"대화 내용 로드 중 오류 발생: {str(e)}")
+        logger.error("대화 내용 로드 중 오류 발생: %s", e)
         return jsonify(
             {
                 "status": "error",
@@ -437,6 +946,7 @@ def save_current_session():
 
         # Save session using service
         filename = save_session(history, session_name)
+        index_session(filename, session_name, history)
 
         return jsonify(
             {
@@ -447,15 +957,13 @@ def save_current_session():
         )
 
     except Exception as e:
-        print(f"세션 저장 중 오류 발생: {str(e)}")
-        traceback.print_exc()
+        logger.exception("세션 저장 중 오류 발생")
         return jsonify(
             {"status": "error", "message": "세션 저장 중 오류가 발생했습니다."}
         )
 
     except Exception as e:
-        print(f"세션 저장 중 오류 발생: {str(e)}")
-        traceback.print_exc()
+        logger.exception("세션 저장 중 오류 발생")
         return jsonify(
             {"status": "error", "message": "세션 저장 중 오류가 발생했습니다."}
         )
@@ -463,14 +971,32 @@ def save_current_session():
 
 @app.route("/list_sessions", methods=["GET"])
 def list_saved_sessions():
-    """List all saved conversation sessions"""
+    """List saved conversation sessions (optionally paginated and sorted)"""
     try:
-        sessions = list_sessions()
-        return jsonify({"status": "success", "sessions": sessions})
+        offset = request.args.get("offset", 0, type=int)
+        limit = request.args.get("limit", Config.SESSION_LIST_MAX_LIMIT, type=int)
+        limit = min(max(limit, 0), Config.SESSION_LIST_MAX_LIMIT)
+        sort = request.args.get("sort", "timestamp")
+        reverse = request.args.get("order", "desc") != "asc"
+
+        try:
+            page = list_sessions_page(
+                offset=max(offset, 0), limit=limit, sort=sort, reverse=reverse
+            )
+        except ValueError as e:
+            return jsonify({"status": "error", "message": str(e)})
+
+        return jsonify(
+            {
+                "status": "success",
+                "sessions": page["sessions"],
+                "total": page["total"],
+                "offset": offset,
+            }
+        )
 
     except Exception as e:
-        print(f"세션 목록 조회 중 오류 발생: {str(e)}")
-        traceback.print_exc()
+        logger.exception("세션 목록 조회 중 오류 발생")
         return jsonify(
             {"status": "error", "message": "세션 목록 조회 중 오류가 발생했습니다."}
         )
@@ -485,6 +1011,8 @@ def load_saved_session(filename):
         # Update current session with loaded messages
         session["conversation_history"] = session_data["messages"]
         session.modified = True
+        save_conversation_history(session_data["messages"], get_session_id())
+        index_conversation(get_session_id(), session_data["messages"])
 
         return jsonify(
             {
@@ -497,8 +1025,7 @@ def load_saved_session(filename):
     except FileNotFoundError:
         return jsonify({"status": "error", "message": "해당 세션을 찾을 수 없습니다."})
     except Exception as e:
-        print(f"세션 불러오기 중 오류 발생: {str(e)}")
-        traceback.print_exc()
+        logger.exception("세션 불러오기 중 오류 발생")
         return jsonify(
             {"status": "error", "message": "세션 불러오기 중 오류가 발생했습니다."}
         )
@@ -509,13 +1036,13 @@ def delete_saved_session(filename):
     """Delete a saved conversation session"""
     try:
         delete_session(filename)
+        remove_session(filename)
         return jsonify({"status": "success", "message": "대화 세션이 삭제되었습니다."})
 
     except FileNotFoundError:
         return jsonify({"status": "error", "message": "해당 세션을 찾을 수 없습니다."})
     except Exception as e:
-        print(f"세션 삭제 중 오류 발생: {str(e)}")
-        traceback.print_exc()
+        logger.exception("세션 삭제 중 오류 발생")
         return jsonify(
             {"status": "error", "message": "세션 삭제 중 오류가 발생했습니다."}
         )
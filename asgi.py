@@ -0,0 +1,426 @@
+"""
+ASGI 진입점
+
+    uvicorn asgi:application
+
+uvicorn은 requirements.txt에 포함되지 않은 서버 의존성이다 (gunicorn과 같이 따로 설치).
+
+POST /ask 는 이벤트 루프에서 AsyncOpenAI로 처리해 응답 대기 중에 스레드를
+점유하지 않는다. GET /notification_stream 도 이벤트 루프에서 연결을 유지한다. 나머지 경로는 기존 Flask 앱(WSGI)을 스레드 풀
+(Config.ASGI_WSGI_THREADS)에서 실행한다.
+"""
+
+import asyncio
+import io
+import json
+import time
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from flask import request, session
+
+from app import (
+    NOTIFICATION_STREAM_RETRY,
+    app,
+    build_chat_messages,
+    build_done_event,
+    cache_answer,
+    get_cached_answer,
+    get_conversation_history,
+    get_session_id,
+    make_request_id,
+    record_completed_turn,
+    schedule_reminders,
+    sse_event,
+    start_audio,
+)
+from config import Config
+from services.llm_service import complete_chat_async, stream_chat_async
+from services.logging_service import bind_request_id, log_payload, reset_request_id
+from services.metrics_service import begin_trace, end_trace, record_request
+from services.notification_service import get_scheduler, public_notification
+from services.resilience_service import CircuitOpenError
+from services.singleflight_service import AsyncSingleFlight, make_flight_key
+from services.wsgi_pool_service import ThreadPoolWsgiToAsgi
+from utils import parse_notification_times
+
+logger = logging.getLogger(__name__)
+
+wsgi_application = ThreadPoolWsgiToAsgi(app, Config.ASGI_WSGI_THREADS)
+# 동시에 들어온 같은 /ask 요청(중복 클릭, 재시도)은 하나만 처리
+_ask_flight = AsyncSingleFlight()
+
+
+def build_environ(scope: Dict[str, Any], body: bytes) -> Dict[str, Any]:
+    """ASGI scope와 요청 본문으로 WSGI environ 구성 (Flask 요청 컨텍스트용)"""
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", ""),
+        "PATH_INFO": scope["path"],
+        "QUERY_STRING": scope.get("query_string", b"").decode("ascii"),
+        "SERVER_NAME": (scope.get("server") or ("localhost", 80))[0],
+        "SERVER_PORT": str((scope.get("server") or ("localhost", 80))[1]),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": io.StringIO(),
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+    for name, value in scope.get("headers", []):
+        key = name.decode("latin1").upper().replace("-", "_")
+        if key not in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+            key = f"HTTP_{key}"
+        environ[key] = value.decode("latin1")
+    return environ
+
+
+def prepare_ask(environ: Dict[str, Any]) -> Dict[str, Any]:
+    """요청 파싱, 메시지 구성, 세션 저장까지의 동기 처리 (스레드에서 실행)"""
+    with app.request_context(environ):
+        data = request.get_json(silent=True) or {}
+        user_input = data.get("question", "")
+        log_payload(logger, "사용자 입력", user_input)
+
+        if not Config.OPENAI_API_KEY:
+            raise ValueError("OpenAI API 키가 설정되지 않았습니다.")
+
+        messages, style_settings = build_chat_messages(user_input)
+        prepared = {
+            "user_input": user_input,
+            "stream": bool(data.get("stream")),
+            "messages": messages,
+            "style_settings": style_settings,
+            "notification_delays": parse_notification_times(user_input),
+            "session_id": get_session_id(),
+            "store_sid": getattr(session, "sid", None),
+            "history": list(get_conversation_history()),
+        }
+
+        prepared["cached_response"] = get_cached_answer(messages)
+
+        # 세션 쿠키는 응답 본문보다 먼저 나가므로 여기서 세션을 저장해 둔다
+        response = app.process_response(app.response_class())
+        prepared["cookies"] = response.headers.getlist("Set-Cookie")
+        return prepared
+
+
+def finish_ask(
+    prepared: Dict[str, Any], assistant_response: str, cached: bool
+) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """응답 캐시 저장, 음성 준비, 대화 기록 반영, 알림 예약 (스레드에서 실행)
+
+    (음성 정보, 예약된 알림 정보 목록) 반환
+    """
+    if not cached:
+        cache_answer(prepared["messages"], assistant_response)
+    audio = start_audio(assistant_response, prepared["style_settings"], cached)
+    record_completed_turn(
+        prepared["session_id"],
+        prepared["history"],
+        prepared["user_input"],
+        assistant_response,
+        prepared["store_sid"],
+    )
+    notifications = schedule_reminders(
+        prepared["session_id"],
+        prepared["user_input"],
+        prepared["notification_delays"],
+    )
+    return audio, notifications
+
+
+def start_message(
+    status: int, content_type: str, cookies: List[str] = ()
+) -> Dict[str, Any]:
+    """응답 시작 메시지 구성"""
+    headers: List[Tuple[bytes, bytes]] = [
+        (b"content-type", content_type.encode("latin1"))
+    ]
+    if content_type.startswith("text/event-stream"):
+        headers += [(b"cache-control", b"no-cache"), (b"x-accel-buffering", b"no")]
+    headers += [(b"set-cookie", cookie.encode("latin1")) for cookie in cookies]
+    return {"type": "http.response.start", "status": status, "headers": headers}
+
+
+def event_message(payload: Dict[str, Any], more_body: bool = True) -> Dict[str, Any]:
+    """SSE 이벤트 하나를 담은 응답 본문 메시지 구성"""
+    return {
+        "type": "http.response.body",
+        "body": sse_event(payload).encode("utf-8"),
+        "more_body": more_body,
+    }
+
+
+async def send_json(send, status: int, payload: Dict[str, Any], cookies=()) -> None:
+    """JSON 응답 전송"""
+    await send(start_message(status, "application/json", cookies))
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    await send({"type": "http.response.body", "body": body})
+
+
+async def read_body(receive) -> bytes:
+    """요청 본문 전체 수신"""
+    body = b""
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            break
+        body += message.get("body", b"")
+        if not message.get("more_body"):
+            break
+    return body
+
+
+def request_header(scope: Dict[str, Any], name: bytes) -> Optional[str]:
+    """요청 헤더 값 (없으면 None)"""
+    for key, value in scope.get("headers", []):
+        if key == name:
+            return value.decode("latin1")
+    return None
+
+
+def wants_stream(body: bytes) -> bool:
+    """요청 본문이 스트리밍 응답을 요청하는지 확인"""
+    try:
+        return bool(json.loads(body).get("stream"))
+    except (ValueError, AttributeError):
+        return False
+
+
+def error_payload(error: Exception) -> Dict[str, Any]:
+    """/ask 오류 응답 본문"""
+    return {
+        "error": str(error),
+        "status": "error",
+        "message": f"서버 처리 중 오류가 발생했습니다: {str(error)}",
+    }
+
+
+async def ask(scope, receive, send) -> None:
+    """/ask 비동기 처리 (같은 세션의 동시 중복 요청은 하나만 처리하고 결과 공유)"""
+    body = await read_body(receive)
+    environ = build_environ(scope, body)
+    flight_key = make_flight_key(request_header(scope, b"cookie"), body)
+
+    if wants_stream(body):
+        async for message in _ask_flight.stream(
+            flight_key, lambda: stream_ask(environ)
+        ):
+            await send(message)
+        return
+
+    status, payload, cookies = await _ask_flight.do(
+        flight_key, lambda: answer_ask(environ)
+    )
+    await send_json(send, status, payload, cookies)
+
+
+async def answer_ask(environ: Dict[str, Any]):
+    """응답 전체를 받아 (상태 코드, 응답 본문, 쿠키) 반환"""
+    try:
+        prepared = await asyncio.to_thread(prepare_ask, environ)
+    except Exception as e:
+        logger.exception("질문 처리 중 오류 발생")
+        return 500, error_payload(e), []
+
+    try:
+        assistant_response = prepared["cached_response"]
+        cached = assistant_response is not None
+        if not cached:
+            assistant_response = await complete_chat_async(prepared["messages"])
+        log_payload(logger, "AI 응답", assistant_response)
+        audio, notifications = await asyncio.to_thread(
+            finish_ask, prepared, assistant_response, cached
+        )
+    except CircuitOpenError as e:
+        logger.warning("요청 차단: %s", e)
+        return 503, {"status": "error", "message": str(e)}, prepared["cookies"]
+    except Exception as e:
+        logger.exception("질문 처리 중 오류 발생")
+        return 500, error_payload(e), prepared["cookies"]
+
+    response_data = {
+        "status": "success",
+        "response": assistant_response,
+        **audio,
+    }
+    if notifications:
+        response_data["notifications"] = notifications
+    return 200, response_data, prepared["cookies"]
+
+
+async def stream_ask(environ: Dict[str, Any]):
+    """응답 토큰을 SSE로 전달하는 ASGI 메시지를 차례로 생성"""
+    try:
+        prepared = await asyncio.to_thread(prepare_ask, environ)
+    except Exception as e:
+        logger.exception("질문 처리 중 오류 발생")
+        yield start_message(500, "application/json")
+        body = json.dumps(error_payload(e), ensure_ascii=False).encode("utf-8")
+        yield {"type": "http.response.body", "body": body}
+        return
+
+    yield start_message(200, "text/event-stream; charset=utf-8", prepared["cookies"])
+
+    chunks = []
+    try:
+        cached = prepared["cached_response"] is not None
+        if cached:
+            chunks.append(prepared["cached_response"])
+            yield event_message({"type": "token", "content": chunks[0]})
+        else:
+            async for token in stream_chat_async(prepared["messages"]):
+                chunks.append(token)
+                yield event_message({"type": "token", "content": token})
+
+        assistant_response = "".join(chunks)
+        log_payload(logger, "AI 응답 (스트리밍)", assistant_response)
+        audio, notifications = await asyncio.to_thread(
+            finish_ask, prepared, assistant_response, cached
+        )
+        done_event = build_done_event(assistant_response, audio, notifications)
+        yield event_message(done_event, more_body=False)
+    except Exception as e:
+        logger.exception("스트리밍 중 오류 발생")
+        yield event_message(
+            {
+                "type": "error",
+                "message": f"서버 처리 중 오류가 발생했습니다: {str(e)}",
+            },
+            more_body=False,
+        )
+
+
+async def timed_ask(scope, receive, send) -> None:
+    """/ask 처리 시간과 상태 코드 기록 (스트리밍은 전송이 끝날 때까지)"""
+    started = time.perf_counter()
+    request_id = make_request_id(request_header(scope, b"x-request-id"))
+    token = bind_request_id(request_id)
+    trace = begin_trace("POST /ask", request_id)
+    status = 500
+
+    async def send_with_status(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            # 병합된 요청들이 같은 메시지를 공유하므로 복사해서 헤더 추가
+            message = {
+                **message,
+                "headers": [
+                    *message["headers"],
+                    (b"x-request-id", request_id.encode("latin1")),
+                ],
+            }
+        await send(message)
+
+    try:
+        await ask(scope, receive, send_with_status)
+    finally:
+        record_request("ask", status, time.perf_counter() - started)
+        end_trace(trace, status)
+        reset_request_id(token)
+
+
+class LoopQueue:
+    """스케줄러 스레드에서 넣은 알림을 이벤트 루프의 asyncio.Queue로 넘기는 구독 큐"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, maxsize: int):
+        self._loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+
+    def put_nowait(self, notification: Dict[str, Any]) -> None:
+        try:
+            self._loop.call_soon_threadsafe(self._put, notification)
+        except RuntimeError:
+            pass  # 이벤트 루프가 이미 종료됨
+
+    def _put(self, notification: Dict[str, Any]) -> None:
+        try:
+            self.queue.put_nowait(notification)
+        except asyncio.QueueFull:
+            pass  # 전달 확인 전이므로 다시 연결하면 받음
+
+
+def open_notification_stream(environ: Dict[str, Any]) -> Tuple[str, List[str]]:
+    """세션에서 사용자 ID를 얻고 세션 쿠키를 준비 (스레드에서 실행)"""
+    with app.request_context(environ):
+        user_id = get_session_id()
+        response = app.process_response(app.response_class())
+        return user_id, response.headers.getlist("Set-Cookie")
+
+
+async def wait_disconnect(receive) -> None:
+    """클라이언트 연결이 끊길 때까지 대기"""
+    while (await receive())["type"] != "http.disconnect":
+        pass
+
+
+def text_message(text: str) -> Dict[str, Any]:
+    return {
+        "type": "http.response.body",
+        "body": text.encode("utf-8"),
+        "more_body": True,
+    }
+
+
+async def notification_stream(scope, receive, send) -> None:
+    """발송된 알림을 SSE로 전달 (연결 동안 스레드를 점유하지 않음)"""
+    environ = build_environ(scope, b"")
+    user_id, cookies = await asyncio.to_thread(open_notification_stream, environ)
+    scheduler = get_scheduler()
+    subscriber = LoopQueue(
+        asyncio.get_running_loop(), Config.NOTIFICATION_SUBSCRIBER_QUEUE_SIZE
+    )
+    await asyncio.to_thread(scheduler.subscribe, user_id, subscriber)
+    disconnected = asyncio.ensure_future(wait_disconnect(receive))
+    try:
+        await send(start_message(200, "text/event-stream; charset=utf-8", cookies))
+        await send(text_message(NOTIFICATION_STREAM_RETRY))
+        while True:
+            getter = asyncio.ensure_future(subscriber.queue.get())
+            await asyncio.wait(
+                {getter, disconnected},
+                timeout=Config.NOTIFICATION_KEEPALIVE_SECONDS,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if disconnected.done():
+                getter.cancel()
+                return
+            if not getter.done():
+                getter.cancel()
+                # 프록시가 유휴 연결을 끊지 않도록 주석 줄 전송
+                await send(text_message(": keepalive\n\n"))
+                continue
+            notification = getter.result()
+            await send(
+                event_message(
+                    {"type": "notification", **public_notification(notification)}
+                )
+            )
+            # 전송이 끝난 뒤에 전달 완료로 기록 (연결이 끊겼으면 다시 연결할 때 전달)
+            await asyncio.to_thread(scheduler.acknowledge, user_id, notification["id"])
+    finally:
+        disconnected.cancel()
+        await asyncio.to_thread(scheduler.unsubscribe, user_id, subscriber)
+
+
+async def application(scope, receive, send) -> None:
+    """ASGI 애플리케이션"""
+    if (
+        scope["type"] == "http"
+        and scope["method"] == "POST"
+        and scope["path"] == "/ask"
+    ):
+        await timed_ask(scope, receive, send)
+        return
+    if (
+        scope["type"] == "http"
+        and scope["method"] == "GET"
+        and scope["path"] == "/notification_stream"
+    ):
+        await notification_stream(scope, receive, send)
+        return
+    await wsgi_application(scope, receive, send)
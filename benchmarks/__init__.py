@@ -0,0 +1 @@
+"""성능 측정 도구 모음"""
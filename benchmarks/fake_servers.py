@@ -0,0 +1,225 @@
+"""
+테스트/성능 측정용 가짜 외부 API 서버
+
+- FakeOpenAIServer: /v1/chat/completions (일반 응답, 스트리밍)
+- FakeNaverTTSServer: navertts 라이브러리가 호출하는 음성 변환 주소
+
+미리 넣어 둔 동작(상태 코드, 지연 시간, 응답 내용)을 요청이 올 때마다 하나씩
+꺼내 응답한다. 남은 동작이 없으면 서버에 설정한 지연 시간 후 기본 응답을 반환한다.
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+from urllib.parse import parse_qs, urlparse
+import json
+import time
+import threading
+
+
+class _FakeServer:
+    """요청마다 스레드 하나로 응답하는 로컬 HTTP 서버"""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.requests: List[Dict[str, Any]] = []
+        self._behaviors: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, args=(0.05,), daemon=True
+        )
+
+    @property
+    def address(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def push(self, status: int = 200, delay: float = 0.0, content: str = None) -> None:
+        """다음 요청에 적용할 동작 추가"""
+        with self._lock:
+            self._behaviors.append(
+                {"status": status, "delay": delay, "content": content}
+            )
+
+    def _next(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            self.requests.append(body)
+            if self._behaviors:
+                return self._behaviors.pop(0)
+        return {"status": 200, "delay": self.latency, "content": None}
+
+    def _handler(self):
+        raise NotImplementedError
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status: int, content_type: str, data: bytes) -> None:
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # 클라이언트가 시간 초과로 먼저 연결을 끊음
+
+    def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self._send(status, "application/json", data)
+
+
+class FakeOpenAIServer(_FakeServer):
+    """/v1/chat/completions 만 처리하는 로컬 HTTP 서버
+
+    latency는 응답 시작까지의 지연, token_delay는 스트리밍 토큰 사이의 지연.
+    echo가 켜져 있으면 기본 응답 뒤에 마지막 사용자 메시지를 붙여 질문마다 다른
+    응답을 만든다 (응답/음성 캐시에 걸리지 않도록).
+    """
+
+    def __init__(
+        self,
+        default_content: str = "기본 응답",
+        latency: float = 0.0,
+        token_delay: float = 0.0,
+        echo: bool = False,
+    ):
+        super().__init__(latency)
+        self.default_content = default_content
+        self.token_delay = token_delay
+        self.echo = echo
+
+    @property
+    def base_url(self) -> str:
+        return f"{self.address}/v1"
+
+    def _handler(self):
+        server = self
+
+        class Handler(_Handler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                behavior = server._next(body)
+                if behavior["delay"]:
+                    time.sleep(behavior["delay"])
+
+                if behavior["status"] != 200:
+                    self._send_json(
+                        behavior["status"],
+                        {"error": {"message": "fake error", "type": "server_error"}},
+                    )
+                    return
+
+                content = behavior["content"] or server.default_content
+                if server.echo and body.get("messages"):
+                    content = f"{content} {body['messages'][-1]['content']}"
+                if body.get("stream"):
+                    self._send_stream(body["model"], content)
+                else:
+                    self._send_json(200, _completion(body["model"], content))
+
+            def _send_stream(self, model, content):
+                try:
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/event-stream")
+                    self.end_headers()
+                    for token in content.split(" "):
+                        if server.token_delay:
+                            time.sleep(server.token_delay)
+                        chunk = _chunk(model, token + " ")
+                        self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                        self.wfile.flush()
+                    self.wfile.write(b"data: [DONE]\n\n")
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+        return Handler
+
+
+class FakeNaverTTSServer(_FakeServer):
+    """navertts의 음성 변환 요청(GET .../api/nvoice?text=...)에 mp3 바이트로 응답
+
+    install()로 navertts가 실제 네이버 대신 이 서버를 호출하도록 바꾼다.
+    """
+
+    def __init__(self, latency: float = 0.0, bytes_per_char: int = 200):
+        super().__init__(latency)
+        self.bytes_per_char = bytes_per_char
+        self._original_endpoint = None
+
+    @property
+    def endpoint(self) -> str:
+        # navertts가 {tld}를 채운 뒤 쿼리 문자열을 덧붙임
+        return f"{self.address}/{{tld}}/api/nvoice"
+
+    def install(self) -> "FakeNaverTTSServer":
+        from navertts import constants
+
+        self._original_endpoint = constants.TRANSLATE_ENDPOINT
+        constants.TRANSLATE_ENDPOINT = self.endpoint
+        return self
+
+    def stop(self) -> None:
+        if self._original_endpoint is not None:
+            from navertts import constants
+
+            constants.TRANSLATE_ENDPOINT = self._original_endpoint
+            self._original_endpoint = None
+        super().stop()
+
+    def _handler(self):
+        server = self
+
+        class Handler(_Handler):
+            def do_GET(self):
+                query = parse_qs(urlparse(self.path).query)
+                text = query.get("text", [""])[0]
+                behavior = server._next({"text": text})
+                if behavior["delay"]:
+                    time.sleep(behavior["delay"])
+
+                if behavior["status"] != 200:
+                    self._send_json(behavior["status"], {"error": "fake error"})
+                    return
+                # 실제 음성 대신 글자 수에 비례하는 크기의 mp3 헤더 + 빈 프레임
+                size = max(len(text), 1) * server.bytes_per_char
+                self._send(200, "audio/mpeg", b"ID3" + bytes(size))
+
+        return Handler
+
+
+def _completion(model: str, content: str) -> Dict[str, Any]:
+    return {
+        "id": "chatcmpl-fake",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }
+        ],
+    }
+
+
+def _chunk(model: str, token: str) -> Dict[str, Any]:
+    return {
+        "id": "chatcmpl-fake",
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "delta": {"content": token}, "finish_reason": None}],
+    }
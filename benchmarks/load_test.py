@@ -0,0 +1,354 @@
+"""
+주요 엔드포인트 부하 측정 도구
+
+OpenAI 채팅 API와 Naver TTS 대신 로컬 가짜 서버(benchmarks.fake_servers)를 띄우고,
+임시 데이터 디렉토리를 사용하는 Flask 앱에 여러 클라이언트가 동시에 요청을 보내
+엔드포인트별 p50/p95/p99 응답 시간과 초당 처리 요청 수를 측정한다.
+
+사용법:
+    python -m benchmarks.load_test [--clients 8] [--requests 20]
+        [--openai-latency 0.2] [--token-delay 0.01] [--tts-latency 0.1]
+        [--save-baseline] [--tolerance 0.25] [--min-delta-ms 20]
+
+엔드포인트는 ask → ask_stream → list_sessions → search_conversation →
+export_conversation 순서로 측정한다 (앞 단계에서 쌓인 대화를 뒤 단계가 사용).
+기준 결과 파일(--baseline)이 있으면 비교해서 p95가 허용 범위보다 느려졌거나
+초당 처리 수가 줄어든 엔드포인트를 표시하고 종료 코드 1을 반환한다.
+"""
+
+from typing import List, Dict, Any, Callable
+from concurrent.futures import ThreadPoolExecutor
+import os
+import sys
+import json
+import math
+import time
+import shutil
+import argparse
+import tempfile
+import threading
+import requests
+from config import Config
+from benchmarks.fake_servers import FakeNaverTTSServer, FakeOpenAIServer
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "load_test_baseline.json")
+ANSWER = (
+    "요청하신 내용을 정리해 드리겠습니다. 먼저 전체 일정을 확인한 뒤 "
+    "우선순위가 높은 작업부터 처리하는 것이 좋습니다. 필요하면 알림을 "
+    "설정해 드릴 수 있습니다."
+)
+SEED_MESSAGES = 10  # 미리 저장해 두는 세션 하나의 메시지 수
+
+# 엔드포인트 이름 -> (http 세션, 서버 주소, 클라이언트 번호, 요청 번호)로 요청 전송
+Scenario = Callable[[requests.Session, str, int, int], requests.Response]
+
+
+def _ask(http, base_url, client, index):
+    question = f"벤치마크 질문 {client}-{index} 일정 정리해줘"
+    return http.post(f"{base_url}/ask", json={"question": question})
+
+
+def _ask_stream(http, base_url, client, index):
+    question = f"벤치마크 스트리밍 질문 {client}-{index} 할 일 알려줘"
+    response = http.post(
+        f"{base_url}/ask", json={"question": question, "stream": True}, stream=True
+    )
+    for _ in response.iter_content(chunk_size=None):
+        pass
+    return response
+
+
+def _list_sessions(http, base_url, client, index):
+    return http.get(f"{base_url}/list_sessions")
+
+
+def _search_conversation(http, base_url, client, index):
+    return http.post(f"{base_url}/search_conversation", json={"query": "벤치마크"})
+
+
+def _export_conversation(http, base_url, client, index):
+    return http.post(f"{base_url}/export_conversation", json={"format": "txt"})
+
+
+def _export_conversation_pdf(http, base_url, client, index):
+    return http.post(f"{base_url}/export_conversation", json={"format": "pdf"})
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "ask": _ask,
+    "ask_stream": _ask_stream,
+    "list_sessions": _list_sessions,
+    "search_conversation": _search_conversation,
+    "export_conversation": _export_conversation,
+    "export_conversation_pdf": _export_conversation_pdf,
+}
+
+
+def percentile(sorted_values: List[float], percent: float) -> float:
+    """정렬된 값 목록의 백분위수 (nearest-rank)"""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(percent / 100 * len(sorted_values)) - 1, 0)
+    return sorted_values[rank]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, Any]:
+    """응답 시간 목록(초)을 결과 항목으로 정리"""
+    values = sorted(latencies)
+    return {
+        "requests": len(values),
+        "errors": errors,
+        "p50_ms": round(percentile(values, 50) * 1000, 2),
+        "p95_ms": round(percentile(values, 95) * 1000, 2),
+        "p99_ms": round(percentile(values, 99) * 1000, 2),
+        "rps": round(len(values) / elapsed, 2) if elapsed else 0.0,
+    }
+
+
+def use_temp_data_dir(root: str) -> None:
+    """앱이 사용하는 모든 데이터 경로를 임시 디렉토리로 변경 (앱 import 전에 호출)"""
+    Config.DATA_DIR = root
+    Config.CONVERSATIONS_DIR = os.path.join(root, "conversations")
+    Config.SESSIONS_DIR = os.path.join(root, "sessions")
+    Config.EXPORTS_DIR = os.path.join(root, "exports")
+    Config.LOGS_DIR = os.path.join(root, "logs")
+    Config.LOG_FILE = os.path.join(Config.LOGS_DIR, "app.log")
+    Config.SESSION_STORE_DIR = os.path.join(root, "flask_sessions")
+    Config.SESSION_SQLITE_PATH = os.path.join(root, "flask_sessions.db")
+    Config.SQLITE_DB_PATH = os.path.join(root, "assistant.db")
+    Config.RESPONSE_CACHE_SQLITE_PATH = os.path.join(root, "response_cache.db")
+    Config.NOTIFICATIONS_LOG_PATH = os.path.join(root, "notifications.jsonl")
+    Config.AUDIO_DIR = os.path.join(root, "audio")
+
+
+def seed_sessions(count: int) -> None:
+    """세션 목록/검색 측정용 저장 세션 생성"""
+    from services.session_service import save_session
+
+    for i in range(count):
+        history = []
+        for j in range(SEED_MESSAGES // 2):
+            history.append({"role": "user", "content": f"벤치마크 세션 {i} 질문 {j}"})
+            history.append({"role": "assistant", "content": ANSWER})
+        save_session(history, f"벤치마크_{i}")
+
+
+def run_scenario(
+    scenario: Scenario,
+    base_url: str,
+    clients: List[requests.Session],
+    requests_per_client: int,
+    warmup: int,
+) -> Dict[str, Any]:
+    """클라이언트마다 요청을 순서대로 보내고 (앞의 warmup개 제외) 응답 시간 집계"""
+    latencies: List[float] = []
+    errors = 0
+    lock = threading.Lock()
+
+    def run_client(client: int):
+        nonlocal errors
+        http = clients[client]
+        for index in range(warmup + requests_per_client):
+            started = time.perf_counter()
+            try:
+                response = scenario(http, base_url, client, index)
+                failed = response.status_code >= 400
+            except requests.RequestException:
+                failed = True
+            seconds = time.perf_counter() - started
+            if index < warmup:
+                continue
+            with lock:
+                latencies.append(seconds)
+                errors += failed
+
+    with ThreadPoolExecutor(max_workers=len(clients)) as executor:
+        started = time.perf_counter()
+        list(executor.map(run_client, range(len(clients))))
+        elapsed = time.perf_counter() - started
+    # 준비 요청 시간까지 포함된 경과 시간을 측정 요청 비율만큼 보정
+    elapsed *= requests_per_client / (warmup + requests_per_client)
+    return summarize(latencies, errors, elapsed)
+
+
+def run_benchmark(args) -> Dict[str, Any]:
+    """가짜 서버와 앱을 띄우고 모든 엔드포인트 측정, 결과 반환"""
+    data_dir = tempfile.mkdtemp(prefix="assistant-bench-")
+    openai_server = FakeOpenAIServer(
+        ANSWER, latency=args.openai_latency, token_delay=args.token_delay, echo=True
+    ).start()
+    tts_server = FakeNaverTTSServer(latency=args.tts_latency).start().install()
+
+    use_temp_data_dir(data_dir)
+    Config.OPENAI_API_KEY = "benchmark"
+    Config.OPENAI_BASE_URL = openai_server.base_url
+    Config.NAVER_CLIENT_ID = Config.NAVER_CLIENT_SECRET = None
+    Config.LOG_CONSOLE = False
+
+    from werkzeug.serving import make_server
+    from app import app
+
+    seed_sessions(args.sessions)
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    clients = [requests.Session() for _ in range(args.clients)]
+
+    results = {}
+    try:
+        for name in args.endpoints:
+            results[name] = run_scenario(
+                SCENARIOS[name], base_url, clients, args.requests, args.warmup
+            )
+            print_result(name, results[name])
+        print(
+            f"가짜 서버 호출: OpenAI {len(openai_server.requests)}회, "
+            f"Naver TTS {len(tts_server.requests)}회"
+        )
+    finally:
+        server.shutdown()
+        openai_server.stop()
+        tts_server.stop()
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    return {"settings": benchmark_settings(args), "results": results}
+
+
+def benchmark_settings(args) -> Dict[str, Any]:
+    """기준 결과와 비교할 수 있는지 확인하는 측정 조건"""
+    return {
+        "clients": args.clients,
+        "requests": args.requests,
+        "sessions": args.sessions,
+        "openai_latency": args.openai_latency,
+        "token_delay": args.token_delay,
+        "tts_latency": args.tts_latency,
+    }
+
+
+def compare(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    tolerance: float,
+    min_delta_ms: float = 0.0,
+) -> List[str]:
+    """기준 결과보다 나빠진 항목 설명 목록
+
+    응답 시간은 비율(tolerance)과 절대값(min_delta_ms)을 모두 넘어야 저하로 본다
+    (수 ms 단위 엔드포인트의 측정 편차 무시).
+    """
+    regressions = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        slower = result["p95_ms"] - base["p95_ms"]
+        if slower > base["p95_ms"] * tolerance and slower > min_delta_ms:
+            regressions.append(
+                f"{name}: p95 {base['p95_ms']:.1f}ms -> {result['p95_ms']:.1f}ms"
+            )
+        if result["rps"] < base["rps"] * (1 - tolerance) and slower > min_delta_ms:
+            regressions.append(
+                f"{name}: 초당 요청 {base['rps']:.1f} -> {result['rps']:.1f}"
+            )
+        if result["errors"] > base["errors"]:
+            regressions.append(f"{name}: 오류 {base['errors']} -> {result['errors']}")
+    return regressions
+
+
+def print_header() -> None:
+    print(
+        f"{'엔드포인트':<24} {'요청':>6} {'오류':>5} {'p50(ms)':>9} "
+        f"{'p95(ms)':>9} {'p99(ms)':>9} {'초당 요청':>9}"
+    )
+
+
+def print_result(name: str, result: Dict[str, Any]) -> None:
+    print(
+        f"{name:<29} {result['requests']:>6} {result['errors']:>6} "
+        f"{result['p50_ms']:>9.1f} {result['p95_ms']:>9.1f} "
+        f"{result['p99_ms']:>9.1f} {result['rps']:>11.1f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="주요 엔드포인트 응답 시간/처리량 측정"
+    )
+    parser.add_argument("--clients", type=int, default=8, help="동시 클라이언트 수")
+    parser.add_argument(
+        "--requests", type=int, default=20, help="엔드포인트별 클라이언트당 요청 수"
+    )
+    parser.add_argument(
+        "--warmup",
+        type=int,
+        default=2,
+        help="집계에서 제외하는 클라이언트당 준비 요청 수",
+    )
+    parser.add_argument("--sessions", type=int, default=50, help="미리 저장할 세션 수")
+    parser.add_argument(
+        "--openai-latency", type=float, default=0.2, help="가짜 OpenAI 응답 지연(초)"
+    )
+    parser.add_argument(
+        "--token-delay", type=float, default=0.01, help="스트리밍 토큰 사이 지연(초)"
+    )
+    parser.add_argument(
+        "--tts-latency", type=float, default=0.1, help="가짜 Naver TTS 응답 지연(초)"
+    )
+    parser.add_argument(
+        "--endpoints",
+        nargs="+",
+        choices=list(SCENARIOS),
+        default=list(SCENARIOS),
+        help="측정할 엔드포인트",
+    )
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="기준 결과 파일")
+    parser.add_argument(
+        "--save-baseline", action="store_true", help="이번 결과를 기준 결과로 저장"
+    )
+    parser.add_argument(
+        "--tolerance", type=float, default=0.25, help="기준 대비 허용 변동 비율"
+    )
+    parser.add_argument(
+        "--min-delta-ms",
+        type=float,
+        default=20.0,
+        help="성능 저하로 보는 최소 p95 증가량(ms)",
+    )
+    args = parser.parse_args()
+
+    print(
+        f"클라이언트 {args.clients}개 x 요청 {args.requests}개, "
+        f"OpenAI 지연 {args.openai_latency}초, TTS 지연 {args.tts_latency}초"
+    )
+    print_header()
+    report = run_benchmark(args)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"기준 결과 저장: {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print("기준 결과 파일이 없습니다. --save-baseline으로 만들 수 있습니다.")
+        return
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("settings") != report["settings"]:
+        print("측정 조건이 기준 결과와 달라 비교하지 않습니다.")
+        return
+
+    regressions = compare(baseline, report, args.tolerance, args.min_delta_ms)
+    if not regressions:
+        print(f"기준 결과 대비 성능 저하 없음 (허용 범위 {args.tolerance:.0%})")
+        return
+    print("기준 결과 대비 성능 저하:")
+    for line in regressions:
+        print(f"  {line}")
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+알림 시간 파싱 마이크로 벤치마크
+
+/ask 요청마다 질문 전체에 알림 시간 파싱을 실행하므로 호출당 소요 시간을 측정한다.
+대부분의 질문에는 알림 요청이 없으므로 기록된 일반 질문(semantic_cache 기록 파일)과
+알림 요청 문장을 따로 측정하고, 이전 파서(정규식 하나, "N분/초/시간 뒤"만 인식)와 비교한다.
+
+사용법:
+    python -m benchmarks.notification_time [--traffic 파일] [--repeat 5] [--number 2000]
+"""
+
+from typing import Callable, List, Optional
+import re
+import time
+import argparse
+from utils import parse_notification_times
+from benchmarks.semantic_cache import DEFAULT_TRAFFIC, load_traffic
+
+REMINDERS = [
+    "5분 뒤에 알려줘",
+    "1시간 30분 뒤에 회의 준비하라고 알려줘",
+    "두 시간 반 있다가 빨래 꺼내라고 알려줘",
+    "내일 오전 9시에 보고서 제출하라고 알려줘",
+    "3시 반에 깨워줘",
+    "5분 뒤랑 30분 뒤에 알려줘",
+    "remind me in 30 minutes to call mom",
+    "remind me tomorrow at 9:30pm",
+    "remind me to take the cake out 45 minutes later",
+]
+
+
+def legacy_parse(text: str) -> Optional[int]:
+    """이전 파서 (비교용)"""
+    match = re.search(r"(\d+)\s*(분|초|시간)\s*뒤", text)
+    if not match:
+        return None
+    return int(match.group(1)) * {"초": 1, "분": 60, "시간": 3600}[match.group(2)]
+
+
+def measure(parse: Callable, texts: List[str], repeat: int, number: int) -> float:
+    """텍스트 하나당 평균 소요 시간(마이크로초), repeat번 중 가장 빠른 값"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            for text in texts:
+                parse(text)
+        best = min(best, time.perf_counter() - started)
+    return best / (number * len(texts)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="알림 시간 파싱 소요 시간 측정")
+    parser.add_argument("--traffic", default=DEFAULT_TRAFFIC, help="기록된 질문 파일")
+    parser.add_argument("--repeat", type=int, default=5, help="반복 측정 횟수")
+    parser.add_argument("--number", type=int, default=2000, help="측정당 반복 횟수")
+    args = parser.parse_args()
+
+    questions = [record["question"] for record in load_traffic(args.traffic)]
+    groups = [("일반 질문", questions), ("알림 요청", REMINDERS)]
+    print(f"{'입력':<8} {'개수':>6} {'인식':>6} {'현재(us)':>10} {'이전(us)':>10}")
+    for name, texts in groups:
+        found = sum(bool(parse_notification_times(text)) for text in texts)
+        current = measure(parse_notification_times, texts, args.repeat, args.number)
+        legacy = measure(legacy_parse, texts, args.repeat, args.number)
+        print(f"{name:<8} {len(texts):>6} {found:>6} {current:>10.2f} {legacy:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+유사 질문 캐시 오프라인 측정 도구
+
+기록된 질문 목록을 순서대로 재생하면서 유사도 기준값별로 적중률과 정확도를 계산한다.
+질문마다 캐시를 조회하고, 적중하지 않으면 그 질문을 캐시에 저장한다.
+
+사용법:
+    python -m benchmarks.semantic_cache [--traffic 파일] [--thresholds 0.6 0.7 0.8]
+
+기록 파일은 한 줄에 하나씩 {"question": ..., "intent": ..., "persona": ..., "style": ...}
+형식의 JSON이다. intent(같은 의도의 질문끼리 같은 값)는 정확도 계산에만 쓰이며,
+intent가 없는 질문은 적중률에만 반영된다. persona/style은 캐시 분할 키로 쓰인다.
+"""
+
+from typing import List, Dict, Any
+import os
+import json
+import time
+import argparse
+from services.semantic_cache_service import SemanticCache
+
+DEFAULT_TRAFFIC = os.path.join(
+    os.path.dirname(__file__), "semantic_cache_traffic.jsonl"
+)
+DEFAULT_THRESHOLDS = [0.6, 0.7, 0.8, 0.9]
+
+
+def load_traffic(path: str) -> List[Dict[str, Any]]:
+    """기록된 질문 목록 불러오기"""
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def replay(traffic: List[Dict[str, Any]], threshold: float) -> Dict[str, Any]:
+    """기준값 하나로 기록을 재생하고 적중률/정확도 반환"""
+    cache = SemanticCache(threshold=threshold, max_entries=len(traffic) or 1)
+    hits = labeled_hits = correct = repeats = 0
+    seen = set()
+    started = time.perf_counter()
+
+    for record in traffic:
+        partition = (
+            f"{record.get('persona', 'professional')}/{record.get('style', 'normal')}"
+        )
+        intent = record.get("intent")
+        if intent is not None:
+            repeats += (partition, intent) in seen
+            seen.add((partition, intent))
+
+        # 응답 대신 intent를 저장해 적중한 응답이 같은 의도였는지 확인
+        match = cache.lookup(partition, record["question"])
+        if match is None:
+            cache.store(partition, record["question"], intent or "")
+            continue
+        hits += 1
+        if intent is not None and match[0]:
+            labeled_hits += 1
+            correct += match[0] == intent
+
+    elapsed = time.perf_counter() - started
+    return {
+        "threshold": threshold,
+        "requests": len(traffic),
+        "hit_rate": hits / len(traffic) if traffic else 0.0,
+        "precision": correct / labeled_hits if labeled_hits else 1.0,
+        # 다시 나온 같은 의도의 질문 중 올바르게 재사용한 비율
+        "recall": correct / repeats if repeats else 0.0,
+        "avg_ms": elapsed * 1000 / len(traffic) if traffic else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="유사 질문 캐시 적중률/정확도 측정")
+    parser.add_argument("--traffic", default=DEFAULT_TRAFFIC, help="기록된 질문 파일")
+    parser.add_argument(
+        "--thresholds",
+        type=float,
+        nargs="+",
+        default=DEFAULT_THRESHOLDS,
+        help="측정할 유사도 기준값",
+    )
+    args = parser.parse_args()
+
+    traffic = load_traffic(args.traffic)
+    print(f"질문 {len(traffic)}개: {args.traffic}")
+    print(f"{'기준값':>6} {'적중률':>8} {'정확도':>8} {'재현율':>8} {'요청당(ms)':>10}")
+    for threshold in args.thresholds:
+        result = replay(traffic, threshold)
+        print(
+            f"{result['threshold']:>8.2f} {result['hit_rate']:>10.1%} "
+            f"{result['precision']:>10.1%} {result['recall']:>10.1%} "
+            f"{result['avg_ms']:>12.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@
 """
 
 import os
+import logging
 from typing import Dict, Any
 from dotenv import load_dotenv
 
@@ -15,12 +16,35 @@ class Config:
 
     # Flask 설정
     SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-here")
-    SESSION_TYPE = "filesystem"
+    # 세션 저장 방식: filesystem / sqlite / memory / cookie(Flask 기본)
+    SESSION_TYPE = os.getenv("SESSION_TYPE", "filesystem")
     PERMANENT_SESSION_LIFETIME_DAYS = 5
+    SESSION_CLEANUP_INTERVAL_SECONDS = 3600  # 만료 세션 정리 간격
+    # 쿠키 세션일 때 스트리밍 응답 후 세션 반영을 기다리는 대화 보관 한도
+    PENDING_HISTORY_MAX_SESSIONS = 1000
+    PENDING_HISTORY_TTL_SECONDS = 3600
+    # 중복 /ask 스트림이 처음 요청의 첫 응답을 기다리는 최대 시간 (넘으면 따로 처리)
+    SINGLEFLIGHT_WAIT_TIMEOUT_SECONDS = 60
 
     # OpenAI 설정
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
     OPENAI_MODEL = "gpt-4.1-nano"
+    OPENAI_MAX_CONNECTIONS = 200  # 비동기 클라이언트 연결 풀 크기
+    OPENAI_MAX_KEEPALIVE_CONNECTIONS = 50
+    OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL")  # 없으면 기본 API 주소
+    OPENAI_TIMEOUT_SECONDS = 30  # 요청 1회 제한 시간
+    OPENAI_DEADLINE_SECONDS = 60  # 재시도를 포함한 전체 제한 시간
+    OPENAI_MAX_RETRIES = 2
+    OPENAI_RETRY_BASE_DELAY_SECONDS = 0.5  # 지수 백오프 시작 값 (지터 적용)
+    OPENAI_RETRY_MAX_DELAY_SECONDS = 4
+    # 최근 p95 응답 시간이 지나도 응답이 없으면 같은 요청을 하나 더 보냄 (스트리밍 제외)
+    OPENAI_HEDGE_ENABLED = os.getenv("OPENAI_HEDGE_ENABLED", "false").lower() == "true"
+    OPENAI_HEDGE_PERCENTILE = 95
+    OPENAI_HEDGE_MIN_SAMPLES = 20  # 응답 시간 기록이 이보다 적으면 헤지하지 않음
+    # 기본 모델의 차단기가 열렸을 때 사용할 모델 (없으면 바로 실패)
+    OPENAI_FALLBACK_MODEL = os.getenv("OPENAI_FALLBACK_MODEL")
+    CIRCUIT_FAILURE_THRESHOLD = 5  # 연속 실패 횟수
+    CIRCUIT_RESET_SECONDS = 30  # 차단 후 시험 호출까지 대기 시간
 
     # Naver TTS 설정
     NAVER_CLIENT_ID = os.getenv("NAVER_CLIENT_ID")
@@ -33,12 +57,103 @@ class Config:
     SESSIONS_DIR = os.path.join(DATA_DIR, "sessions")
     EXPORTS_DIR = os.path.join(DATA_DIR, "exports")
     LOGS_DIR = os.path.join(DATA_DIR, "logs")
+    SESSION_STORE_DIR = os.path.join(DATA_DIR, "flask_sessions")
+    SESSION_SQLITE_PATH = os.path.join(DATA_DIR, "flask_sessions.db")
+    SQLITE_DB_PATH = os.path.join(DATA_DIR, "assistant.db")
     AUDIO_DIR = os.path.join("app", "static", "audio")
     FONTS_DIR = os.path.join("app", "static", "fonts")
 
     # 대화 설정
-    MAX_CONTEXT_MESSAGES = 20
-    MAX_TTS_LENGTH = 3000
+    MAX_CONTEXT_MESSAGES = 100  # 세션/파일에 보관하는 최근 메시지 수
+    CONTEXT_TOKEN_BUDGET = 3000  # API 요청 1회의 프롬프트 토큰 예산
+    CONTEXT_TOKENIZER_ENCODING = "o200k_base"  # tiktoken 인코딩 (gpt-4.1 계열)
+
+    # 대화 요약 설정: 최근 메시지는 그대로 보내고 그 이전은 요약으로 대체
+    SUMMARY_KEEP_RECENT_MESSAGES = 10  # 요약하지 않는 최근 메시지 수
+    SUMMARY_BATCH_MESSAGES = 10  # 요약되지 않은 이전 메시지가 이만큼 쌓이면 요약 갱신
+    SUMMARY_MODEL = OPENAI_MODEL
+    SUMMARY_MAX_TOKENS = 400
+    TTS_CHUNK_LENGTH = 300  # 청크 단위 음성 변환 시 청크 최대 길이
+
+    # 검색 색인 설정
+    SEARCH_MAX_CONVERSATIONS = 1000  # 메모리에 색인해 두는 현재 대화 수
+    SEARCH_PAGE_SIZE = 20
+
+    # 대화/세션 저장 방식: json(파일) / sqlite
+    STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "json")
+    SESSION_LIST_MAX_LIMIT = 500  # /list_sessions 한 번에 돌려주는 최대 세션 수
+
+    # 대화 기록 로그 설정
+    CONVERSATION_LOG_COMPACT_LINES = 200  # 로그가 이 줄 수를 넘으면 압축
+    CONVERSATION_FSYNC_BATCH = 16  # fsync 없이 허용하는 최대 추가 기록 수
+    CONVERSATION_FSYNC_INTERVAL_SECONDS = 1.0  # fsync 최대 지연 시간
+    CONVERSATION_LOCK_STRIPES = 64  # 사용자별 로그 잠금 분할 수
+    CONVERSATION_STATE_CACHE_SIZE = 10000  # 로그 상태를 메모리에 유지할 사용자 수
+
+    # 로그 설정 (큐를 거쳐 별도 스레드에서 기록)
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+    LOG_FILE = os.path.join(LOGS_DIR, "app.log")  # JSON 한 줄씩 기록
+    LOG_MAX_BYTES = 10 * 1024 * 1024  # 이 크기를 넘으면 새 파일로 교체
+    LOG_BACKUP_COUNT = 5
+    LOG_CONSOLE = os.getenv("LOG_CONSOLE", "true") == "true"  # 콘솔에도 출력
+    LOG_QUEUE_SIZE = 10000  # 기록 대기 로그 수 상한 (넘으면 버림)
+    # 프롬프트/AI 응답 등 긴 내용은 DEBUG 수준에서 이 비율의 요청만 기록
+    LOG_PAYLOAD_SAMPLE_RATE = float(os.getenv("LOG_PAYLOAD_SAMPLE_RATE", "0.1"))
+    LOG_PAYLOAD_MAX_CHARS = 500
+
+    # 성능 측정 설정 (/metrics)
+    # 요청마다 단계별 소요 시간(span)을 한 줄로 출력
+    TRACE_REQUESTS = os.getenv("TRACE_REQUESTS", "false") == "true"
+
+    # ASGI 실행 설정 (uvicorn asgi:application)
+    # /ask 외 경로(Flask)를 동시에 처리하는 스레드 수
+    ASGI_WSGI_THREADS = int(os.getenv("ASGI_WSGI_THREADS", "16"))
+
+    # 알림 예약 설정 (서버에서 예약하고 /notification_stream으로 전달)
+    NOTIFICATIONS_LOG_PATH = os.path.join(DATA_DIR, "notifications.jsonl")
+    NOTIFICATION_MAX_DELAY_SECONDS = 30 * 24 * 3600  # 예약할 수 있는 최대 지연 시간
+    NOTIFICATION_MAX_PENDING_PER_USER = 100  # 사용자별 발송 전 알림 수 상한
+    NOTIFICATION_MAX_UNDELIVERED_PER_USER = 50  # 미접속 사용자에게 보관하는 알림 수
+    NOTIFICATION_SUBSCRIBER_QUEUE_SIZE = 100  # 연결별 전달 대기 알림 수
+    NOTIFICATION_KEEPALIVE_SECONDS = 15  # 알림 스트림 연결 유지 신호 간격
+    # WSGI(gunicorn)에서 알림 스트림 한 번이 스레드를 점유하는 최대 시간 (끝나면 브라우저가 다시 연결)
+    NOTIFICATION_STREAM_TIMEOUT_SECONDS = 25
+    NOTIFICATION_COMPACT_MIN_LINES = 1000  # 로그가 이보다 짧으면 압축하지 않음
+
+    # 음성 변환 작업 큐 설정
+    TTS_MAX_WORKERS = 2  # 동시에 처리되는 음성 변환 작업 수
+    TTS_CHUNK_WORKERS = 4  # 동시에 실행되는 TTS 청크 호출 수
+    TTS_MAX_PENDING_JOBS = 50  # 대기 중인 작업 수 상한
+    TTS_JOB_TTL_SECONDS = 600  # 완료된 작업 결과 보관 시간
+
+    # 음성 파일 캐시 설정
+    TTS_CACHE_MAX_BYTES = 200 * 1024 * 1024  # 캐시 디렉토리 최대 크기
+
+    # 대화 내보내기 캐시 설정 (같은 대화 내용/형식의 결과 재사용)
+    EXPORT_CACHE_ENABLED = os.getenv("EXPORT_CACHE_ENABLED", "true") == "true"
+    EXPORT_CACHE_MAX_BYTES = 50 * 1024 * 1024  # 메모리에 보관하는 결과 최대 크기
+    BULK_EXPORT_WORKERS = 4  # 여러 세션 일괄 내보내기 시 동시에 변환하는 세션 수
+    BULK_EXPORT_PREFETCH = 8  # 미리 변환해 두는 세션 수 (메모리 사용량 상한)
+
+    # AI 응답 캐시 설정 (같은 요청 메시지에 대한 응답 재사용)
+    RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "false") == "true"
+    RESPONSE_CACHE_TIER = os.getenv("RESPONSE_CACHE_TIER", "memory")  # memory/sqlite
+    RESPONSE_CACHE_MAX_ENTRIES = 1000  # 프로세스 메모리에 보관하는 응답 수
+    RESPONSE_CACHE_TTL_SECONDS = 3600
+    RESPONSE_CACHE_SQLITE_PATH = os.path.join(DATA_DIR, "response_cache.db")
+    RESPONSE_CACHE_REUSE_AUDIO = True  # 캐시된 응답의 음성 파일이 남아 있으면 재사용
+
+    # 유사 질문 응답 캐시 설정
+    SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "false") == "true"
+    SEMANTIC_CACHE_THRESHOLD = 0.8  # 이 코사인 유사도 이상이면 같은 질문으로 판단
+    SEMANTIC_CACHE_DIMENSIONS = 2048  # 질문 벡터 차원
+    SEMANTIC_CACHE_MAX_ENTRIES = 2000  # 페르소나/스타일별 보관 질문 수
+    SEMANTIC_CACHE_MAX_PARTITIONS = 32
+    # 질문 벡터는 워커 프로세스마다 따로 보관하며 질문이 쌓이는 만큼 늘어남
+    # 최대 메모리: 4바이트 × DIMENSIONS × MAX_ENTRIES × MAX_PARTITIONS
+    # (기본값으로 파티션당 약 16MB, 모두 차면 워커당 약 512MB)
+    SEMANTIC_CACHE_STANDALONE_ONLY = True  # 이전 대화 없이 보낸 질문만 재사용
+    SEMANTIC_CACHE_TTL_SECONDS = 3600  # 저장된 응답을 재사용하는 시간
 
     # AI 응답 길이 설정
     AI_STYLE_SETTINGS: Dict[str, Dict[str, Any]] = {
@@ -82,11 +197,11 @@ class Config:
     def validate_config(cls) -> bool:
         """설정 유효성 검사"""
         if not cls.OPENAI_API_KEY:
-            print("경고: OPENAI_API_KEY가 설정되지 않았습니다!")
+            logging.getLogger(__name__).warning("OPENAI_API_KEY가 설정되지 않았습니다!")
             return False
 
         if not cls.NAVER_CLIENT_ID or not cls.NAVER_CLIENT_SECRET:
-            print("경고: Naver TTS 설정이 되어있지 않습니다!")
+            logging.getLogger(__name__).warning("Naver TTS 설정이 되어있지 않습니다!")
             return False
 
         return True
@@ -99,6 +214,7 @@ class Config:
             cls.SESSIONS_DIR,
             cls.EXPORTS_DIR,
             cls.LOGS_DIR,
+            cls.SESSION_STORE_DIR,
             cls.AUDIO_DIR,
         ]
 
@@ -0,0 +1,29 @@
+"""
+기존 JSON 대화 기록과 세션 파일을 SQLite 데이터베이스로 가져오는 도구
+
+사용법:
+    python migrate_to_sqlite.py [--db data/assistant.db]
+
+가져온 뒤 STORAGE_BACKEND=sqlite 환경 변수로 앱을 실행하면 된다.
+같은 데이터를 여러 번 가져와도 결과는 같다.
+"""
+
+import argparse
+from config import Config
+from services.sqlite_storage_service import SQLiteStorage, migrate_json_to_sqlite
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON 데이터를 SQLite로 가져오기")
+    parser.add_argument("--db", default=Config.SQLITE_DB_PATH, help="데이터베이스 경로")
+    args = parser.parse_args()
+
+    counts = migrate_json_to_sqlite(SQLiteStorage(args.db))
+    print(
+        f"가져오기 완료: 대화 기록 {counts['conversations']}개, "
+        f"세션 {counts['sessions']}개 -> {args.db}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+여러 세션 일괄 내보내기 서비스
+
+저장된 세션들을 TXT/PDF/JSON으로 변환해 ZIP 하나로 묶어 응답으로 바로 전송한다.
+- 세션 변환은 작업 스레드 풀에서 병렬로 진행
+- 미리 변환해 두는 세션 수를 제한하고, 변환이 끝난 순서대로가 아니라 요청한 순서대로
+  ZIP에 추가한 뒤 바로 내보내므로 세션 수와 관계없이 메모리 사용량이 일정하다.
+"""
+
+from typing import List, Iterator, Tuple
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import io
+import os
+import json
+import zipfile
+import logging
+from config import Config
+from services.metrics_service import timed
+from services.session_service import load_session, list_sessions
+from services.pdf_service import generate_conversation_pdf, generate_conversation_txt
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ("txt", "pdf", "json")
+
+# 여러 요청의 세션 변환이 공유하는 풀
+_render_executor = ThreadPoolExecutor(
+    max_workers=Config.BULK_EXPORT_WORKERS, thread_name_prefix="bulk-export"
+)
+
+
+class _ChunkWriter(io.RawIOBase):
+    """ZipFile이 쓴 바이트를 모아 두었다가 꺼내 가는 쓰기 전용 스트림 (탐색 불가)"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def resolve_session_filenames(selected: List[str] = None) -> List[str]:
+    """내보낼 세션 파일명 목록 (selected가 없으면 전체, 최신순)
+
+    저장된 세션이 아닌 이름이 있으면 ValueError.
+    """
+    available = [s["filename"] for s in list_sessions()]
+    if not selected:
+        return available
+    known = set(available)
+    unknown = [name for name in selected if name not in known]
+    if unknown:
+        raise ValueError(f"해당 세션을 찾을 수 없습니다: {', '.join(unknown)}")
+    return list(dict.fromkeys(selected))
+
+
+@timed("bulk_export_render")
+def render_session(filename: str, formats: List[str]) -> List[Tuple[str, bytes]]:
+    """세션 하나를 (ZIP 내 경로, 내용) 목록으로 변환"""
+    try:
+        session_data = load_session(filename)
+    except FileNotFoundError:
+        logger.info("일괄 내보내기 중 세션이 삭제되었습니다: %s", filename)
+        return []
+
+    stem = os.path.splitext(filename)[0]
+    messages = session_data.get("messages", [])
+    entries = []
+    for export_format in formats:
+        if export_format == "txt":
+            data = b"".join(generate_conversation_txt(messages))
+        elif export_format == "pdf":
+            data = b"".join(generate_conversation_pdf(messages))
+        else:
+            data = json.dumps(session_data, ensure_ascii=False, indent=2).encode(
+                "utf-8"
+            )
+        entries.append((f"{stem}.{export_format}", data))
+    return entries
+
+
+def generate_sessions_zip(filenames: List[str], formats: List[str]) -> Iterator[bytes]:
+    """세션들을 병렬로 변환해 ZIP 바이트 조각으로 생성
+
+    형식 오류는 이 함수를 호출할 때 바로 발생한다.
+    """
+    if isinstance(formats, str):
+        formats = [formats]
+    if not formats:
+        raise ValueError("내보낼 형식을 선택해주세요.")
+    for export_format in formats:
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"지원하지 않는 내보내기 형식입니다: {export_format}")
+    return _stream_zip(filenames, list(dict.fromkeys(formats)))
+
+
+def _stream_zip(filenames: List[str], formats: List[str]) -> Iterator[bytes]:
+    output = _ChunkWriter()
+    pending = deque()
+    remaining = iter(filenames)
+
+    def fill():
+        while len(pending) < Config.BULK_EXPORT_PREFETCH:
+            filename = next(remaining, None)
+            if filename is None:
+                return
+            pending.append(_render_executor.submit(render_session, filename, formats))
+
+    try:
+        with zipfile.ZipFile(output, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            fill()
+            while pending:
+                entries = pending.popleft().result()
+                fill()
+                for name, data in entries:
+                    archive.writestr(name, data)
+                    chunk = output.drain()
+                    if chunk:
+                        yield chunk
+        yield output.drain()  # 중앙 디렉토리
+    finally:
+        # 연결이 끊긴 경우 아직 시작하지 않은 변환 취소
+        for future in pending:
+            future.cancel()
+
+
+def export_archive_filename() -> str:
+    """일괄 내보내기 파일 이름 (sessions_YYYYmmdd_HHMMSS.zip)"""
+    return f"sessions_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
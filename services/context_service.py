@@ -0,0 +1,111 @@
+"""
+대화 컨텍스트 구성 서비스
+
+메시지 개수 대신 토큰 수를 기준으로, 최신 메시지부터 예산 안에 들어가는 만큼만
+API 요청에 포함한다. 메시지별 토큰 수는 메시지에 저장해 두고 재사용한다.
+"""
+
+import re
+from typing import Dict, Any, List, Optional
+from config import Config
+
+try:
+    import tiktoken
+except ImportError:  # 토크나이저가 없으면 근사치로 계산
+    tiktoken = None
+
+# 메시지 하나에 붙는 역할/구분자 토큰 수 (chat 포맷 기준 근사치)
+MESSAGE_OVERHEAD_TOKENS = 4
+TOKEN_COUNT_KEY = "token_count"
+SUMMARY_PREFIX = "이전 대화 요약:"
+
+# 근사치 계산용: 영문/숫자 단어, 한글 등 비ASCII 문자, 그 외 기호
+_ESTIMATE_PATTERN = re.compile(r"[A-Za-z0-9]+|[^\x00-\x7f]|[^\sA-Za-z0-9]")
+
+_encoding = None
+
+
+def get_tokenizer_name() -> str:
+    """현재 사용하는 토크나이저 이름 (캐시된 토큰 수 검증용)"""
+    if tiktoken is None:
+        return "estimate"
+    return Config.CONTEXT_TOKENIZER_ENCODING
+
+
+def _get_encoding():
+    global _encoding
+    if _encoding is None:
+        _encoding = tiktoken.get_encoding(Config.CONTEXT_TOKENIZER_ENCODING)
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    """텍스트의 토큰 수 계산"""
+    if not text:
+        return 0
+    if tiktoken is not None:
+        return len(_get_encoding().encode(text))
+
+    tokens = 0
+    for piece in _ESTIMATE_PATTERN.findall(text):
+        # 영문 단어는 대략 4글자당 1토큰, 한글/기호는 글자당 1토큰
+        tokens += (len(piece) + 3) // 4 if piece.isascii() else 1
+    return tokens
+
+
+def message_tokens(message: Dict[str, Any]) -> int:
+    """메시지의 토큰 수 (메시지에 저장된 값이 있으면 재사용, 없으면 계산 후 저장)"""
+    cached = message.get(TOKEN_COUNT_KEY)
+    tokenizer = get_tokenizer_name()
+    if isinstance(cached, dict) and cached.get("tokenizer") == tokenizer:
+        return cached["count"]
+
+    count = count_tokens(message.get("content", "")) + MESSAGE_OVERHEAD_TOKENS
+    message[TOKEN_COUNT_KEY] = {"tokenizer": tokenizer, "count": count}
+    return count
+
+
+def build_context_messages(
+    system_prompt: str,
+    history: List[Dict[str, Any]],
+    user_input: str,
+    token_budget: Optional[int] = None,
+    summary: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """시스템 프롬프트와 사용자 입력을 포함해 토큰 예산 안에서 API 요청 메시지 구성
+
+    이전 대화 요약이 있으면 시스템 프롬프트 바로 뒤에 넣고,
+    대화 기록은 최신 메시지부터 예산이 허용하는 만큼 포함한다.
+    API에는 role/content만 전달한다.
+    """
+    if token_budget is None:
+        token_budget = Config.CONTEXT_TOKEN_BUDGET
+
+    system_message = {"role": "system", "content": system_prompt}
+    user_message = {"role": "user", "content": user_input}
+    remaining = token_budget - message_tokens(system_message)
+    remaining -= message_tokens(user_message)
+
+    prefix = [system_message]
+    if summary:
+        summary_message = {
+            "role": "system",
+            "content": f"{SUMMARY_PREFIX}\n{summary}",
+        }
+        remaining -= message_tokens(summary_message)
+        prefix.append(summary_message)
+
+    selected = []
+    for message in reversed(history):
+        tokens = message_tokens(message)
+        if tokens > remaining:
+            break
+        remaining -= tokens
+        selected.append({"role": message["role"], "content": message["content"]})
+    selected.reverse()
+
+    return [
+        *({"role": m["role"], "content": m["content"]} for m in prefix),
+        *selected,
+        {"role": "user", "content": user_input},
+    ]
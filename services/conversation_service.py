@@ -1,52 +1,359 @@
 """
 대화 기록 관리 서비스
+
+대화 기록은 JSON Lines 형식의 추가 전용 로그로 저장한다.
+메시지 하나를 기록할 때는 한 줄만 덧붙이고, 로그가 길어지면
+최근 메시지만 남기도록 새 파일에 다시 써서 교체(압축)한다.
+
+user_id를 지정하면 사용자별 로그(users/ab/cd/<user_id>.jsonl)를 사용하고,
+지정하지 않으면 기존의 공용 로그를 사용한다.
+로그 추가/압축은 프로세스 간 파일 잠금(.locks/) 안에서 하므로 여러 워커가 같은
+로그를 써도 압축 중에 추가된 메시지가 사라지지 않는다.
+오래된 대화의 요약은 로그 옆의 <로그 이름>.summary.json에 저장한다.
+Config.STORAGE_BACKEND가 "sqlite"이면 같은 함수가 SQLite 저장소를 사용한다.
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+from collections import OrderedDict
 import os
+import re
 import json
-import traceback
+import time
+import zlib
+import atexit
+import threading
+import logging
 from config import Config
+from services.file_lock_service import ReentrantFileLock
+from services.metrics_service import timed
+from services.sqlite_storage_service import use_sqlite_storage, get_storage
 
+logger = logging.getLogger(__name__)
 
-def save_conversation_history(history: List[Dict[str, Any]]) -> None:
-    """대화 기록을 파일에 저장"""
-    try:
-        conversation_file = os.path.join(
-            Config.CONVERSATIONS_DIR, "conversation_history.json"
+CONVERSATION_LOG_NAME = "conversation_history.jsonl"
+SUMMARY_SUFFIX = ".summary.json"
+LEGACY_CONVERSATION_FILE_NAME = "conversation_history.json"
+USERS_DIR_NAME = "users"
+LOCKS_DIR_NAME = ".locks"
+USER_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+# 사용자 수와 관계없이 잠금 개수(잠금 파일 수)를 고정하기 위해 키 해시로 잠금을 나눠 사용
+_lock_stripes = [
+    ReentrantFileLock(
+        lambda i=i: os.path.join(Config.CONVERSATIONS_DIR, LOCKS_DIR_NAME, f"{i}.lock")
+    )
+    for i in range(Config.CONVERSATION_LOCK_STRIPES)
+]
+_states_lock = threading.Lock()
+# 로그 경로 -> {lines: 줄 수, inode: 줄 수를 센 파일, unsynced: fsync 대기 기록 수,
+#              last_sync: 마지막 fsync 시각}
+_log_states: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_sync_timer: Optional[threading.Timer] = None
+
+
+def _conversation_log_path(user_id: Optional[str] = None) -> str:
+    """사용자 ID에 해당하는 로그 경로 반환 (두 단계 디렉토리로 분산)"""
+    if user_id is None:
+        return os.path.join(Config.CONVERSATIONS_DIR, CONVERSATION_LOG_NAME)
+    if not USER_ID_PATTERN.match(user_id):
+        raise ValueError("유효하지 않은 사용자 ID입니다.")
+    return os.path.join(
+        Config.CONVERSATIONS_DIR,
+        USERS_DIR_NAME,
+        user_id[:2],
+        user_id[2:4],
+        f"{user_id}.jsonl",
+    )
+
+
+def _summary_path(user_id: Optional[str] = None) -> str:
+    """대화 로그에 대응하는 요약 파일 경로"""
+    path = _conversation_log_path(user_id)
+    return path[: -len(".jsonl")] + SUMMARY_SUFFIX
+
+
+def _user_key(user_id: Optional[str]) -> str:
+    """SQLite 저장소에서 사용할 사용자 키 (공용 기록은 빈 문자열)"""
+    if user_id is None:
+        return ""
+    if not USER_ID_PATTERN.match(user_id):
+        raise ValueError("유효하지 않은 사용자 ID입니다.")
+    return user_id
+
+
+def _lock_for(path: str) -> ReentrantFileLock:
+    return _lock_stripes[zlib.crc32(path.encode("utf-8")) % len(_lock_stripes)]
+
+
+def _state_for(path: str) -> Dict[str, Any]:
+    """로그 상태 반환 (오래 사용되지 않은 상태는 버리고 필요 시 다시 계산)"""
+    evicted = []
+    with _states_lock:
+        state = _log_states.get(path)
+        if state is None:
+            state = {"lines": None, "inode": None, "unsynced": 0, "last_sync": 0.0}
+            _log_states[path] = state
+            while len(_log_states) > Config.CONVERSATION_STATE_CACHE_SIZE:
+                evicted_path, evicted_state = _log_states.popitem(last=False)
+                if evicted_state["unsynced"]:
+                    evicted.append(evicted_path)
+        else:
+            _log_states.move_to_end(path)
+    # 상태를 버리면 타이머가 fsync하지 못하므로 바로 기록
+    for evicted_path in evicted:
+        _fsync_path(evicted_path)
+    return state
+
+
+def _fsync_path(path: str) -> None:
+    if os.path.exists(path):
+        with open(path, "a", encoding="utf-8") as f:
+            os.fsync(f.fileno())
+
+
+def _schedule_sync() -> None:
+    """fsync를 미룬 기록이 있으면 최대 지연 시간 뒤에 기록하도록 예약"""
+    global _sync_timer
+    with _states_lock:
+        if _sync_timer is not None:
+            return
+        _sync_timer = threading.Timer(
+            Config.CONVERSATION_FSYNC_INTERVAL_SECONDS, flush_conversation_logs
         )
-        os.makedirs(Config.CONVERSATIONS_DIR, exist_ok=True)
+        _sync_timer.daemon = True
+        _sync_timer.start()
+
+
+def flush_conversation_logs() -> None:
+    """fsync를 미룬 모든 로그를 디스크에 기록 (타이머와 프로세스 종료 시 호출)"""
+    global _sync_timer
+    with _states_lock:
+        _sync_timer = None
+        paths = [path for path, state in _log_states.items() if state["unsynced"]]
+    for path in paths:
+        try:
+            with _lock_for(path):
+                state = _state_for(path)
+                if state["unsynced"]:
+                    _fsync_path(path)
+                    state.update(unsynced=0, last_sync=time.time())
+        except Exception as e:
+            logger.warning("대화 로그 fsync 중 오류 발생: %s", e)
+
 
-        print(f"저장할 대화 내용 수: {len(history)}")
+atexit.register(flush_conversation_logs)
 
-        with open(conversation_file, "w", encoding="utf-8") as f:
-            json.dump(history, f, ensure_ascii=False, indent=2)
 
-        print(f"대화 내용 저장 완료: {conversation_file}")
-        print(f"파일 크기: {os.path.getsize(conversation_file)} bytes")
+def _read_log(path: str) -> List[Dict[str, Any]]:
+    """로그를 처음부터 재생하여 메시지 목록 구성"""
+    history = []
+    lines = 0
+    with open(path, "r", encoding="utf-8") as f:
+        inode = os.fstat(f.fileno()).st_ino
+        for line in f:
+            lines += 1
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # 기록 도중 중단되어 잘린 마지막 줄은 무시
+                logger.warning("손상된 대화 로그 줄을 건너뜁니다: %s:%d", path, lines)
+                continue
+            if record.get("op") == "append":
+                history.append(record["message"])
+            elif record.get("op") == "clear":
+                history = []
+    _state_for(path).update(lines=lines, inode=inode)
+    return history
+
+
+def _write_snapshot(path: str, history: List[Dict[str, Any]]) -> None:
+    """메시지 목록으로 새 로그를 작성한 뒤 원자적으로 교체"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        for message in history:
+            f.write(
+                json.dumps({"op": "append", "message": message}, ensure_ascii=False)
+            )
+            f.write("\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+    _state_for(path).update(
+        lines=len(history),
+        inode=os.stat(path).st_ino,
+        unsynced=0,
+        last_sync=time.time(),
+    )
+
+
+def _migrate_legacy_history(path: str) -> None:
+    """기존 JSON 파일만 있으면 로그 형식으로 옮기기 (잠금 상태에서 호출)"""
+    legacy_file = os.path.join(Config.CONVERSATIONS_DIR, LEGACY_CONVERSATION_FILE_NAME)
+    if os.path.exists(path) or not os.path.exists(legacy_file):
+        return
+    with open(legacy_file, "r", encoding="utf-8") as f:
+        history = json.load(f)
+    _write_snapshot(path, history)
+    logger.info(
+        "기존 대화 기록을 로그 형식으로 옮겼습니다: %d개의 메시지", len(history)
+    )
+
+
+@timed("conversation_save")
+def save_conversation_history(
+    history: List[Dict[str, Any]], user_id: Optional[str] = None
+) -> None:
+    """대화 기록 전체를 파일에 저장 (로그를 이 내용으로 교체)"""
+    try:
+        if use_sqlite_storage():
+            get_storage().replace_messages(_user_key(user_id), history)
+            get_storage().save_summary(_user_key(user_id), None)
+            logger.debug("대화 내용 저장 완료: %d개의 메시지", len(history))
+            return
+
+        path = _conversation_log_path(user_id)
+        with _lock_for(path):
+            _write_snapshot(path, history)
+            # 기록 전체가 바뀌었으므로 이전 요약은 더 이상 맞지 않음
+            save_conversation_summary(None, user_id)
+        logger.debug("대화 내용 저장 완료: %d개의 메시지", len(history))
+    except Exception as e:
+        logger.exception("대화 내용 저장 중 오류 발생: %s", e)
+
+
+@timed("conversation_save")
+def append_conversation_message(
+    message: Dict[str, Any], user_id: Optional[str] = None
+) -> None:
+    """메시지 하나를 로그 끝에 추가 (fsync는 묶어서 수행)"""
+    try:
+        if use_sqlite_storage():
+            get_storage().append_message(_user_key(user_id), message)
+            return
+
+        path = _conversation_log_path(user_id)
+        line = json.dumps({"op": "append", "message": message}, ensure_ascii=False)
+
+        with _lock_for(path):
+            if user_id is None:
+                _migrate_legacy_history(path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            state = _state_for(path)
+
+            with open(path, "a", encoding="utf-8") as f:
+                # 처음 쓰는 로그이거나 다른 프로세스가 압축해 파일이 바뀌었으면 줄 수를 다시 셈
+                if state["inode"] != os.fstat(f.fileno()).st_ino:
+                    _read_log(path)
+                f.write(line + "\n")
+                f.flush()
+                state["lines"] += 1
+                state["unsynced"] += 1
+
+                now = time.time()
+                if (
+                    state["unsynced"] >= Config.CONVERSATION_FSYNC_BATCH
+                    or now - state["last_sync"]
+                    >= Config.CONVERSATION_FSYNC_INTERVAL_SECONDS
+                ):
+                    os.fsync(f.fileno())
+                    state.update(unsynced=0, last_sync=now)
+
+            if state["lines"] > Config.CONVERSATION_LOG_COMPACT_LINES:
+                compact_conversation_history(user_id)
+        if state["unsynced"]:
+            _schedule_sync()
     except Exception as e:
-        print(f"대화 내용 저장 중 오류 발생: {str(e)}")
-        traceback.print_exc()
+        logger.exception("대화 내용 추가 중 오류 발생: %s", e)
+
+
+def clear_conversation_history(user_id: Optional[str] = None) -> None:
+    """대화 기록 전체 삭제"""
+    save_conversation_history([], user_id)
+
+
+def compact_conversation_history(user_id: Optional[str] = None) -> None:
+    """최근 메시지만 남기도록 로그를 다시 작성"""
+    if use_sqlite_storage():
+        return
+    path = _conversation_log_path(user_id)
+    with _lock_for(path):
+        if not os.path.exists(path):
+            return
+        history = _read_log(path)[-Config.MAX_CONTEXT_MESSAGES :]
+        _write_snapshot(path, history)
+        logger.debug("대화 로그 압축 완료: %d개의 메시지", len(history))
 
 
-def load_conversation_history() -> List[Dict[str, Any]]:
+@timed("conversation_load")
+def load_conversation_history(user_id: Optional[str] = None) -> List[Dict[str, Any]]:
     """파일에서 대화 기록 불러오기"""
     try:
-        conversation_file = os.path.join(
-            Config.CONVERSATIONS_DIR, "conversation_history.json"
-        )
+        if use_sqlite_storage():
+            history = get_storage().load_messages(
+                _user_key(user_id), Config.MAX_CONTEXT_MESSAGES
+            )
+            logger.debug("대화 내용 불러오기 완료: %d개의 메시지", len(history))
+            return history
 
-        print(f"대화 내용 파일 경로: {conversation_file}")
+        history = load_file_conversation_history(user_id)[
+            -Config.MAX_CONTEXT_MESSAGES :
+        ]
+        logger.debug("대화 내용 불러오기 완료: %d개의 메시지", len(history))
+        return history
+    except Exception as e:
+        logger.exception("대화 내용 불러오기 중 오류 발생: %s", e)
+        return []
 
-        if os.path.exists(conversation_file):
-            with open(conversation_file, "r", encoding="utf-8") as f:
-                history = json.load(f)
-                print(f"대화 내용 불러오기 완료: {len(history)}개의 메시지")
-                return history
-        else:
-            print(f"대화 내용 파일이 없음: {conversation_file}")
+
+def load_file_conversation_history(
+    user_id: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """로그 파일의 대화 기록 전체 (저장소 설정과 관계없이 읽고 개수를 줄이지 않음)"""
+    path = _conversation_log_path(user_id)
+    with _lock_for(path):
+        if user_id is None:
+            _migrate_legacy_history(path)
+        if not os.path.exists(path):
+            logger.debug("대화 내용 파일이 없음: %s", path)
             return []
+        return _read_log(path)
+
+
+def load_conversation_summary(
+    user_id: Optional[str] = None,
+) -> Optional[Dict[str, Any]]:
+    """저장된 대화 요약 불러오기 (없으면 None)"""
+    try:
+        if use_sqlite_storage():
+            return get_storage().load_summary(_user_key(user_id))
+
+        path = _summary_path(user_id)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
     except Exception as e:
-        print(f"대화 내용 불러오기 중 오류 발생: {str(e)}")
-        traceback.print_exc()
-        return []
+        logger.warning("대화 요약 불러오기 중 오류 발생: %s", e)
+        return None
+
+
+def save_conversation_summary(
+    summary: Optional[Dict[str, Any]], user_id: Optional[str] = None
+) -> None:
+    """대화 요약 저장 (None이면 삭제)"""
+    if use_sqlite_storage():
+        get_storage().save_summary(_user_key(user_id), summary)
+        return
+
+    path = _summary_path(user_id)
+    if summary is None:
+        if os.path.exists(path):
+            os.remove(path)
+        return
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False)
+    os.replace(temp_path, path)
@@ -0,0 +1,83 @@
+"""
+파일 잠금 서비스
+
+여러 워커 프로세스가 같은 데이터 파일을 고칠 때 쓰는 프로세스 간 잠금.
+잠금은 데이터 파일과 별도인 잠금 파일에 fcntl.flock으로 건다
+(데이터 파일은 os.replace로 교체되므로 데이터 파일 자체를 잠그면 안 됨).
+fcntl이 없는 환경(Windows)에서는 프로세스 간 잠금 없이 동작한다.
+"""
+
+from typing import IO, Callable, Iterator
+from contextlib import contextmanager
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+def _open_lock_file(lock_path: str) -> IO:
+    os.makedirs(os.path.dirname(lock_path) or ".", exist_ok=True)
+    return open(lock_path, "a")
+
+
+@contextmanager
+def file_lock(lock_path: str) -> Iterator[None]:
+    """잠금 파일에 배타적 잠금 (다른 프로세스/스레드가 풀 때까지 기다림)"""
+    with _open_lock_file(lock_path) as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def wait_lock(lock_path: str) -> IO:
+    """잠금을 얻을 때까지 기다린 뒤 잠금 파일 반환 (닫을 때까지 잠금 유지)"""
+    f = _open_lock_file(lock_path)
+    if fcntl is not None:
+        try:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        except BaseException:
+            f.close()
+            raise
+    return f
+
+
+class ReentrantFileLock:
+    """같은 스레드에서 다시 잡을 수 있는 스레드 + 프로세스 간 잠금
+
+    lock_path는 잠글 때마다 호출해 잠금 파일 경로를 얻는다 (설정 경로가 바뀌어도 따라감).
+    """
+
+    def __init__(self, lock_path: Callable[[], str]):
+        self._lock_path = lock_path
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._held = None
+
+    def __enter__(self) -> "ReentrantFileLock":
+        self._lock.acquire()
+        try:
+            if self._depth == 0:
+                held = file_lock(self._lock_path())
+                held.__enter__()
+                self._held = held
+        except BaseException:
+            self._lock.release()
+            raise
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._depth -= 1
+        try:
+            if self._depth == 0:
+                held, self._held = self._held, None
+                held.__exit__(None, None, None)
+        finally:
+            self._lock.release()
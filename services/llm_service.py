@@ -0,0 +1,449 @@
+"""
+OpenAI 클라이언트 서비스
+
+모든 채팅 API 호출은 ResilientChatClient를 거친다.
+- 요청 1회 제한 시간과 재시도를 포함한 전체 제한 시간
+- 재시도 가능한 오류(시간 초과, 연결 오류, 429, 5xx)는 지터를 적용한 지수 백오프로 재시도
+- (선택) 최근 p95 응답 시간이 지나도 응답이 없으면 같은 요청을 하나 더 보내 먼저 온 응답 사용
+- 모델별 차단기: 연속 실패 시 빠르게 실패하거나 대체 모델로 요청
+
+비동기 경로(asgi.py)에서 사용하는 AsyncOpenAI 클라이언트는 이벤트 루프마다
+하나씩 만들어 공유한다. 모든 요청이 같은 HTTP 연결 풀을 재사용한다.
+"""
+
+from typing import Dict, Any, List, AsyncIterator, Iterator, Optional, Callable
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import time
+import asyncio
+import threading
+import httpx
+import openai
+import logging
+from openai import AsyncOpenAI, OpenAI
+from config import Config
+from services.metrics_service import record_stage, record_upstream_error, timed
+from services.resilience_service import (
+    CircuitBreaker,
+    CircuitOpenError,
+    DeadlineExceededError,
+    LatencyTracker,
+    retry_delay,
+)
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_INSTRUCTION = (
+    "다음은 사용자와 AI 비서의 이전 대화입니다. 이후 대화에서 참고할 수 있도록 "
+    "사용자에 대한 정보, 요청 사항, 결정된 내용 위주로 간결하게 요약하세요. "
+    "기존 요약이 있으면 새 대화 내용을 반영해 하나의 요약으로 다시 작성하세요."
+)
+
+# 이벤트 루프 -> 클라이언트 (httpx 연결 풀은 생성된 루프에서만 사용 가능)
+_async_clients: Dict[asyncio.AbstractEventLoop, AsyncOpenAI] = {}
+_client: Optional[OpenAI] = None
+_chat_client: Optional["ResilientChatClient"] = None
+_client_lock = threading.Lock()
+
+# 헤지 요청은 요청 스레드가 기다리는 동안 별도 스레드에서 실행
+_hedge_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="openai-hedge")
+
+
+def is_retryable(error: Exception) -> bool:
+    """다시 시도하면 성공할 수 있는 오류인지 확인"""
+    if isinstance(error, openai.APIConnectionError):  # 시간 초과 포함
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code == 429 or error.status_code >= 500
+    return False
+
+
+class ResilientChatClient:
+    """제한 시간, 재시도, 헤지 요청, 차단기를 적용한 채팅 API 클라이언트"""
+
+    def __init__(
+        self,
+        client: OpenAI,
+        async_client_factory: Callable[[], AsyncOpenAI] = None,
+        model: str = None,
+        fallback_model: Optional[str] = None,
+        timeout: float = None,
+        deadline: float = None,
+        max_retries: int = None,
+        hedge: bool = None,
+    ):
+        self.client = client
+        self.async_client_factory = async_client_factory
+        self.model = model or Config.OPENAI_MODEL
+        self.fallback_model = (
+            fallback_model
+            if fallback_model is not None
+            else Config.OPENAI_FALLBACK_MODEL
+        )
+        self.timeout = timeout or Config.OPENAI_TIMEOUT_SECONDS
+        self.deadline = deadline or Config.OPENAI_DEADLINE_SECONDS
+        self.max_retries = (
+            max_retries if max_retries is not None else Config.OPENAI_MAX_RETRIES
+        )
+        self.hedge = hedge if hedge is not None else Config.OPENAI_HEDGE_ENABLED
+        self.latencies = LatencyTracker()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._breakers_lock = threading.Lock()
+
+    def breaker(self, model: str) -> CircuitBreaker:
+        with self._breakers_lock:
+            if model not in self._breakers:
+                self._breakers[model] = CircuitBreaker(
+                    Config.CIRCUIT_FAILURE_THRESHOLD, Config.CIRCUIT_RESET_SECONDS
+                )
+            return self._breakers[model]
+
+    def _select_model(self, model: Optional[str]) -> str:
+        """차단기가 허용하는 모델 선택 (기본 모델이 막혀 있으면 대체 모델)"""
+        model = model or self.model
+        if self.breaker(model).allow():
+            return model
+        if self.fallback_model and self.fallback_model != model:
+            if self.breaker(self.fallback_model).allow():
+                logger.warning("차단기 열림: 대체 모델 %s 사용", self.fallback_model)
+                return self.fallback_model
+        raise CircuitOpenError(
+            "AI 서버 응답이 불안정하여 잠시 요청을 중단했습니다. 잠시 후 다시 시도해 주세요."
+        )
+
+    def _hedge_delay(self) -> Optional[float]:
+        if not self.hedge:
+            return None
+        return self.latencies.percentile(
+            Config.OPENAI_HEDGE_PERCENTILE, Config.OPENAI_HEDGE_MIN_SAMPLES
+        )
+
+    def _on_failure(self, model: str, error: Exception, attempt: int, deadline: float):
+        """실패 기록 후 재시도 대기 (재시도하지 않으면 예외 발생)"""
+        record_upstream_error("openai", error)
+        breaker = self.breaker(model)
+        if isinstance(error, DeadlineExceededError):
+            breaker.record_failure()  # 제한 시간 안에 응답을 받지 못함
+            raise error
+        if not is_retryable(error):
+            # 요청 자체의 문제이므로 서버 상태는 알 수 없음 (성공으로 기록하지 않음)
+            breaker.release()
+            raise error
+        breaker.record_failure()
+        remaining = deadline - time.monotonic()
+        if attempt >= self.max_retries or breaker.state == "open" or remaining <= 0:
+            raise error
+        delay = min(
+            retry_delay(
+                attempt,
+                Config.OPENAI_RETRY_BASE_DELAY_SECONDS,
+                Config.OPENAI_RETRY_MAX_DELAY_SECONDS,
+            ),
+            remaining,
+        )
+        logger.warning(
+            "OpenAI 호출 실패, %.2f초 후 재시도: %s", delay, type(error).__name__
+        )
+        return delay
+
+    def _attempt_timeout(self, deadline: float) -> float:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise DeadlineExceededError("AI 응답 대기 시간이 초과되었습니다.")
+        return min(self.timeout, remaining)
+
+    # 동기 호출
+
+    def _create(self, model: str, timeout: float, **kwargs):
+        return self.client.with_options(
+            timeout=timeout, max_retries=0
+        ).chat.completions.create(model=model, **kwargs)
+
+    def _create_hedged(self, model: str, timeout: float, **kwargs):
+        """p95 응답 시간이 지나도 응답이 없으면 같은 요청을 하나 더 보내 먼저 온 응답 사용"""
+        delay = self._hedge_delay()
+        if delay is None:
+            return self._create(model, timeout, **kwargs)
+
+        first = _hedge_executor.submit(self._create, model, timeout, **kwargs)
+        done, _ = wait([first], timeout=min(delay, timeout))
+        if done:
+            return first.result()
+
+        logger.info("응답 지연(%.2f초 초과): 헤지 요청 전송", delay)
+        pending = {
+            first,
+            _hedge_executor.submit(self._create, model, timeout, **kwargs),
+        }
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def complete(
+        self, messages: List[Dict[str, Any]], model: str = None, **kwargs
+    ) -> str:
+        """응답 전체를 받아 반환"""
+        deadline = time.monotonic() + self.deadline
+        model = self._select_model(model)
+        attempt = 0
+        with timed("llm"):
+            while True:
+                started = time.monotonic()
+                try:
+                    response = self._create_hedged(
+                        model,
+                        self._attempt_timeout(deadline),
+                        messages=messages,
+                        **kwargs,
+                    )
+                except Exception as e:
+                    time.sleep(self._on_failure(model, e, attempt, deadline))
+                    attempt += 1
+                    continue
+                self.latencies.record(time.monotonic() - started)
+                self.breaker(model).record_success()
+                return response.choices[0].message.content
+
+    def stream(
+        self, messages: List[Dict[str, Any]], model: str = None, **kwargs
+    ) -> Iterator[str]:
+        """응답 토큰을 생성되는 대로 반환 (첫 응답을 받기 전까지만 재시도)"""
+        started = time.perf_counter()
+        deadline = time.monotonic() + self.deadline
+        model = self._select_model(model)
+        attempt = 0
+        while True:
+            try:
+                stream = self._create(
+                    model,
+                    self._attempt_timeout(deadline),
+                    messages=messages,
+                    stream=True,
+                    **kwargs,
+                )
+                break
+            except Exception as e:
+                time.sleep(self._on_failure(model, e, attempt, deadline))
+                attempt += 1
+        self.breaker(model).record_success()
+
+        first_token = True
+        try:
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                token = chunk.choices[0].delta.content
+                if token:
+                    if first_token:
+                        record_stage("llm_first_token", time.perf_counter() - started)
+                        first_token = False
+                    yield token
+        except Exception as e:
+            if is_retryable(e):
+                self.breaker(model).record_failure()
+                record_upstream_error("openai", e)
+            record_stage("llm_stream", time.perf_counter() - started, failed=True)
+            raise
+        record_stage("llm_stream", time.perf_counter() - started)
+
+    # 비동기 호출
+
+    async def _acreate(self, model: str, timeout: float, **kwargs):
+        client = self.async_client_factory().with_options(
+            timeout=timeout, max_retries=0
+        )
+        return await client.chat.completions.create(model=model, **kwargs)
+
+    async def _acreate_hedged(self, model: str, timeout: float, **kwargs):
+        delay = self._hedge_delay()
+        if delay is None:
+            return await self._acreate(model, timeout, **kwargs)
+
+        first = asyncio.ensure_future(self._acreate(model, timeout, **kwargs))
+        done, _ = await asyncio.wait({first}, timeout=min(delay, timeout))
+        if done:
+            return first.result()
+
+        logger.info("응답 지연(%.2f초 초과): 헤지 요청 전송", delay)
+        pending = {
+            first,
+            asyncio.ensure_future(self._acreate(model, timeout, **kwargs)),
+        }
+        error = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def acomplete(
+        self, messages: List[Dict[str, Any]], model: str = None, **kwargs
+    ) -> str:
+        """응답 전체를 받아 반환 (비동기)"""
+        deadline = time.monotonic() + self.deadline
+        model = self._select_model(model)
+        attempt = 0
+        with timed("llm"):
+            while True:
+                started = time.monotonic()
+                try:
+                    response = await self._acreate_hedged(
+                        model,
+                        self._attempt_timeout(deadline),
+                        messages=messages,
+                        **kwargs,
+                    )
+                except Exception as e:
+                    await asyncio.sleep(self._on_failure(model, e, attempt, deadline))
+                    attempt += 1
+                    continue
+                self.latencies.record(time.monotonic() - started)
+                self.breaker(model).record_success()
+                return response.choices[0].message.content
+
+    async def astream(
+        self, messages: List[Dict[str, Any]], model: str = None, **kwargs
+    ) -> AsyncIterator[str]:
+        """응답 토큰을 생성되는 대로 반환 (비동기, 첫 응답을 받기 전까지만 재시도)"""
+        started = time.perf_counter()
+        deadline = time.monotonic() + self.deadline
+        model = self._select_model(model)
+        attempt = 0
+        while True:
+            try:
+                stream = await self._acreate(
+                    model,
+                    self._attempt_timeout(deadline),
+                    messages=messages,
+                    stream=True,
+                    **kwargs,
+                )
+                break
+            except Exception as e:
+                await asyncio.sleep(self._on_failure(model, e, attempt, deadline))
+                attempt += 1
+        self.breaker(model).record_success()
+
+        first_token = True
+        try:
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                token = chunk.choices[0].delta.content
+                if token:
+                    if first_token:
+                        record_stage("llm_first_token", time.perf_counter() - started)
+                        first_token = False
+                    yield token
+        except Exception as e:
+            if is_retryable(e):
+                self.breaker(model).record_failure()
+                record_upstream_error("openai", e)
+            record_stage("llm_stream", time.perf_counter() - started, failed=True)
+            raise
+        record_stage("llm_stream", time.perf_counter() - started)
+
+
+def get_client() -> OpenAI:
+    """공유 동기 OpenAI 클라이언트 반환 (재시도는 ResilientChatClient가 담당)"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = OpenAI(
+                api_key=Config.OPENAI_API_KEY,
+                base_url=Config.OPENAI_BASE_URL,
+                max_retries=0,
+            )
+        return _client
+
+
+def get_async_client() -> AsyncOpenAI:
+    """현재 이벤트 루프에서 공유하는 AsyncOpenAI 클라이언트 반환"""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=Config.OPENAI_MAX_CONNECTIONS,
+                max_keepalive_connections=Config.OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+            )
+        )
+        client = AsyncOpenAI(
+            api_key=Config.OPENAI_API_KEY,
+            base_url=Config.OPENAI_BASE_URL,
+            max_retries=0,
+            http_client=http_client,
+        )
+        _async_clients[loop] = client
+    return client
+
+
+def get_chat_client() -> ResilientChatClient:
+    """공유 채팅 API 클라이언트 반환"""
+    global _chat_client
+    client = get_client()
+    with _client_lock:
+        if _chat_client is None:
+            _chat_client = ResilientChatClient(client, get_async_client)
+        return _chat_client
+
+
+def complete_chat(messages: List[Dict[str, Any]]) -> str:
+    """대화 메시지로 응답 전체를 받아 반환"""
+    return get_chat_client().complete(messages)
+
+
+def stream_chat(messages: List[Dict[str, Any]]) -> Iterator[str]:
+    """대화 메시지로 응답 토큰을 생성되는 대로 반환"""
+    return get_chat_client().stream(messages)
+
+
+async def complete_chat_async(messages: List[Dict[str, Any]]) -> str:
+    """대화 메시지로 응답 전체를 받아 반환 (비동기)"""
+    return await get_chat_client().acomplete(messages)
+
+
+async def stream_chat_async(messages: List[Dict[str, Any]]) -> AsyncIterator[str]:
+    """대화 메시지로 응답 토큰을 생성되는 대로 반환 (비동기)"""
+    async for token in get_chat_client().astream(messages):
+        yield token
+
+
+def summarize_conversation(
+    previous_summary: Optional[str], messages: List[Dict[str, Any]]
+) -> str:
+    """기존 요약과 새 메시지를 합쳐 갱신된 요약 반환"""
+    transcript = "\n".join(
+        f"{'사용자' if m['role'] == 'user' else 'AI'}: {m['content']}" for m in messages
+    )
+    if previous_summary:
+        transcript = f"[기존 요약]\n{previous_summary}\n\n[새 대화]\n{transcript}"
+
+    summary = get_chat_client().complete(
+        [
+            {"role": "system", "content": SUMMARY_INSTRUCTION},
+            {"role": "user", "content": transcript},
+        ],
+        model=Config.SUMMARY_MODEL,
+        max_tokens=Config.SUMMARY_MAX_TOKENS,
+    )
+    return summary.strip()
+
+
+async def close_async_clients() -> None:
+    """현재 루프의 클라이언트 연결 정리 (서버 종료 시)"""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.close()
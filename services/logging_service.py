@@ -0,0 +1,163 @@
+"""
+로그 설정 서비스
+
+요청을 처리하는 스레드는 로그 레코드를 큐에 넣기만 하고, 파일/콘솔 기록은 별도
+스레드(QueueListener)가 담당한다. 큐가 가득 차면 기다리지 않고 버린다.
+
+- 파일: Config.LOG_FILE 에 JSON 한 줄씩 기록 (크기 기준 교체)
+- 요청 ID: 요청마다 부여한 ID를 같은 요청에서 남긴 모든 로그에 포함
+- 프롬프트, AI 응답 같은 긴 내용은 DEBUG 수준에서 일부 요청만 표본으로 기록 (log_payload)
+  기록할지는 요청 ID를 정할 때 한 번 정하므로 표본 요청은 내용이 모두 기록된다.
+"""
+
+from typing import Optional
+from contextvars import ContextVar
+import os
+import copy
+import json
+import queue
+import random
+import atexit
+import logging
+import logging.handlers
+from config import Config
+
+_request_id: ContextVar[str] = ContextVar("request_id", default="-")
+# 현재 요청의 긴 내용을 기록할지 (요청 밖에서는 None: 기록할 때마다 정함)
+_payload_sampled: ContextVar[Optional[bool]] = ContextVar(
+    "payload_sampled", default=None
+)
+_listener: Optional[logging.handlers.QueueListener] = None
+_dropped = 0
+
+CONSOLE_FORMAT = "%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s"
+# 요청마다 기록하면 너무 많은 외부 라이브러리 로그
+QUIET_LOGGERS = ("httpx", "httpcore", "openai", "urllib3")
+
+
+def get_request_id() -> str:
+    return _request_id.get()
+
+
+def bind_request_id(request_id: str):
+    """현재 요청(컨텍스트)의 요청 ID 설정, 되돌릴 때 쓸 토큰 반환"""
+    sampled = random.random() < Config.LOG_PAYLOAD_SAMPLE_RATE
+    return _request_id.set(request_id), _payload_sampled.set(sampled)
+
+
+def reset_request_id(token) -> None:
+    request_token, sampled_token = token
+    _payload_sampled.reset(sampled_token)
+    _request_id.reset(request_token)
+
+
+class RequestIdFilter(logging.Filter):
+    """로그를 남긴 스레드의 요청 ID를 레코드에 추가"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "request_id"):
+            record.request_id = _request_id.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """로그 레코드를 JSON 한 줄로 변환"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S")
+            + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "message": record.getMessage(),
+        }
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """큐에 넣기만 하는 핸들러 (큐가 가득 차면 레코드를 버림)"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 메시지와 예외 내용은 로그를 남긴 스레드에서 문자열로 만들어 둠
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        global _dropped
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _dropped += 1
+
+
+def dropped_log_count() -> int:
+    """큐가 가득 차서 버린 로그 수"""
+    return _dropped
+
+
+def setup_logging(level: str = None, log_file: str = None, console: bool = None):
+    """루트 로거를 큐 기반 핸들러로 설정 (여러 번 호출해도 한 번만 적용)"""
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    level = (level or Config.LOG_LEVEL).upper()
+    log_file = log_file or Config.LOG_FILE
+    console = Config.LOG_CONSOLE if console is None else console
+
+    handlers = []
+    if log_file:
+        os.makedirs(os.path.dirname(log_file) or ".", exist_ok=True)
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_file,
+            maxBytes=Config.LOG_MAX_BYTES,
+            backupCount=Config.LOG_BACKUP_COUNT,
+            encoding="utf-8",
+        )
+        file_handler.setFormatter(JsonFormatter())
+        handlers.append(file_handler)
+    if console:
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+        handlers.append(console_handler)
+
+    log_queue = queue.Queue(maxsize=Config.LOG_QUEUE_SIZE)
+    queue_handler = NonBlockingQueueHandler(log_queue)
+    queue_handler.addFilter(RequestIdFilter())
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(queue_handler)
+    for name in QUIET_LOGGERS:
+        logging.getLogger(name).setLevel(max(logging.WARNING, root.level))
+
+    _listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    _listener.start()
+    atexit.register(_listener.stop)
+    return _listener
+
+
+def log_payload(logger: logging.Logger, label: str, text: str) -> None:
+    """긴 내용(프롬프트, AI 응답 등)을 DEBUG 수준에서 일부 요청만 기록"""
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    sampled = _payload_sampled.get()
+    if sampled is None:
+        sampled = random.random() < Config.LOG_PAYLOAD_SAMPLE_RATE
+    if not sampled:
+        return
+    text = str(text)
+    if len(text) > Config.LOG_PAYLOAD_MAX_CHARS:
+        text = f"{text[:Config.LOG_PAYLOAD_MAX_CHARS]}... ({len(text)}자)"
+    logger.debug("%s: %s", label, text)
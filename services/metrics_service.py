@@ -0,0 +1,292 @@
+"""
+성능 측정(메트릭) 서비스
+
+처리 단계별 소요 시간 히스토그램, 외부 API 오류 횟수 등을 프로세스 메모리에 모아
+Prometheus 텍스트 형식으로 내보낸다 (/metrics).
+
+    with timed("llm"):
+        ...
+
+TRACE_REQUESTS가 켜져 있으면 요청마다 단계별 구간(span)을 모아 요청이 끝날 때
+한 줄의 JSON으로 로그에 남긴다.
+"""
+
+from typing import Dict, Any, List, Tuple, Optional, Callable, Iterable
+from contextlib import ContextDecorator
+from contextvars import ContextVar
+import json
+import math
+import logging
+import time
+import uuid
+import threading
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# 초 단위 히스토그램 구간 (Prometheus 기본값에 긴 LLM 응답 구간 추가)
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)  # fmt: skip
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Iterable[str], values: Iterable[Any]) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    """증가만 하는 값 (라벨별)"""
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        with self._lock:
+            return self._values.get(labels, 0.0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            lines.append(
+                f"{self.name}{_format_labels(self.label_names, labels)} "
+                f"{_format_value(value)}"
+            )
+        return lines
+
+
+class Histogram:
+    """구간별 누적 개수, 합계, 개수 (라벨별)"""
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        label_names: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = tuple(sorted(buckets))
+        # 라벨 -> [구간별 개수..., 합계, 개수]
+        self._values: Dict[LabelValues, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = [0.0] * (len(self.buckets) + 2)
+                self._values[labels] = entry
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[i] += 1
+                    break
+            entry[-2] += value
+            entry[-1] += 1
+
+    def count(self, *labels: str) -> int:
+        with self._lock:
+            entry = self._values.get(labels)
+            return int(entry[-1]) if entry else 0
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.help_text}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            items = sorted(
+                (labels, list(entry)) for labels, entry in self._values.items()
+            )
+        for labels, entry in items:
+            cumulative = 0.0
+            for bound, bucket_count in zip(self.buckets, entry):
+                cumulative += bucket_count
+                label_text = _format_labels(
+                    self.label_names + ("le",), labels + (_format_value(bound),)
+                )
+                lines.append(
+                    f"{self.name}_bucket{label_text} {_format_value(cumulative)}"
+                )
+            label_text = _format_labels(self.label_names + ("le",), labels + ("+Inf",))
+            lines.append(f"{self.name}_bucket{label_text} {_format_value(entry[-1])}")
+            label_text = _format_labels(self.label_names, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(entry[-2])}")
+            lines.append(f"{self.name}_count{label_text} {_format_value(entry[-1])}")
+        return lines
+
+
+# 메트릭 수집 시 호출되는 함수: [(이름, 종류, 설명, [(라벨 dict, 값)])] 반환
+Collector = Callable[[], List[Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]]]
+_collectors: List[Collector] = []
+
+STAGE_DURATION = Histogram(
+    "assistant_stage_duration_seconds",
+    "Duration of internal processing stages",
+    ("stage",),
+)
+STAGE_ERRORS = Counter(
+    "assistant_stage_errors_total",
+    "Processing stages that raised an exception",
+    ("stage",),
+)
+UPSTREAM_ERRORS = Counter(
+    "assistant_upstream_errors_total",
+    "Failed calls to external APIs",
+    ("service", "error"),
+)
+HTTP_DURATION = Histogram(
+    "assistant_http_request_duration_seconds",
+    "HTTP request duration including streamed bodies",
+    ("endpoint",),
+)
+HTTP_REQUESTS = Counter(
+    "assistant_http_requests_total",
+    "HTTP requests by endpoint and status code",
+    ("endpoint", "status"),
+)
+
+_METRICS = [STAGE_DURATION, STAGE_ERRORS, UPSTREAM_ERRORS, HTTP_DURATION, HTTP_REQUESTS]
+
+# 현재 요청의 추적 정보 (TRACE_REQUESTS가 꺼져 있으면 None)
+_current_trace: ContextVar[Optional[Dict[str, Any]]] = ContextVar(
+    "current_trace", default=None
+)
+
+
+class timed(ContextDecorator):
+    """블록(또는 함수) 실행 시간을 단계 히스토그램과 현재 요청 추적에 기록"""
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self._started = 0.0
+
+    def _recreate_cm(self):
+        # 데코레이터로 쓸 때 호출마다 새 객체 사용 (스레드 간 시작 시각 공유 방지)
+        return timed(self.stage)
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self._started
+        record_stage(self.stage, seconds, exc_type is not None)
+        return False
+
+
+def record_stage(stage: str, seconds: float, failed: bool = False) -> None:
+    """단계 소요 시간 기록 (오류로 끝났으면 오류 횟수도 증가)"""
+    STAGE_DURATION.observe(seconds, stage)
+    if failed:
+        STAGE_ERRORS.inc(stage)
+    trace = _current_trace.get()
+    if trace is not None:
+        with trace["lock"]:
+            trace["spans"].append(
+                {
+                    "stage": stage,
+                    "start_ms": round(
+                        (time.perf_counter() - seconds - trace["started"]) * 1000, 2
+                    ),
+                    "duration_ms": round(seconds * 1000, 2),
+                    "error": failed,
+                }
+            )
+
+
+def record_upstream_error(service: str, error: BaseException) -> None:
+    """외부 API(openai, naver_tts) 호출 실패 기록"""
+    UPSTREAM_ERRORS.inc(service, type(error).__name__)
+
+
+def record_request(endpoint: str, status: int, seconds: float) -> None:
+    """HTTP 요청 처리 시간 기록"""
+    HTTP_DURATION.observe(seconds, endpoint)
+    HTTP_REQUESTS.inc(endpoint, str(status))
+
+
+def begin_trace(name: str, trace_id: str = None) -> Optional[Dict[str, Any]]:
+    """요청 추적 시작 (TRACE_REQUESTS가 꺼져 있으면 None)"""
+    if not Config.TRACE_REQUESTS:
+        return None
+    trace = {
+        "trace_id": trace_id or uuid.uuid4().hex[:16],
+        "name": name,
+        "started": time.perf_counter(),
+        "spans": [],
+        "lock": threading.Lock(),
+    }
+    _current_trace.set(trace)
+    return trace
+
+
+def end_trace(trace: Optional[Dict[str, Any]], status: int = None) -> None:
+    """요청 추적을 끝내고 구간 목록을 한 줄로 기록"""
+    if trace is None:
+        return
+    if _current_trace.get() is trace:
+        _current_trace.set(None)
+    with trace["lock"]:
+        spans = list(trace["spans"])
+    record = {
+        "trace_id": trace["trace_id"],
+        "name": trace["name"],
+        "status": status,
+        "duration_ms": round((time.perf_counter() - trace["started"]) * 1000, 2),
+        "spans": spans,
+    }
+    logger.info("trace %s", json.dumps(record, ensure_ascii=False))
+
+
+def register_collector(collector: Collector) -> None:
+    """수집 시점에 값을 계산하는 메트릭 추가 (캐시 적중률 등)"""
+    _collectors.append(collector)
+
+
+def render_metrics() -> str:
+    """Prometheus 텍스트 형식(0.0.4)으로 모든 메트릭 반환"""
+    lines: List[str] = []
+    for metric in _METRICS:
+        lines.extend(metric.render())
+    for collector in _collectors:
+        try:
+            families = collector()
+        except Exception as e:
+            logger.warning("메트릭 수집 실패: %s", e)
+            continue
+        for name, kind, help_text, samples in families:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                lines.append(
+                    f"{name}{_format_labels(labels.keys(), labels.values())} "
+                    f"{_format_value(value)}"
+                )
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,548 @@
+"""
+알림 예약 서비스
+
+예약된 알림은 알림 시각 기준 힙(heap)에 보관하고, 전용 스레드가 가장 이른 알림
+시각까지 기다렸다가 깨어나 발송한다 (주기적으로 확인하지 않음).
+- 예약/취소: O(log n) (취소된 항목은 힙에서 꺼낼 때 건너뜀)
+- 발송: 사용자의 알림 스트림(SSE)을 구독 중인 모든 연결로 전달하고, 연결이 없으면
+  다음에 연결할 때 전달한다. 전달이 확인(ack)되면 완료로 기록한다.
+- 저장: 예약/발송/완료를 JSON Lines 로그에 한 줄씩 덧붙이고, 완료된 기록이 쌓이면
+  남은 알림만 새 파일에 다시 써서 교체(압축)한다. 재시작하면 로그를 재생해 복원한다.
+- 여러 워커 프로세스: 로그는 파일 잠금을 걸고 고치며, 각 프로세스는 로그를 따라 읽어
+  같은 상태를 유지한다. 로그에 기록한 프로세스는 다른 프로세스의 스케줄러 스레드를
+  FIFO로 깨우므로, 기록이 없으면 어느 프로세스도 로그를 다시 읽지 않는다.
+  발송은 소유 잠금을 얻은 프로세스 하나만 하고(중복 발송 방지), 다른 프로세스는
+  로그의 발송 기록을 보고 자기에게 연결된 구독자에게 전달한다. 다른 프로세스는 소유
+  잠금을 기다리고 있다가 소유 프로세스가 종료되면 잠금을 얻어 이어서 발송한다.
+"""
+
+from typing import IO, Dict, Any, Iterator, List, Optional, Set, Tuple
+from collections import OrderedDict
+from contextlib import contextmanager
+import os
+import json
+import errno
+import select
+import time
+import uuid
+import heapq
+import queue
+import logging
+import threading
+from config import Config
+from services.file_lock_service import file_lock, wait_lock
+
+logger = logging.getLogger(__name__)
+
+
+class _Waker:
+    """스케줄러 스레드를 깨우는 장치
+
+    스케줄러마다 wake_dir에 FIFO를 하나 만들고, 로그에 기록한 프로세스가 다른
+    FIFO에 1바이트씩 써서 깨운다. FIFO가 없는 환경(Windows)에서는 같은 프로세스
+    안에서만 깨운다 (그 환경에서는 프로세스 간 잠금도 없음).
+    """
+
+    def __init__(self, wake_dir: str):
+        self.wake_dir = wake_dir
+        self.path: Optional[str] = None
+        self._event = threading.Event()
+        self._read_fd = self._write_fd = -1
+
+    def open(self) -> None:
+        """이 스케줄러의 FIFO를 만듦 (발송 스레드를 시작할 때)"""
+        if not hasattr(os, "mkfifo"):
+            return
+        os.makedirs(self.wake_dir, exist_ok=True)
+        path = os.path.join(self.wake_dir, f"{os.getpid()}-{uuid.uuid4().hex[:8]}")
+        os.mkfifo(path, 0o600)
+        # 쓰기 쪽도 하나 열어 두어야 다른 프로세스가 닫은 뒤 EOF로 계속 깨지 않음
+        self._read_fd = os.open(path, os.O_RDONLY | os.O_NONBLOCK)
+        self._write_fd = os.open(path, os.O_WRONLY | os.O_NONBLOCK)
+        self.path = path
+
+    def close(self) -> None:
+        if self.path is None:
+            return
+        os.close(self._read_fd)
+        os.close(self._write_fd)
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+        self.path = None
+
+    def wait(self, timeout: Optional[float]) -> None:
+        """깨우기 신호나 timeout초 (None이면 신호만) 기다림"""
+        if self.path is None:
+            if self._event.wait(timeout):
+                self._event.clear()
+            return
+        select.select([self._read_fd], [], [], timeout)
+        try:
+            while os.read(self._read_fd, 4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def wake(self) -> None:
+        """이 프로세스의 스케줄러 스레드를 깨움"""
+        if self.path is None:
+            self._event.set()
+            return
+        _signal(self._write_fd)
+
+    def wake_others(self) -> None:
+        """다른 스케줄러(다른 프로세스)를 깨움"""
+        try:
+            names = os.listdir(self.wake_dir)
+        except FileNotFoundError:
+            return
+        for name in names:
+            path = os.path.join(self.wake_dir, name)
+            if path == self.path:
+                continue
+            try:
+                fd = os.open(path, os.O_WRONLY | os.O_NONBLOCK)
+            except OSError as e:
+                # 읽는 쪽이 없음: 종료된 프로세스가 남긴 FIFO면 정리
+                if e.errno == errno.ENXIO and not _process_alive(name):
+                    _unlink_quietly(path)
+                continue
+            try:
+                _signal(fd)
+            finally:
+                os.close(fd)
+
+
+def _signal(fd: int) -> None:
+    try:
+        os.write(fd, b"\0")
+    except BlockingIOError:
+        pass  # 이미 깨우기 신호가 쌓여 있음
+
+
+def _process_alive(fifo_name: str) -> bool:
+    try:
+        os.kill(int(fifo_name.split("-", 1)[0]), 0)
+    except ValueError:
+        return True  # 이 서비스가 만든 FIFO가 아님
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _unlink_quietly(path: str) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+class NotificationScheduler:
+    """알림 예약, 발송, 저장을 담당하는 스케줄러 (프로세스에 하나)"""
+
+    def __init__(self, log_path: str):
+        self.log_path = log_path
+        self.lock_path = f"{log_path}.lock"
+        # 이 잠금을 얻은 프로세스만 알림을 발송
+        self.owner_lock_path = f"{log_path}.owner.lock"
+        # 알림 ID -> 알림 (발송 전)
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        # 사용자 ID -> 발송 전 알림 ID
+        self._user_pending: Dict[str, Set[str]] = {}
+        # (알림 시각, 순번, 알림 ID)
+        self._heap: List[Tuple[float, int, str]] = []
+        self._sequence = 0
+        # 사용자 ID -> {알림 ID: 알림} (발송되었지만 전달 확인 전)
+        self._due: Dict[str, "OrderedDict[str, Dict[str, Any]]"] = {}
+        # 알림 ID -> 사용자 ID (전달 확인 전)
+        self._due_users: Dict[str, str] = {}
+        # 사용자 ID -> 구독 중인 연결의 큐 목록
+        self._subscribers: Dict[str, List[queue.Queue]] = {}
+        self._lock = threading.Lock()
+        self._waker = _Waker(f"{log_path}.wake")
+        self._appended = False  # 다른 프로세스를 깨워야 하는 기록을 추가함
+        # 로그를 어디까지 읽었는지 (다른 프로세스가 압축하면 inode가 바뀜)
+        self._log_lines = 0
+        self._offset = 0
+        self._inode: Optional[int] = None
+        self._torn = False  # 로그가 줄바꿈 없이 끝남 (기록 도중 중단된 줄)
+        self._owner: Optional[IO] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+        with self._locked():
+            logger.info(
+                "예약된 알림 %d개를 불러왔습니다.",
+                len(self._pending) + len(self._due_users),
+            )
+
+    # 저장
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """스레드/파일 잠금을 잡고 다른 프로세스의 기록까지 반영한 상태로 진입"""
+        with self._lock, file_lock(self.lock_path):
+            self._sync()
+            try:
+                yield
+            finally:
+                self._wake_others_if_appended()
+
+    def _wake_others_if_appended(self) -> None:
+        if self._appended:
+            self._appended = False
+            self._waker.wake_others()
+
+    def _sync(self) -> None:
+        """로그에서 아직 반영하지 않은 기록을 읽어 반영 (잠금 상태에서 호출)"""
+        try:
+            f = open(self.log_path, "rb")
+        except FileNotFoundError:
+            return
+        with f:
+            stat = os.fstat(f.fileno())
+            if stat.st_ino != self._inode or stat.st_size < self._offset:
+                self._reload(f.read(), stat.st_ino)
+                return
+            f.seek(self._offset)
+            data = f.read()
+        self._apply_lines(data, announce=True)
+
+    def _reload(self, data: bytes, inode: int) -> None:
+        """로그 전체를 다시 재생 (처음 불러올 때, 다른 프로세스가 압축한 뒤)"""
+        delivered = set(self._due_users)
+        self._pending, self._user_pending, self._heap = {}, {}, []
+        self._due, self._due_users = {}, {}
+        self._inode, self._offset, self._log_lines = inode, 0, 0
+        self._apply_lines(data, announce=False)
+        # 이 프로세스의 구독자가 아직 받지 못한 발송 기록만 전달
+        for notification_id, user_id in self._due_users.items():
+            if notification_id not in delivered:
+                self._announce(self._due[user_id][notification_id])
+
+    def _apply_lines(self, data: bytes, announce: bool) -> None:
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            if not line.strip():
+                continue
+            self._log_lines += 1
+            try:
+                record = json.loads(line)
+            except ValueError:
+                logger.warning("손상된 알림 로그 줄을 건너뜁니다: %d", self._log_lines)
+                continue
+            self._apply(record, announce)
+        self._offset += end
+        if end < len(data):
+            # 파일 잠금을 잡은 상태에서도 줄바꿈이 없으면 기록 도중 중단된 줄
+            self._log_lines += 1
+            logger.warning("손상된 알림 로그 줄을 건너뜁니다: %d", self._log_lines)
+            self._offset += len(data) - end
+            self._torn = True
+
+    def _apply(self, record: Dict[str, Any], announce: bool) -> None:
+        """로그 기록 하나를 상태에 반영 (잠금 상태에서 호출)"""
+        op = record.get("op")
+        if op == "schedule":
+            notification = record["notification"]
+            self._add_pending(notification)
+            self._sequence += 1
+            entry = (notification["due_at"], self._sequence, notification["id"])
+            heapq.heappush(self._heap, entry)
+            # 가장 이른 알림이 바뀌었으면 기다리는 시간을 다시 계산하도록 깨움
+            if self._heap[0] is entry:
+                self._waker.wake()
+        elif op == "fire":
+            notification = self._remove_pending(record["id"])
+            if notification is not None:
+                self._add_due(notification)
+                if announce:
+                    self._announce(notification)
+        elif op == "done":
+            if self._remove_pending(record["id"]) is None:
+                self._remove_due(record["id"])
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        """로그에 한 줄 추가 (잠금 상태에서 _sync 다음에 호출)"""
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        if self._torn:  # 잘린 줄과 이어 붙지 않도록
+            line = "\n" + line
+            self._torn = False
+        os.makedirs(os.path.dirname(self.log_path) or ".", exist_ok=True)
+        with open(self.log_path, "ab") as f:
+            f.write(line.encode("utf-8"))
+            self._offset = f.tell()
+            self._inode = os.fstat(f.fileno()).st_ino
+        self._log_lines += 1
+        self._appended = True
+
+    def _add_pending(self, notification: Dict[str, Any]) -> None:
+        self._pending[notification["id"]] = notification
+        self._user_pending.setdefault(notification["user_id"], set()).add(
+            notification["id"]
+        )
+
+    def _remove_pending(self, notification_id: str) -> Optional[Dict[str, Any]]:
+        notification = self._pending.pop(notification_id, None)
+        if notification is not None:
+            ids = self._user_pending[notification["user_id"]]
+            ids.discard(notification_id)
+            if not ids:
+                del self._user_pending[notification["user_id"]]
+        return notification
+
+    def _add_due(self, notification: Dict[str, Any]) -> None:
+        user_id = notification["user_id"]
+        self._due.setdefault(user_id, OrderedDict())[notification["id"]] = notification
+        self._due_users[notification["id"]] = user_id
+
+    def _remove_due(self, notification_id: str) -> Optional[Dict[str, Any]]:
+        user_id = self._due_users.pop(notification_id, None)
+        if user_id is None:
+            return None
+        due = self._due[user_id]
+        notification = due.pop(notification_id)
+        if not due:
+            del self._due[user_id]
+        return notification
+
+    def _live_count(self) -> int:
+        return len(self._pending) + len(self._due_users) * 2
+
+    def _compact_if_needed(self) -> None:
+        """완료 기록이 남은 알림보다 많아지면 로그를 다시 작성 (잠금 상태에서 호출)"""
+        live = self._live_count()
+        if self._log_lines <= max(Config.NOTIFICATION_COMPACT_MIN_LINES, live * 2):
+            return
+        records = []
+        for due in self._due.values():
+            for notification in due.values():
+                records.append({"op": "schedule", "notification": notification})
+                records.append({"op": "fire", "id": notification["id"]})
+        for notification in self._pending.values():
+            records.append({"op": "schedule", "notification": notification})
+
+        temp_path = f"{self.log_path}.tmp"
+        with open(temp_path, "wb") as f:
+            for record in records:
+                f.write((json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+            self._offset = f.tell()
+            self._inode = os.fstat(f.fileno()).st_ino
+        os.replace(temp_path, self.log_path)
+        self._log_lines = len(records)
+        self._torn = False
+
+        # 취소된 항목이 힙에 많이 남아 있으면 힙도 다시 구성
+        if len(self._heap) > len(self._pending) * 2:
+            self._heap = [e for e in self._heap if e[2] in self._pending]
+            heapq.heapify(self._heap)
+
+    # 예약/취소
+
+    def schedule(self, user_id: str, message: str, delay: float) -> Dict[str, Any]:
+        """delay초 뒤에 user_id에게 보낼 알림 예약, 예약된 알림 반환"""
+        if not message:
+            raise ValueError("알림 내용이 없습니다.")
+        if not 0 < delay <= Config.NOTIFICATION_MAX_DELAY_SECONDS:
+            raise ValueError("알림 시간이 허용 범위를 벗어났습니다.")
+
+        now = time.time()
+        notification = {
+            "id": uuid.uuid4().hex,
+            "user_id": user_id,
+            "message": message,
+            "due_at": now + delay,
+            "created_at": now,
+        }
+        with self._locked():
+            pending = len(self._user_pending.get(user_id, ()))
+            if pending >= Config.NOTIFICATION_MAX_PENDING_PER_USER:
+                raise ValueError("예약할 수 있는 알림 수를 초과했습니다.")
+            record = {"op": "schedule", "notification": notification}
+            self._append(record)
+            self._apply(record, announce=False)
+        return notification
+
+    def cancel(self, user_id: str, notification_id: str) -> bool:
+        """발송 전 알림 취소 (해당 사용자의 알림이 아니면 False)"""
+        with self._locked():
+            notification = self._pending.get(notification_id)
+            if notification is None or notification["user_id"] != user_id:
+                return False
+            self._remove_pending(notification_id)
+            self._append({"op": "done", "id": notification_id})
+            self._compact_if_needed()
+        return True
+
+    def list_pending(self, user_id: str) -> List[Dict[str, Any]]:
+        """사용자의 발송 전 알림 목록 (알림 시각 순)"""
+        with self._locked():
+            notifications = [
+                self._pending[i] for i in self._user_pending.get(user_id, ())
+            ]
+        return sorted(notifications, key=lambda n: n["due_at"])
+
+    # 발송
+
+    def start(self) -> "NotificationScheduler":
+        """발송 스레드 시작 (발송 담당이 아니면 로그를 따라 읽어 구독자에게 전달)"""
+        with self._lock:
+            if self._thread is None:
+                self._waker.open()
+                self._thread = threading.Thread(
+                    target=self._run, name="notification-scheduler", daemon=True
+                )
+                self._thread.start()
+                threading.Thread(
+                    target=self._wait_for_ownership,
+                    name="notification-owner",
+                    daemon=True,
+                ).start()
+        return self
+
+    def stop(self) -> None:
+        with self._lock:
+            self._stopped = True
+            self._waker.wake()
+        if self._thread is not None:
+            self._thread.join()
+        with self._lock:
+            if self._owner is not None:
+                self._owner.close()  # 기다리던 다른 프로세스가 발송을 이어받음
+                self._owner = None
+            self._waker.close()
+
+    def is_owner(self) -> bool:
+        """이 프로세스가 알림 발송을 담당하는지 여부"""
+        with self._lock:
+            return self._owner is not None
+
+    def _wait_for_ownership(self) -> None:
+        """발송 담당 잠금을 얻을 때까지 기다림 (담당 프로세스가 종료되면 이어받음)"""
+        owner = wait_lock(self.owner_lock_path)
+        with self._lock:
+            if self._stopped:
+                owner.close()  # 멈춘 스케줄러는 다음에 기다리는 프로세스에 넘김
+                return
+            self._owner = owner
+            self._waker.wake()
+        logger.info("이 프로세스가 알림 발송을 담당합니다.")
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                if self._stopped:
+                    return
+                # 발송 담당이 아니고 구독자도 없으면 로그를 읽을 필요가 없음
+                # (예약/취소/구독할 때 _locked에서 따라 읽음)
+                if self._owner is not None or self._subscribers:
+                    with file_lock(self.lock_path):
+                        self._sync()
+                        if self._owner is not None:
+                            self._fire_due()
+                            self._compact_if_needed()
+                        self._wake_others_if_appended()
+                # 발송 담당은 가장 이른 알림 시각까지, 아니면 깨울 때까지 기다림
+                timeout = None
+                if self._owner is not None and self._heap:
+                    timeout = max(self._heap[0][0] - time.time(), 0)
+            self._waker.wait(timeout)
+
+    def _fire_due(self) -> None:
+        """알림 시각이 지난 알림을 발송 기록 후 전달 (발송 담당, 잠금 상태에서 호출)"""
+        now = time.time()
+        while self._heap and self._heap[0][0] <= now:
+            _, _, notification_id = heapq.heappop(self._heap)
+            notification = self._remove_pending(notification_id)
+            if notification is None:  # 취소된 항목은 건너뜀
+                continue
+            self._append({"op": "fire", "id": notification_id})
+            self._add_due(notification)
+            self._announce(notification)
+            # 오래 접속하지 않는 사용자의 알림은 최근 것만 보관
+            due = self._due[notification["user_id"]]
+            while len(due) > Config.NOTIFICATION_MAX_UNDELIVERED_PER_USER:
+                dropped_id = next(iter(due))
+                self._remove_due(dropped_id)
+                self._append({"op": "done", "id": dropped_id})
+
+    def _announce(self, notification: Dict[str, Any]) -> None:
+        """이 프로세스에서 구독 중인 연결로 알림 전달 (잠금 상태에서 호출)"""
+        for subscriber in self._subscribers.get(notification["user_id"], []):
+            _offer(subscriber, notification)
+
+    # 구독
+
+    def subscribe(self, user_id: str, subscriber: queue.Queue = None) -> queue.Queue:
+        """사용자의 알림을 받을 큐 등록 (전달 확인 전 알림이 먼저 들어 있음)
+
+        subscriber를 주면 새 큐 대신 사용한다 (put_nowait만 있으면 됨).
+        """
+        if subscriber is None:
+            subscriber = queue.Queue(maxsize=Config.NOTIFICATION_SUBSCRIBER_QUEUE_SIZE)
+        with self._locked():
+            for notification in self._due.get(user_id, {}).values():
+                _offer(subscriber, notification)
+            self._subscribers.setdefault(user_id, []).append(subscriber)
+        return subscriber
+
+    def unsubscribe(self, user_id: str, subscriber: queue.Queue) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(user_id, [])
+            if subscriber in subscribers:
+                subscribers.remove(subscriber)
+            if not subscribers:
+                self._subscribers.pop(user_id, None)
+
+    def acknowledge(self, user_id: str, notification_id: str) -> None:
+        """알림이 전달되었음을 기록 (이후 다시 전달하지 않음)"""
+        with self._locked():
+            if self._due_users.get(notification_id) != user_id:
+                return  # 다른 연결이나 프로세스에서 이미 확인됨
+            self._remove_due(notification_id)
+            self._append({"op": "done", "id": notification_id})
+            self._compact_if_needed()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "pending": len(self._pending),
+                "undelivered": len(self._due_users),
+                "subscribers": sum(len(s) for s in self._subscribers.values()),
+                "owner": int(self._owner is not None),
+            }
+
+
+def _offer(subscriber: queue.Queue, notification: Dict[str, Any]) -> None:
+    """구독 큐에 알림 추가 (느린 연결 때문에 발송 스레드가 멈추지 않도록 가득 차면 버림)"""
+    try:
+        subscriber.put_nowait(notification)
+    except queue.Full:
+        pass  # 전달 확인 전이므로 다시 연결하면 받음
+
+
+def public_notification(notification: Dict[str, Any]) -> Dict[str, Any]:
+    """클라이언트에 보내는 알림 정보"""
+    return {
+        "id": notification["id"],
+        "message": notification["message"],
+        "notification_time": notification["due_at"],
+    }
+
+
+_scheduler: Optional[NotificationScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> NotificationScheduler:
+    """공유 알림 스케줄러 반환 (처음 호출 시 로그를 불러오고 발송 스레드 시작)"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = NotificationScheduler(Config.NOTIFICATIONS_LOG_PATH).start()
+        return _scheduler
@@ -1,90 +1,294 @@
 """
 PDF 내보내기 서비스
+
+대화 기록을 파일로 저장하지 않고 HTTP 응답으로 바로 보낼 수 있는 바이트 조각으로 생성한다.
+- 한글 폰트는 프로세스에서 한 번만 등록 (NanumGothic이 없으면 ReportLab 내장 한글 CID 폰트)
+- 줄 바꿈은 실제 글자 폭(stringWidth)으로 계산하며, 영어는 단어 단위, 한글 등 공백이 없는
+  긴 구간은 글자 단위로 나눈다. 글자 폭은 캐시하므로 전체 처리 시간은 글자 수에 비례한다.
+- 같은 대화 내용과 형식의 내보내기 결과는 메모리에 보관해 다시 만들지 않는다.
+  TXT는 내보내기 시간 줄을 뺀 본문만 보관하고 요청마다 현재 시간을 붙이며,
+  PDF는 시간이 페이지 안에 그려지므로 처음 만든 시간이 그대로 표시된다.
 """
 
-from typing import List, Dict, Any
-import os
+from typing import List, Dict, Any, Callable, Iterator, Optional
+from collections import OrderedDict
+from functools import lru_cache
 from datetime import datetime
+import io
+import os
+import json
+import hashlib
+import threading
+import logging
 from reportlab.pdfgen import canvas
 from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.cidfonts import UnicodeCIDFont
 from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import cm
 from config import Config
+from services.metrics_service import timed
+
+logger = logging.getLogger(__name__)
+
+FONT_NAME = "NanumGothic"
+FALLBACK_FONT_NAME = "HYSMyeongJo-Medium"  # ReportLab 내장 한글 폰트 (파일 불필요)
+
+TITLE = "=== AI 개인비서 대화 내용 ==="
+TITLE_FONT_SIZE = 16
+BODY_FONT_SIZE = 12
+MARGIN = 2 * cm
+LINE_HEIGHT = 0.7 * cm
+MESSAGE_GAP = 0.8 * cm
+CHUNK_SIZE = 64 * 1024  # 응답으로 보내는 조각 크기
+
+_font_name = None
+_font_lock = threading.Lock()
+
+
+def get_font_name() -> str:
+    """한글 폰트를 한 번만 등록하고 폰트 이름 반환"""
+    global _font_name
+    with _font_lock:
+        if _font_name is None:
+            font_path = os.path.join(Config.FONTS_DIR, "NanumGothic.ttf")
+            if os.path.exists(font_path):
+                pdfmetrics.registerFont(TTFont(FONT_NAME, font_path))
+                _font_name = FONT_NAME
+            else:
+                logger.warning(
+                    "한글 폰트를 찾을 수 없습니다. 내장 한글 폰트를 사용합니다."
+                )
+                pdfmetrics.registerFont(UnicodeCIDFont(FALLBACK_FONT_NAME))
+                _font_name = FALLBACK_FONT_NAME
+        return _font_name
+
+
+@lru_cache(maxsize=16384)
+def _char_width(char: str, font_name: str, font_size: float) -> float:
+    return pdfmetrics.stringWidth(char, font_name, font_size)
+
 
+def wrap_text(
+    text: str, font_name: str, font_size: float, max_width: float
+) -> Iterator[str]:
+    """글자 폭 기준으로 max_width를 넘지 않는 줄들을 차례로 반환
 
-def export_conversation_to_pdf(history: List[Dict[str, Any]]) -> str:
-    """대화 기록을 PDF로 저장하고 파일 경로 반환"""
-    os.makedirs(Config.EXPORTS_DIR, exist_ok=True)
+    공백이 있으면 마지막 공백에서 줄을 나누고(단어 단위), 없으면 글자 단위로 나눈다.
+    빈 줄(문단 구분)은 빈 문자열로 유지한다.
+    """
+    for paragraph in text.replace("\r", "").replace("\t", "    ").split("\n"):
+        start = 0
+        width = 0.0
+        last_space = -1
+        i = 0
+        while i < len(paragraph):
+            char = paragraph[i]
+            char_width = _char_width(char, font_name, font_size)
+            if width + char_width > max_width and i > start:
+                if last_space > start:
+                    yield paragraph[start:last_space]
+                    start = last_space + 1
+                else:
+                    yield paragraph[start:i]
+                    start = i
+                # 줄 앞 공백 제거
+                while start < len(paragraph) and paragraph[start] == " ":
+                    start += 1
+                i = max(i, start)
+                width = sum(
+                    _char_width(c, font_name, font_size) for c in paragraph[start:i]
+                )
+                last_space = -1
+                continue
+            if char == " ":
+                last_space = i
+            width += char_width
+            i += 1
+        yield paragraph[start:]
+
+
+def export_filename(export_format: str) -> str:
+    """내보내기 파일 이름 (conversation_YYYYmmdd_HHMMSS.확장자)"""
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"conversation_{timestamp}.pdf"
-    filepath = os.path.join(Config.EXPORTS_DIR, filename)
-
-    # 한글 폰트 등록
-    font_path = os.path.join(Config.FONTS_DIR, "NanumGothic.ttf")
-    if os.path.exists(font_path):
-        pdfmetrics.registerFont(TTFont("NanumGothic", font_path))
-        font_name = "NanumGothic"
-    else:
-        print("한글 폰트를 찾을 수 없습니다. 기본 폰트를 사용합니다.")
-        font_name = "Helvetica"
-
-    c = canvas.Canvas(filepath, pagesize=A4)
-    c.setFont(font_name, 16)
-    c.drawString(2 * cm, 28 * cm, "=== AI 개인비서 대화 내용 ===")
-
-    c.setFont(font_name, 12)
+    return f"conversation_{timestamp}.{export_format}"
+
+
+def export_time() -> str:
+    """내보내기 결과에 표시하는 현재 시간"""
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _role_label(msg: Dict[str, Any]) -> str:
+    return "사용자" if msg["role"] == "user" else "AI 비서"
+
+
+def render_conversation_pdf(history: List[Dict[str, Any]], output) -> None:
+    """대화 기록 PDF를 output(쓰기 가능한 파일 객체)에 기록"""
+    font_name = get_font_name()
+    page_width, page_height = A4
+    text_width = page_width - 2 * MARGIN
+    top = page_height - MARGIN
+
+    # 페이지 내용은 압축해 보관하여 긴 대화도 메모리 사용을 줄임
+    c = canvas.Canvas(output, pagesize=A4, pageCompression=1)
+    c.setTitle("AI 개인비서 대화 내용")
+    c.setFont(font_name, TITLE_FONT_SIZE)
+    c.drawString(MARGIN, top, TITLE)
+    c.setFont(font_name, BODY_FONT_SIZE)
     c.drawString(
-        2 * cm,
-        27 * cm,
-        f"내보내기 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+        MARGIN,
+        top - 1.0 * cm,
+        f"내보내기 시간: {export_time()}",
     )
+    y = top - 2.5 * cm
 
-    y = 25 * cm
-    for msg in history:
-        if y < 5 * cm:  # 새 페이지가 필요한 경우
+    def next_line():
+        nonlocal y
+        if y < MARGIN:  # 새 페이지가 필요한 경우
             c.showPage()
-            c.setFont(font_name, 12)
-            y = 28 * cm
-
-        role = "사용자" if msg["role"] == "user" else "AI 비서"
-        c.drawString(2 * cm, y, f"[{role}]")
-        y -= 0.7 * cm
-
-        # 텍스트 줄 바꿈 처리 개선
-        words = msg["content"].split()
-        line = ""
-        for word in words:
-            test_line = line + word + " "
-            if len(test_line) * 12 < (A4[0] - 4 * cm):  # 페이지 너비 확인
-                line = test_line
-            else:
-                if line:  # 현재 줄에 내용이 있으면 출력
-                    c.drawString(2 * cm, y, line.strip())
-                    y -= 0.7 * cm
-                line = word + " "
+            c.setFont(font_name, BODY_FONT_SIZE)
+            y = top
+        line_y = y
+        y -= LINE_HEIGHT
+        return line_y
 
-        if line:  # 마지막 줄 출력
-            c.drawString(2 * cm, y, line.strip())
-        y -= 1.5 * cm
+    for msg in history:
+        c.drawString(MARGIN, next_line(), f"[{_role_label(msg)}]")
+        for line in wrap_text(msg["content"], font_name, BODY_FONT_SIZE, text_width):
+            line_y = next_line()
+            if line:
+                c.drawString(MARGIN, line_y, line)
+        y -= MESSAGE_GAP
 
     c.save()
-    return filepath
 
 
-def export_conversation_to_txt(history: List[Dict[str, Any]]) -> str:
-    """대화 기록을 TXT로 저장하고 파일 경로 반환"""
-    os.makedirs(Config.EXPORTS_DIR, exist_ok=True)
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"conversation_{timestamp}.txt"
-    filepath = os.path.join(Config.EXPORTS_DIR, filename)
+def generate_conversation_pdf(history: List[Dict[str, Any]]) -> Iterator[bytes]:
+    """대화 기록 PDF를 만들어 응답으로 보낼 바이트 조각들을 반환
+
+    PDF는 마지막에 객체 위치표(xref)를 써야 하므로 문서를 모두 만든 뒤 보낸다.
+    변환 오류는 이 함수를 호출할 때 바로 발생한다.
+    """
+    buffer = io.BytesIO()
+    render_conversation_pdf(history, buffer)
+    data = buffer.getbuffer()
+    return (bytes(data[i : i + CHUNK_SIZE]) for i in range(0, len(data), CHUNK_SIZE))
+
+
+def _txt_header(exported_at: str) -> bytes:
+    return f"{TITLE}\n\n내보내기 시간: {exported_at}\n\n".encode("utf-8")
+
+
+def _txt_messages(history: List[Dict[str, Any]]) -> Iterator[bytes]:
+    for msg in history:
+        yield f"[{_role_label(msg)}]\n{msg['content']}\n\n".encode("utf-8")
+
+
+def generate_conversation_txt(
+    history: List[Dict[str, Any]], exported_at: str = None
+) -> Iterator[bytes]:
+    """대화 기록 TXT를 메시지 단위 바이트 조각으로 생성"""
+    yield _txt_header(exported_at or export_time())
+    yield from _txt_messages(history)
+
+
+class ExportCache:
+    """내보내기 결과 LRU 캐시 (전체 크기 상한)"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._data: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._data.get(key)
+            if data is None:
+                self._stats["misses"] += 1
+                return None
+            self._data.move_to_end(key)
+            self._stats["hits"] += 1
+            return data
+
+    def set(self, key: str, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            self._data[key] = data
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                _, evicted = self._data.popitem(last=False)
+                self._size -= len(evicted)
+                self._stats["evictions"] += 1
+
+    def stats(self) -> Dict[str, int]:
+        """적중/실패/삭제 횟수와 현재 크기"""
+        with self._lock:
+            return {**self._stats, "entries": len(self._data), "bytes": self._size}
+
+
+def make_export_key(history: List[Dict[str, Any]], export_format: str) -> str:
+    """대화 내용과 형식으로 캐시 키 생성"""
+    payload = json.dumps(
+        [[m["role"], m["content"]] for m in history],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    digest = hashlib.sha256(f"{export_format}\x00{payload}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+_export_cache: Optional[ExportCache] = None
+_export_cache_lock = threading.Lock()
+
+
+def get_export_cache() -> Optional[ExportCache]:
+    """공유 내보내기 캐시 반환 (사용하지 않도록 설정되어 있으면 None)"""
+    global _export_cache
+    if not Config.EXPORT_CACHE_ENABLED:
+        return None
+    with _export_cache_lock:
+        if _export_cache is None:
+            _export_cache = ExportCache(Config.EXPORT_CACHE_MAX_BYTES)
+        return _export_cache
+
+
+def get_conversation_export(history: List[Dict[str, Any]], export_format: str) -> bytes:
+    """대화 기록을 txt 또는 pdf 형식의 바이트로 반환 (같은 내용이면 캐시 사용)"""
+    if export_format not in ("txt", "pdf"):
+        raise ValueError(f"지원하지 않는 내보내기 형식입니다: {export_format}")
+
+    if export_format == "pdf":
+        # PDF는 내보내기 시간이 압축된 페이지 안에 그려지므로 처음 만든 시간을 그대로 둠
+        # (대화 내용이 같으면 같은 파일)
+        return _cached_render(
+            make_export_key(history, "pdf"),
+            lambda: b"".join(generate_conversation_pdf(history)),
+        )
+    # 캐시에는 본문만 두고 내보내기 시간은 요청마다 붙임
+    body = _cached_render(
+        make_export_key(history, "txt"),
+        lambda: b"".join(_txt_messages(history)),
+    )
+    return _txt_header(export_time()) + body
 
-    with open(filepath, "w", encoding="utf-8") as f:
-        f.write("=== AI 개인비서 대화 내용 ===\n\n")
-        f.write(f"내보내기 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
 
-        for msg in history:
-            role = "사용자" if msg["role"] == "user" else "AI 비서"
-            f.write(f"[{role}]\n{msg['content']}\n\n")
+def _cached_render(key: str, render: Callable[[], bytes]) -> bytes:
+    """캐시에 있으면 재사용, 없으면 render 결과를 저장 후 반환"""
+    cache = get_export_cache()
+    if cache is not None:
+        data = cache.get(key)
+        if data is not None:
+            return data
 
-    return filepath
+    with timed("export_render"):
+        data = render()
+    if cache is not None:
+        cache.set(key, data)
+    return data
@@ -0,0 +1,100 @@
+"""
+외부 API 호출 안정성 도구
+
+- CircuitBreaker: 연속 실패가 기준을 넘으면 일정 시간 호출을 막고(빠른 실패),
+  그 뒤 한 번의 시험 호출이 성공하면 다시 허용한다.
+- LatencyTracker: 최근 응답 시간의 백분위수 (헤지 요청 시점 결정용)
+- retry_delay: 지터를 적용한 지수 백오프 대기 시간
+"""
+
+from typing import Optional
+from collections import deque
+import time
+import random
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """차단기가 열려 있어 호출하지 않음"""
+
+
+class DeadlineExceededError(Exception):
+    """재시도를 포함한 전체 제한 시간 초과"""
+
+
+class CircuitBreaker:
+    """연속 실패 횟수 기반 차단기 (closed -> open -> half_open -> closed)"""
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """지금 호출해도 되는지 확인 (열린 뒤 일정 시간이 지나면 시험 호출 하나만 허용)"""
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open":
+                if time.monotonic() - self._opened_at < self.reset_seconds:
+                    return False
+                self.state = "half_open"
+                self._probing = False
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = "closed"
+            self._failures = 0
+            self._probing = False
+
+    def release(self) -> None:
+        """성공/실패를 판단할 수 없는 결과 (상태와 실패 횟수는 그대로, 다음 시험 호출 허용)"""
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self.state == "half_open" or self._failures >= self.failure_threshold:
+                if self.state != "open":
+                    logger.warning("차단기 열림: 연속 실패 %d회", self._failures)
+                self.state = "open"
+                self._opened_at = time.monotonic()
+                self._probing = False
+
+
+class LatencyTracker:
+    """최근 응답 시간(초) 기록"""
+
+    def __init__(self, window: int = 200):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, percent: float, min_samples: int = 1) -> Optional[float]:
+        """백분위 응답 시간 (기록이 min_samples개 미만이면 None)"""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples or len(samples) < min_samples:
+            return None
+        index = min(len(samples) - 1, int(len(samples) * percent / 100))
+        return samples[index]
+
+
+def retry_delay(attempt: int, base: float, maximum: float) -> float:
+    """attempt번째 재시도 전 대기 시간 (지수 백오프 상한 안에서 무작위)"""
+    return random.uniform(0, min(maximum, base * (2**attempt)))
@@ -0,0 +1,197 @@
+"""
+AI 응답 캐시 서비스
+
+같은 모델에 완전히 같은 메시지 목록(페르소나/스타일 프롬프트, 대화 맥락, 질문)을
+보내는 경우 OpenAI API를 다시 호출하지 않고 저장된 응답을 반환한다.
+캐시 키는 메시지 목록과 모델 이름을 정규화한 JSON의 해시이다.
+
+프로세스 메모리의 LRU(유효 기간 포함)를 먼저 조회하고, 설정에 따라
+여러 워커 프로세스가 공유하는 SQLite 저장소를 두 번째 단계로 사용한다.
+"""
+
+from typing import Optional, Dict, Any, List
+from collections import OrderedDict
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+from config import Config
+
+
+def make_response_cache_key(messages: List[Dict[str, Any]], model: str) -> str:
+    """메시지 목록과 모델 이름으로 캐시 키 생성"""
+    payload = json.dumps(
+        {
+            "model": model,
+            "messages": [
+                {"role": m["role"], "content": m["content"]} for m in messages
+            ],
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class MemoryResponseCacheBackend:
+    """프로세스 메모리에 응답을 보관하는 LRU 캐시"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.time():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        with self._lock:
+            self._data[key] = (time.time() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SQLiteResponseCacheBackend:
+    """SQLite 테이블에 응답을 보관하는 캐시 (여러 워커 프로세스에서 공유 가능)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connection()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS response_cache "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL NOT NULL)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_response_cache_expires "
+            "ON response_cache (expires)"
+        )
+        conn.commit()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[str]:
+        row = (
+            self._connection()
+            .execute(
+                "SELECT value FROM response_cache WHERE key = ? AND expires >= ?",
+                (key, time.time()),
+            )
+            .fetchone()
+        )
+        return row[0] if row else None
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        conn = self._connection()
+        now = time.time()
+        conn.execute(
+            "INSERT OR REPLACE INTO response_cache (key, value, expires) "
+            "VALUES (?, ?, ?)",
+            (key, value, now + ttl),
+        )
+        conn.execute("DELETE FROM response_cache WHERE expires < ?", (now,))
+        conn.commit()
+
+
+class ResponseCache:
+    """메모리 캐시와 선택적인 공유 캐시를 차례로 조회하는 응답 캐시"""
+
+    def __init__(self, memory: MemoryResponseCacheBackend, shared=None, ttl=None):
+        self.memory = memory
+        self.shared = shared
+        self.ttl = ttl if ttl is not None else Config.RESPONSE_CACHE_TTL_SECONDS
+        self._stats = {"hits": 0, "shared_hits": 0, "misses": 0, "stores": 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self._stats[name] += 1
+
+    def get(self, messages: List[Dict[str, Any]], model: str) -> Optional[str]:
+        """캐시된 응답 반환 (없으면 None)"""
+        key = make_response_cache_key(messages, model)
+        value = self.memory.get(key)
+        if value is None and self.shared is not None:
+            value = self.shared.get(key)
+            if value is not None:
+                self._count("shared_hits")
+                self.memory.set(key, value, self.ttl)
+        if value is None:
+            self._count("misses")
+            return None
+        self._count("hits")
+        return value
+
+    def set(self, messages: List[Dict[str, Any]], model: str, response: str) -> None:
+        """응답 저장"""
+        if not response:
+            return
+        key = make_response_cache_key(messages, model)
+        self.memory.set(key, response, self.ttl)
+        if self.shared is not None:
+            self.shared.set(key, response, self.ttl)
+        self._count("stores")
+
+    def stats(self) -> Dict[str, Any]:
+        """적중/실패 횟수와 적중률"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        stats["entries"] = len(self.memory)
+        return stats
+
+
+def create_response_cache(tier: str = None) -> ResponseCache:
+    """설정된 저장 단계에 맞는 응답 캐시 생성 (memory / sqlite)"""
+    if tier is None:
+        tier = Config.RESPONSE_CACHE_TIER
+
+    memory = MemoryResponseCacheBackend(Config.RESPONSE_CACHE_MAX_ENTRIES)
+    if tier == "memory":
+        return ResponseCache(memory)
+    if tier == "sqlite":
+        return ResponseCache(
+            memory, SQLiteResponseCacheBackend(Config.RESPONSE_CACHE_SQLITE_PATH)
+        )
+    raise ValueError(f"지원하지 않는 응답 캐시 종류입니다: {tier}")
+
+
+_response_cache: Optional[ResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """공유 응답 캐시 반환 (캐시를 사용하지 않도록 설정되어 있으면 None)"""
+    global _response_cache
+    if not Config.RESPONSE_CACHE_ENABLED:
+        return None
+    with _response_cache_lock:
+        if _response_cache is None:
+            _response_cache = create_response_cache()
+        return _response_cache
@@ -0,0 +1,295 @@
+"""
+대화 검색 색인 서비스
+
+현재 대화와 저장된 세션의 메시지를 역색인(단어 -> 메시지)으로 관리한다.
+한글은 띄어쓰기와 조사 때문에 단어 단위로 찾기 어려우므로 글자 단위
+1-gram/2-gram으로, 그 밖의 문자는 단어 단위로 색인한다. 검색어는 정규식이
+아닌 일반 문자열로 취급하며, 색인으로 후보를 좁힌 뒤 실제 포함 여부를 확인한다.
+현재 대화는 메시지가 추가될 때 새 메시지만 색인하고, 색인이 없거나 대화와
+맞지 않을 때만 전체를 다시 색인한다.
+"""
+
+from typing import List, Dict, Any, Optional, Tuple
+from collections import Counter, OrderedDict
+import re
+import math
+import threading
+from config import Config
+
+WORD_PATTERN = re.compile(r"[0-9a-z]+|[가-힣]+|[^\s0-9a-z가-힣]", re.IGNORECASE)
+HANGUL_PATTERN = re.compile(r"[가-힣]+")
+
+_lock = threading.RLock()
+# 단어 -> {문서 ID: 단어 빈도}
+_postings: Dict[str, Dict[int, int]] = {}
+# 문서 ID -> (출처 키, 출처 내 위치, 단어 목록)
+# 위치는 출처에 처음 색인된 메시지부터 센 값 (앞에서 제거된 수는 출처의 "start")
+_documents: Dict[int, Tuple[str, int, List[str]]] = {}
+# 출처 키 -> {"type", "name", "filename", "messages", "doc_ids", "start"}
+_sources: Dict[str, Dict[str, Any]] = {}
+# 색인된 현재 대화의 사용자 키 (오래 사용되지 않은 순서)
+_conversation_keys: "OrderedDict[str, None]" = OrderedDict()
+_next_doc_id = 0
+_sessions_loaded = False
+
+
+def tokenize(text: str) -> List[str]:
+    """한글은 1/2-gram, 그 외는 소문자 단어로 분리"""
+    tokens = []
+    for word in WORD_PATTERN.findall(text.lower()):
+        if HANGUL_PATTERN.fullmatch(word):
+            tokens.extend(word)
+            tokens.extend(word[i : i + 2] for i in range(len(word) - 1))
+        elif word.isalnum():
+            tokens.append(word)
+    return tokens
+
+
+def _query_terms(query: str) -> List[str]:
+    """검색어에서 후보 검색에 사용할 단어 추출 (한글은 2-gram 우선)"""
+    terms = []
+    for word in WORD_PATTERN.findall(query.lower()):
+        if HANGUL_PATTERN.fullmatch(word):
+            if len(word) == 1:
+                terms.append(word)
+            else:
+                terms.extend(word[i : i + 2] for i in range(len(word) - 1))
+        elif word.isalnum():
+            terms.append(word)
+    return list(dict.fromkeys(terms))
+
+
+def _remove_document(doc_id: int) -> None:
+    """문서 하나를 색인에서 제거 (잠금 상태에서 호출)"""
+    _, _, tokens = _documents.pop(doc_id)
+    for token in set(tokens):
+        posting = _postings.get(token)
+        if posting is not None:
+            posting.pop(doc_id, None)
+            if not posting:
+                del _postings[token]
+
+
+def _remove_source(source_key: str) -> None:
+    """출처의 모든 문서를 색인에서 제거 (잠금 상태에서 호출)"""
+    source = _sources.pop(source_key, None)
+    if source is None:
+        return
+    for doc_id in source["doc_ids"]:
+        _remove_document(doc_id)
+
+
+def _add_document(source_key: str, source: Dict[str, Any], position: int) -> None:
+    """출처의 position 위치 메시지를 색인 (잠금 상태에서 호출)"""
+    global _next_doc_id
+    message = source["messages"][position - source["start"]]
+    tokens = tokenize(message.get("content", ""))
+    doc_id = _next_doc_id
+    _next_doc_id += 1
+    _documents[doc_id] = (source_key, position, tokens)
+    for token, count in Counter(tokens).items():
+        _postings.setdefault(token, {})[doc_id] = count
+    source["doc_ids"].append(doc_id)
+
+
+def _index_source(source_key: str, source: Dict[str, Any]) -> None:
+    """출처의 메시지를 모두 색인 (기존 내용은 교체, 잠금 상태에서 호출)"""
+    _remove_source(source_key)
+    source["doc_ids"] = []
+    source["start"] = 0
+    for position in range(len(source["messages"])):
+        _add_document(source_key, source, position)
+    _sources[source_key] = source
+
+
+def _touch_conversation(user_key: str) -> None:
+    """현재 대화를 최근 사용으로 표시하고 오래된 대화 색인 정리 (잠금 상태에서 호출)"""
+    _conversation_keys[user_key] = None
+    _conversation_keys.move_to_end(user_key)
+    while len(_conversation_keys) > Config.SEARCH_MAX_CONVERSATIONS:
+        old_key, _ = _conversation_keys.popitem(last=False)
+        _remove_source(f"conversation:{old_key}")
+
+
+def index_conversation(user_key: str, history: List[Dict[str, Any]]) -> None:
+    """현재 대화 기록 전체를 다시 색인 (대화를 불러오거나 초기화할 때, 색인 복구용)"""
+    with _lock:
+        _index_source(
+            f"conversation:{user_key}",
+            {
+                "type": "current",
+                "name": None,
+                "filename": None,
+                "messages": list(history),
+            },
+        )
+        _touch_conversation(user_key)
+
+
+def _same_message(a: Dict[str, Any], b: Dict[str, Any]) -> bool:
+    return a.get("role") == b.get("role") and a.get("content") == b.get("content")
+
+
+def append_to_conversation(
+    user_key: str, history: List[Dict[str, Any]], count: int
+) -> None:
+    """현재 대화 끝에 추가된 메시지 count개만 색인
+
+    history는 메시지가 추가된 뒤의 (최대 개수로 제한된) 대화 기록 전체.
+    색인된 대화가 없거나 추가 전 마지막 메시지가 history와 다르면
+    (다른 워커가 처리한 요청 등) 전체를 다시 색인한다.
+    """
+    source_key = f"conversation:{user_key}"
+    previous_length = len(history) - count
+    with _lock:
+        source = _sources.get(source_key)
+        if (
+            source is None
+            or count <= 0
+            or previous_length <= 0
+            or len(source["messages"]) < previous_length
+            or not _same_message(source["messages"][-1], history[previous_length - 1])
+        ):
+            index_conversation(user_key, history)
+            return
+
+        messages = source["messages"]
+        for message in history[previous_length:]:
+            messages.append(message)
+            _add_document(source_key, source, source["start"] + len(messages) - 1)
+
+        # 최대 개수를 넘어 대화에서 빠진 앞쪽 메시지 제거
+        removed = len(messages) - len(history)
+        if removed > 0:
+            for doc_id in source["doc_ids"][:removed]:
+                _remove_document(doc_id)
+            del source["doc_ids"][:removed]
+            del messages[:removed]
+            source["start"] += removed
+        _touch_conversation(user_key)
+
+
+def is_conversation_indexed(user_key: str) -> bool:
+    """현재 대화가 색인되어 있는지 여부"""
+    with _lock:
+        return f"conversation:{user_key}" in _sources
+
+
+def index_session(filename: str, name: str, messages: List[Dict[str, Any]]) -> None:
+    """저장된 세션을 색인"""
+    with _lock:
+        _index_source(
+            f"session:{filename}",
+            {
+                "type": "session",
+                "name": name,
+                "filename": filename,
+                "messages": messages,
+            },
+        )
+
+
+def remove_session(filename: str) -> None:
+    """삭제된 세션을 색인에서 제거"""
+    with _lock:
+        _remove_source(f"session:{filename}")
+
+
+def _ensure_sessions_loaded() -> None:
+    """처음 검색할 때 저장된 세션을 한 번만 색인"""
+    global _sessions_loaded
+    if _sessions_loaded:
+        return
+    from services.session_service import list_sessions, load_session
+
+    for meta in list_sessions():
+        try:
+            session_data = load_session(meta["filename"])
+        except (FileNotFoundError, ValueError, KeyError):
+            continue
+        index_session(meta["filename"], session_data["name"], session_data["messages"])
+    _sessions_loaded = True
+
+
+def _context(messages: List[Dict[str, Any]], position: int) -> Dict[str, Any]:
+    return {
+        "before": messages[position - 1] if position > 0 else None,
+        "match": messages[position],
+        "after": messages[position + 1] if position < len(messages) - 1 else None,
+        "index": position,
+    }
+
+
+def search(
+    query: str,
+    user_key: Optional[str] = None,
+    include_sessions: bool = True,
+    offset: int = 0,
+    limit: int = 20,
+) -> Dict[str, Any]:
+    """검색어를 포함하는 메시지를 점수순으로 반환 ({"results", "total"})"""
+    query = query.strip()
+    if not query:
+        return {"results": [], "total": 0}
+
+    allowed = set()
+    if user_key is not None:
+        allowed.add(f"conversation:{user_key}")
+
+    with _lock:
+        if include_sessions:
+            _ensure_sessions_loaded()
+
+        def is_allowed(source_key: str) -> bool:
+            return source_key in allowed or (
+                include_sessions and source_key.startswith("session:")
+            )
+
+        terms = _query_terms(query)
+        if terms:
+            postings = sorted((_postings.get(term, {}) for term in terms), key=len)
+            # 가장 짧은 목록부터 교집합을 구해 후보 수를 줄임
+            candidates = set(postings[0])
+            for posting in postings[1:]:
+                candidates.intersection_update(posting)
+                if not candidates:
+                    break
+        else:
+            # 색인할 단어가 없는 검색어(기호 등)는 전체 문서에서 확인
+            candidates = set(_documents)
+
+        needle = query.lower()
+        total_docs = max(len(_documents), 1)
+        scored = []
+        for doc_id in candidates:
+            source_key, position, tokens = _documents[doc_id]
+            if not is_allowed(source_key):
+                continue
+            source = _sources[source_key]
+            position -= source["start"]
+            message = source["messages"][position]
+            if needle not in message.get("content", "").lower():
+                continue
+
+            score = 0.0
+            for term in terms:
+                tf = _postings[term][doc_id]
+                idf = math.log(1 + total_docs / len(_postings[term]))
+                score += (1 + math.log(tf)) * idf
+            score /= math.sqrt(len(tokens) or 1)
+            scored.append((score, doc_id, source, position))
+
+        # 점수가 같으면 최근에 색인된 문서 우선
+        scored.sort(key=lambda item: (item[0], item[1]), reverse=True)
+        results = []
+        for score, _, source, position in scored[offset : offset + limit]:
+            result = _context(source["messages"], position)
+            result["source"] = {
+                "type": source["type"],
+                "name": source["name"],
+                "filename": source["filename"],
+            }
+            result["score"] = round(score, 4)
+            results.append(result)
+
+    return {"results": results, "total": len(scored)}
@@ -0,0 +1,250 @@
+"""
+유사 질문 응답 캐시 서비스
+
+표현만 조금 다른 같은 질문("영업시간 알려줘" / "영업 시간이 어떻게 돼?")에
+저장된 응답을 재사용한다. 질문은 글자 n-gram을 해시하여 고정 길이 벡터로
+만들고(별도 모델 없이 CPU에서 계산), 시스템 프롬프트(페르소나/스타일)별로 나눈
+벡터 목록에서 코사인 유사도가 가장 높은 질문을 찾아 기준값 이상이면 응답을 반환한다.
+
+대화 맥락에 따라 답이 달라지는 후속 질문을 잘못 재사용하지 않도록,
+기본 설정에서는 이전 대화 없이 단독으로 보낸 질문만 저장하고 조회한다.
+숫자만 다른 질문("12 곱하기 13" / "12 곱하기 14")은 벡터가 비슷해도 답이 다르므로
+질문에 있는 숫자가 모두 같을 때만 재사용하고, 알림 요청이나 지금/오늘처럼
+시점에 따라 답이 달라지는 질문은 캐시하지 않는다. 저장된 응답은 TTL이 지나면 버린다.
+"""
+
+from typing import Optional, Dict, Any, List, Tuple
+from collections import OrderedDict
+import re
+import time
+import zlib
+import hashlib
+import threading
+import numpy as np
+from config import Config
+from utils import parse_notification_times
+
+# 공백/문장부호를 제거한 뒤 글자 n-gram을 만든다 (띄어쓰기 차이에 강하게)
+_NORMALIZE_PATTERN = re.compile(r"[\s\W_]+", re.UNICODE)
+NGRAM_SIZES = (2, 3)
+_NUMBER_PATTERN = re.compile(r"\d+(?:[.,]\d+)*")
+# 물을 때마다 답이 달라지는 질문 (현재 시각/날짜, 날씨, 시세 등)
+_TIME_SENSITIVE_PATTERN = re.compile(
+    r"지금|현재|오늘|내일|어제|모레|요즘|최근|최신|이번\s*(?:주|달|해)|몇\s*시|"
+    r"날씨|뉴스|주가|환율|"
+    r"\b(?:now|today|tonight|tomorrow|yesterday|current(?:ly)?|latest|recent|"
+    r"this\s+(?:week|month|year)|what\s+time|weather|news|stock\s+price)\b",
+    re.IGNORECASE,
+)
+# 파티션이 처음 확보하는 슬롯 수 (질문이 쌓이면 최대 보관 수까지 두 배씩 늘림)
+_INITIAL_SLOTS = 16
+
+
+def number_tokens(text: str) -> Tuple[str, ...]:
+    """질문에 있는 숫자 목록 (순서대로)"""
+    return tuple(_NUMBER_PATTERN.findall(text))
+
+
+def is_cacheable_question(question: str) -> bool:
+    """캐시에 저장/조회할 수 있는 질문인지 (알림 요청, 시점에 따라 답이 다른 질문 제외)"""
+    if _TIME_SENSITIVE_PATTERN.search(question):
+        return False
+    return not parse_notification_times(question)
+
+
+def embed_text(text: str, dimensions: int = None) -> np.ndarray:
+    """글자 n-gram 해싱으로 단위 길이 벡터 생성"""
+    if dimensions is None:
+        dimensions = Config.SEMANTIC_CACHE_DIMENSIONS
+    vector = np.zeros(dimensions, dtype=np.float32)
+    normalized = _NORMALIZE_PATTERN.sub("", text.lower())
+    if len(normalized) < min(NGRAM_SIZES):
+        normalized = normalized.ljust(min(NGRAM_SIZES), "_")
+
+    for size in NGRAM_SIZES:
+        for i in range(len(normalized) - size + 1):
+            digest = zlib.crc32(normalized[i : i + size].encode("utf-8"))
+            # 해시 충돌이 서로 상쇄되도록 부호도 해시로 결정
+            sign = 1.0 if digest & 0x80000000 else -1.0
+            vector[digest % dimensions] += sign
+
+    norm = np.linalg.norm(vector)
+    if norm > 0:
+        vector /= norm
+    return vector
+
+
+class _Partition:
+    """같은 시스템 프롬프트를 쓰는 질문 벡터와 응답 (가득 차면 오래된 것부터 교체)"""
+
+    def __init__(self, capacity: int, dimensions: int):
+        self.capacity = capacity
+        # 처음부터 최대 보관 수만큼 확보하지 않고 질문이 쌓이면 늘림
+        slots = min(capacity, _INITIAL_SLOTS)
+        self.vectors = np.zeros((slots, dimensions), dtype=np.float32)
+        # 슬롯별 숫자 목록의 해시와 만료 시각 (후보를 벡터 연산으로 거르기 위함)
+        self.number_keys = np.zeros(slots, dtype=np.int64)
+        self.expires_at = np.zeros(slots, dtype=np.float64)
+        self.entries: List[Tuple[str, str, Tuple[str, ...]]] = []
+        self.size = 0
+        self.next_slot = 0
+
+    def _grow(self) -> None:
+        """슬롯 수를 두 배로 (최대 보관 수까지)"""
+        slots = min(self.capacity, len(self.vectors) * 2)
+        self.vectors = _grown(self.vectors, slots)
+        self.number_keys = _grown(self.number_keys, slots)
+        self.expires_at = _grown(self.expires_at, slots)
+
+    def search(
+        self, vector: np.ndarray, numbers: Tuple[str, ...], now: float
+    ) -> Tuple[float, Optional[Tuple[str, str, Tuple[str, ...]]]]:
+        if self.size == 0:
+            return 0.0, None
+        scores = self.vectors[: self.size] @ vector
+        usable = (self.number_keys[: self.size] == _number_key(numbers)) & (
+            self.expires_at[: self.size] > now
+        )
+        if not usable.any():
+            return 0.0, None
+        scores = np.where(usable, scores, -np.inf)
+        best = int(np.argmax(scores))
+        entry = self.entries[best]
+        if entry[2] != numbers:  # 해시 충돌
+            return 0.0, None
+        return float(scores[best]), entry
+
+    def add(
+        self,
+        vector: np.ndarray,
+        question: str,
+        answer: str,
+        numbers: Tuple[str, ...],
+        expires_at: float,
+    ) -> None:
+        slot = self.next_slot
+        if slot == len(self.vectors):  # 가득 차기 전에만 해당
+            self._grow()
+        self.vectors[slot] = vector
+        self.number_keys[slot] = _number_key(numbers)
+        self.expires_at[slot] = expires_at
+        entry = (question, answer, numbers)
+        if slot == len(self.entries):
+            self.entries.append(entry)
+        else:
+            self.entries[slot] = entry
+        self.next_slot = (slot + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+
+def _grown(array: np.ndarray, slots: int) -> np.ndarray:
+    grown = np.zeros((slots,) + array.shape[1:], dtype=array.dtype)
+    grown[: len(array)] = array
+    return grown
+
+
+def _number_key(numbers: Tuple[str, ...]) -> int:
+    return zlib.crc32("\x00".join(numbers).encode("utf-8")) if numbers else 0
+
+
+class SemanticCache:
+    """페르소나/스타일별로 나눈 질문 벡터 색인"""
+
+    def __init__(
+        self,
+        threshold: float = None,
+        max_entries: int = None,
+        max_partitions: int = None,
+        dimensions: int = None,
+        ttl_seconds: float = None,
+    ):
+        self.threshold = (
+            threshold if threshold is not None else Config.SEMANTIC_CACHE_THRESHOLD
+        )
+        self.max_entries = max_entries or Config.SEMANTIC_CACHE_MAX_ENTRIES
+        self.max_partitions = max_partitions or Config.SEMANTIC_CACHE_MAX_PARTITIONS
+        self.dimensions = dimensions or Config.SEMANTIC_CACHE_DIMENSIONS
+        self.ttl_seconds = ttl_seconds or Config.SEMANTIC_CACHE_TTL_SECONDS
+        self._partitions: "OrderedDict[str, _Partition]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "skipped": 0}
+
+    def lookup(self, partition: str, question: str) -> Optional[Tuple[str, float]]:
+        """숫자가 모두 같은 유사한 질문의 (응답, 유사도) 반환 (기준값 미만이면 None)"""
+        if not is_cacheable_question(question):
+            with self._lock:
+                self._stats["skipped"] += 1
+            return None
+        vector = embed_text(question, self.dimensions)
+        numbers = number_tokens(question)
+        now = time.time()
+        with self._lock:
+            entries = self._partitions.get(partition)
+            score, entry = (
+                entries.search(vector, numbers, now) if entries else (0.0, None)
+            )
+            if entry is None or score < self.threshold:
+                self._stats["misses"] += 1
+                return None
+            self._partitions.move_to_end(partition)
+            self._stats["hits"] += 1
+            return entry[1], score
+
+    def store(self, partition: str, question: str, answer: str) -> None:
+        """질문과 응답 저장"""
+        if not question.strip() or not answer or not is_cacheable_question(question):
+            return
+        vector = embed_text(question, self.dimensions)
+        numbers = number_tokens(question)
+        expires_at = time.time() + self.ttl_seconds
+        with self._lock:
+            entries = self._partitions.get(partition)
+            if entries is None:
+                entries = _Partition(self.max_entries, self.dimensions)
+                self._partitions[partition] = entries
+                while len(self._partitions) > self.max_partitions:
+                    self._partitions.popitem(last=False)
+            self._partitions.move_to_end(partition)
+            entries.add(vector, question, answer, numbers, expires_at)
+            self._stats["stores"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """적중/실패 횟수와 적중률"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = sum(p.size for p in self._partitions.values())
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+
+def split_request(
+    messages: List[Dict[str, Any]],
+) -> Optional[Tuple[str, str]]:
+    """API 요청 메시지에서 (분할 키, 질문) 추출
+
+    분할 키는 페르소나/스타일이 반영된 첫 시스템 프롬프트의 해시이다.
+    SEMANTIC_CACHE_STANDALONE_ONLY이면 이전 대화가 포함된 요청은 None.
+    """
+    if len(messages) < 2 or messages[-1]["role"] != "user":
+        return None
+    # 시스템 프롬프트와 질문만 있는 요청 (이전 대화나 대화 요약이 없음)
+    if Config.SEMANTIC_CACHE_STANDALONE_ONLY and len(messages) != 2:
+        return None
+    partition = hashlib.sha256(messages[0]["content"].encode("utf-8")).hexdigest()
+    return partition, messages[-1]["content"]
+
+
+_semantic_cache: Optional[SemanticCache] = None
+_semantic_cache_lock = threading.Lock()
+
+
+def get_semantic_cache() -> Optional[SemanticCache]:
+    """공유 유사 질문 캐시 반환 (사용하지 않도록 설정되어 있으면 None)"""
+    global _semantic_cache
+    if not Config.SEMANTIC_CACHE_ENABLED:
+        return None
+    with _semantic_cache_lock:
+        if _semantic_cache is None:
+            _semantic_cache = SemanticCache()
+        return _semantic_cache
@@ -1,69 +1,241 @@
 """
 대화 세션 관리 서비스
+
+세션 목록 조회 시 모든 세션 파일을 읽지 않도록, 세션 디렉토리에
+이름/시간/메시지 수만 담은 색인 파일을 두고 저장/삭제 시 함께 갱신한다.
+색인은 파일 잠금 안에서 고치므로 여러 워커가 동시에 저장/삭제해도 항목이 사라지지 않고,
+디렉토리의 파일 목록과 다르면 다음 조회 때 차이만 다시 읽어 고친다.
+Config.STORAGE_BACKEND가 "sqlite"이면 같은 함수가 SQLite 저장소를 사용한다.
 """
 
 import os
 import json
-from typing import List, Dict, Any
+import threading
+import logging
+from contextlib import contextmanager
+from typing import List, Dict, Any, Iterator, Optional
 from datetime import datetime
 from config import Config
+from services.file_lock_service import file_lock
+from services.metrics_service import timed
+from services.sqlite_storage_service import use_sqlite_storage, get_storage
+
+logger = logging.getLogger(__name__)
+
+SESSION_INDEX_NAME = ".sessions_index.json"
+SESSION_INDEX_LOCK_NAME = ".sessions_index.lock"
+SORT_FIELDS = ("timestamp", "name", "message_count")
+
+_index_lock = threading.Lock()
+# 세션 디렉토리 -> (색인 파일 (inode, mtime), 확인한 디렉토리 mtime, 색인 내용,
+#                  정렬 기준별 정렬된 목록)
+_index_cache: Dict[str, Any] = {}
+
+
+def _index_path(sessions_dir: str) -> str:
+    return os.path.join(sessions_dir, SESSION_INDEX_NAME)
+
+
+@contextmanager
+def _locked_index(sessions_dir: str) -> Iterator[None]:
+    """색인 읽기-수정-쓰기를 스레드와 워커 프로세스 사이에서 직렬화"""
+    with _index_lock, file_lock(os.path.join(sessions_dir, SESSION_INDEX_LOCK_NAME)):
+        yield
+
+
+def _file_key(path: str):
+    # 색인은 항상 새 파일로 교체되므로 inode가 바뀌면 다른 프로세스가 고친 것
+    stat = os.stat(path)
+    return stat.st_ino, stat.st_mtime_ns
+
+
+def _write_index(sessions_dir: str, index: Dict[str, Dict[str, Any]]) -> None:
+    """색인을 임시 파일에 쓴 뒤 교체 (잠금 상태에서 호출)"""
+    path = _index_path(sessions_dir)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False)
+    os.replace(temp_path, path)
+    _index_cache[sessions_dir] = (
+        _file_key(path),
+        os.stat(sessions_dir).st_mtime_ns,
+        index,
+        {},
+    )
+
+
+def _is_session_file(filename: str) -> bool:
+    return not filename.startswith(".") and filename.endswith(".json")
+
+
+def _read_session_meta(sessions_dir: str, filename: str) -> Optional[Dict[str, Any]]:
+    """세션 파일 하나를 읽어 색인 항목 구성 (읽을 수 없으면 None)"""
+    try:
+        with open(os.path.join(sessions_dir, filename), "r", encoding="utf-8") as f:
+            session_data = json.load(f)
+        return {
+            "name": session_data["name"],
+            "timestamp": session_data["timestamp"],
+            "message_count": len(session_data["messages"]),
+        }
+    except (OSError, json.JSONDecodeError, KeyError) as e:
+        logger.warning("세션 파일 '%s' 읽기 오류: %s", filename, e)
+        return None
+
+
+def _reconcile_index(sessions_dir: str, index: Dict[str, Dict[str, Any]]) -> bool:
+    """디렉토리의 세션 파일과 색인이 다르면 차이만 반영, 바뀌었으면 True
+
+    색인에 없는 파일만 읽으므로 색인이 맞으면 파일을 하나도 읽지 않는다.
+    """
+    filenames = {f for f in os.listdir(sessions_dir) if _is_session_file(f)}
+    stale = index.keys() - filenames
+    missing = filenames - index.keys()
+    for filename in stale:
+        del index[filename]
+    for filename in missing:
+        meta = _read_session_meta(sessions_dir, filename)
+        if meta is not None:
+            index[filename] = meta
+    if stale or missing:
+        logger.info(
+            "세션 색인 갱신: %d개 추가, %d개 삭제 (전체 %d개)",
+            len(missing),
+            len(stale),
+            len(index),
+        )
+    return bool(stale or missing)
+
+
+def _load_cached_index(sessions_dir: str):
+    """(파일 키, 디렉토리 mtime, 색인, 정렬 목록) 반환 (잠금 상태에서 호출)
+
+    색인 파일과 디렉토리가 모두 그대로면 캐시를 사용한다. 디렉토리가 바뀌었으면
+    (다른 워커의 저장, 직접 복사/삭제한 파일 등) 파일 목록과 비교해 색인을 고친다.
+    """
+    path = _index_path(sessions_dir)
+    dir_mtime = os.stat(sessions_dir).st_mtime_ns
+    cached = _index_cache.get(sessions_dir)
+    try:
+        key = _file_key(path)
+    except OSError:
+        key = None
 
+    if cached and key is not None and cached[0] == key:
+        if cached[1] == dir_mtime:
+            return cached
+        index = dict(cached[2])
+    else:
+        index = {}
+        if key is not None:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    index = json.load(f)
+            except json.JSONDecodeError:
+                logger.warning("세션 색인이 손상되어 다시 구성합니다.")
+                key = None
+
+    if _reconcile_index(sessions_dir, index) or key is None:
+        _write_index(sessions_dir, index)
+    else:
+        _index_cache[sessions_dir] = (key, dir_mtime, index, {})
+    return _index_cache[sessions_dir]
+
+
+def _load_index(sessions_dir: str) -> Dict[str, Dict[str, Any]]:
+    return _load_cached_index(sessions_dir)[2]
 
+
+@timed("session_save")
 def save_session(
     history: List[Dict[str, Any]], session_name: str, sessions_dir: str = None
 ) -> str:
     """세션을 저장하고 파일명 반환"""
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = f"{session_name}_{timestamp}.json"
+    if use_sqlite_storage():
+        get_storage().save_session(filename, session_name, timestamp, history)
+        return filename
+
     if sessions_dir is None:
         sessions_dir = Config.SESSIONS_DIR
     os.makedirs(sessions_dir, exist_ok=True)
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"{session_name}_{timestamp}.json"
     filepath = os.path.join(sessions_dir, filename)
 
-    with open(filepath, "w", encoding="utf-8") as f:
-        json.dump(
-            {"name": session_name, "timestamp": timestamp, "messages": history},
-            f,
-            ensure_ascii=False,
-            indent=2,
-        )
+    with _locked_index(sessions_dir):
+        # 파일을 쓰기 전에 색인을 불러와야 새 파일을 색인 밖에서 생긴 파일로 보지 않음
+        index = dict(_load_index(sessions_dir))
+        with open(filepath, "w", encoding="utf-8") as f:
+            json.dump(
+                {"name": session_name, "timestamp": timestamp, "messages": history},
+                f,
+                ensure_ascii=False,
+                indent=2,
+            )
+        index[filename] = {
+            "name": session_name,
+            "timestamp": timestamp,
+            "message_count": len(history),
+        }
+        _write_index(sessions_dir, index)
 
     return filename
 
 
-def list_sessions(sessions_dir: str = None) -> List[Dict[str, Any]]:
-    """저장된 모든 세션 목록 반환"""
+def list_sessions(
+    sessions_dir: str = None,
+    offset: int = 0,
+    limit: Optional[int] = None,
+    sort: str = "timestamp",
+    reverse: bool = True,
+) -> List[Dict[str, Any]]:
+    """저장된 세션 목록 반환 (기본: 최신순 전체)"""
+    return list_sessions_page(sessions_dir, offset, limit, sort, reverse)["sessions"]
+
+
+@timed("session_list")
+def list_sessions_page(
+    sessions_dir: str = None,
+    offset: int = 0,
+    limit: Optional[int] = None,
+    sort: str = "timestamp",
+    reverse: bool = True,
+) -> Dict[str, Any]:
+    """색인에서 정렬/페이지 단위로 세션 목록과 전체 개수 반환"""
+    if use_sqlite_storage():
+        return get_storage().list_sessions(offset, limit, sort, reverse)
+
     if sessions_dir is None:
         sessions_dir = Config.SESSIONS_DIR
+    if sort not in SORT_FIELDS:
+        raise ValueError(f"지원하지 않는 정렬 기준입니다: {sort}")
     if not os.path.exists(sessions_dir):
-        return []
+        return {"sessions": [], "total": 0}
 
-    sessions = []
-    for filename in os.listdir(sessions_dir):
-        if filename.endswith(".json"):
-            filepath = os.path.join(sessions_dir, filename)
-            try:
-                with open(filepath, "r", encoding="utf-8") as f:
-                    session_data = json.load(f)
-                    sessions.append(
-                        {
-                            "filename": filename,
-                            "name": session_data["name"],
-                            "timestamp": session_data["timestamp"],
-                            "message_count": len(session_data["messages"]),
-                        }
-                    )
-            except (json.JSONDecodeError, KeyError) as e:
-                print(f"세션 파일 '{filename}' 읽기 오류: {e}")
-                continue
-
-    # 최신 세션이 먼저 오도록 정렬
-    sessions.sort(key=lambda x: x["timestamp"], reverse=True)
-    return sessions
+    with _locked_index(sessions_dir):
+        _, _, index, views = _load_cached_index(sessions_dir)
+        sessions = views.get((sort, reverse))
+        if sessions is None:
+            sessions = [
+                {"filename": filename, **meta} for filename, meta in index.items()
+            ]
+            sessions.sort(key=lambda x: (x[sort], x["filename"]), reverse=reverse)
+            views[(sort, reverse)] = sessions
+
+    end = None if limit is None else offset + limit
+    page = [dict(item) for item in sessions[offset:end]]
+    return {"sessions": page, "total": len(sessions)}
 
 
+@timed("session_load")
 def load_session(filename: str, sessions_dir: str = None) -> Dict[str, Any]:
     """세션 데이터를 로드하여 전체 세션 정보를 반환"""
+    if use_sqlite_storage():
+        session_data = get_storage().load_session(filename)
+        if session_data is None:
+            raise FileNotFoundError("해당 세션을 찾을 수 없습니다.")
+        return session_data
+
     if sessions_dir is None:
         sessions_dir = Config.SESSIONS_DIR
     filepath = os.path.join(sessions_dir, filename)
@@ -76,10 +248,20 @@ def load_session(filename: str, sessions_dir: str = None) -> Dict[str, Any]:
 
 def delete_session(filename: str, sessions_dir: str = None) -> None:
     """세션 파일 삭제"""
+    if use_sqlite_storage():
+        if not get_storage().delete_session(filename):
+            raise FileNotFoundError("해당 세션을 찾을 수 없습니다.")
+        return
+
     if sessions_dir is None:
         sessions_dir = Config.SESSIONS_DIR
     filepath = os.path.join(sessions_dir, filename)
-    if os.path.exists(filepath):
-        os.remove(filepath)
-    else:
-        raise FileNotFoundError("해당 세션을 찾을 수 없습니다.")
+
+    with _locked_index(sessions_dir):
+        index = dict(_load_index(sessions_dir))
+        if os.path.exists(filepath):
+            os.remove(filepath)
+        else:
+            raise FileNotFoundError("해당 세션을 찾을 수 없습니다.")
+        if index.pop(filename, None) is not None:
+            _write_index(sessions_dir, index)
@@ -0,0 +1,311 @@
+"""
+서버 측 세션 저장소 서비스
+
+Flask 기본 세션은 모든 세션 데이터를 서명된 쿠키에 담아 매 요청마다 주고받는다.
+이 모듈의 세션 인터페이스는 데이터를 서버 저장소(메모리/파일/SQLite)에 두고
+쿠키에는 서명된 세션 ID만 담는다.
+"""
+
+from typing import Optional, Dict, Any, Tuple, Callable
+import os
+import time
+import uuid
+import sqlite3
+import threading
+import logging
+from datetime import timedelta
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SessionInterface, SessionMixin
+from itsdangerous import BadSignature, Signer
+from werkzeug.datastructures import CallbackDict
+from config import Config
+from services.metrics_service import timed
+
+logger = logging.getLogger(__name__)
+
+
+class ServerSideSession(CallbackDict, SessionMixin):
+    """서버 저장소에 보관되는 세션"""
+
+    def __init__(self, initial=None, sid: str = None, new: bool = False):
+        def on_update(self):
+            self.modified = True
+
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.new = new
+        self.modified = False
+
+
+class MemorySessionBackend:
+    """프로세스 메모리에 세션을 보관하는 저장소 (단일 프로세스 개발용)"""
+
+    def __init__(self):
+        self._data: Dict[str, Tuple[float, str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, sid: str) -> Optional[str]:
+        with self._lock:
+            entry = self._data.get(sid)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.time():
+                del self._data[sid]
+                return None
+            return value
+
+    def set(self, sid: str, value: str, lifetime: timedelta) -> None:
+        with self._lock:
+            self._data[sid] = (time.time() + lifetime.total_seconds(), value)
+
+    def delete(self, sid: str) -> None:
+        with self._lock:
+            self._data.pop(sid, None)
+
+    def cleanup(self) -> int:
+        now = time.time()
+        with self._lock:
+            expired = [sid for sid, (expires, _) in self._data.items() if expires < now]
+            for sid in expired:
+                del self._data[sid]
+        return len(expired)
+
+
+class FileSystemSessionBackend:
+    """세션 ID 앞 두 글자로 나눈 디렉토리에 세션별 파일을 보관하는 저장소"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, sid: str) -> str:
+        return os.path.join(self.directory, sid[:2], sid)
+
+    def get(self, sid: str) -> Optional[str]:
+        path = self._path(sid)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                expires = float(f.readline())
+                value = f.read()
+        except (OSError, ValueError):
+            return None
+        if expires < time.time():
+            self.delete(sid)
+            return None
+        return value
+
+    def set(self, sid: str, value: str, lifetime: timedelta) -> None:
+        path = self._path(sid)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(f"{time.time() + lifetime.total_seconds()}\n")
+            f.write(value)
+        os.replace(temp_path, path)
+
+    def delete(self, sid: str) -> None:
+        try:
+            os.remove(self._path(sid))
+        except OSError:
+            pass
+
+    def cleanup(self) -> int:
+        removed = 0
+        now = time.time()
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                try:
+                    with open(entry.path, "r", encoding="utf-8") as f:
+                        expires = float(f.readline())
+                except (OSError, ValueError):
+                    continue
+                if expires < now:
+                    os.remove(entry.path)
+                    removed += 1
+        return removed
+
+
+class SQLiteSessionBackend:
+    """SQLite 테이블에 세션을 보관하는 저장소 (여러 워커 프로세스에서 공유 가능)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connection()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions "
+            "(sid TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL NOT NULL)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_sessions_expires ON sessions (expires)"
+        )
+        conn.commit()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, sid: str) -> Optional[str]:
+        row = (
+            self._connection()
+            .execute(
+                "SELECT value FROM sessions WHERE sid = ? AND expires >= ?",
+                (sid, time.time()),
+            )
+            .fetchone()
+        )
+        return row[0] if row else None
+
+    def set(self, sid: str, value: str, lifetime: timedelta) -> None:
+        conn = self._connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO sessions (sid, value, expires) VALUES (?, ?, ?)",
+            (sid, value, time.time() + lifetime.total_seconds()),
+        )
+        conn.commit()
+
+    def delete(self, sid: str) -> None:
+        conn = self._connection()
+        conn.execute("DELETE FROM sessions WHERE sid = ?", (sid,))
+        conn.commit()
+
+    def cleanup(self) -> int:
+        conn = self._connection()
+        cursor = conn.execute("DELETE FROM sessions WHERE expires < ?", (time.time(),))
+        conn.commit()
+        return cursor.rowcount
+
+
+class ServerSideSessionInterface(SessionInterface):
+    """쿠키에는 서명된 세션 ID만 두고 데이터는 저장소에서 읽고 쓰는 세션 인터페이스"""
+
+    serializer = TaggedJSONSerializer()
+    salt = "server-side-session"
+
+    def __init__(self, backend, cleanup_interval: float = None):
+        self.backend = backend
+        self.cleanup_interval = (
+            Config.SESSION_CLEANUP_INTERVAL_SECONDS
+            if cleanup_interval is None
+            else cleanup_interval
+        )
+        self._last_cleanup = time.time()
+        self._cleanup_lock = threading.Lock()
+        self._update_lock = threading.Lock()
+
+    def _signer(self, app) -> Signer:
+        return Signer(app.secret_key, salt=self.salt)
+
+    def _maybe_cleanup(self) -> None:
+        """만료된 세션을 일정 간격으로 정리"""
+        now = time.time()
+        if now - self._last_cleanup < self.cleanup_interval:
+            return
+        if not self._cleanup_lock.acquire(blocking=False):
+            return
+        try:
+            self._last_cleanup = now
+            removed = self.backend.cleanup()
+            if removed:
+                logger.info("만료된 세션 %d개를 정리했습니다.", removed)
+        finally:
+            self._cleanup_lock.release()
+
+    def update_stored_session(
+        self, app, sid: str, update: Callable[[Dict[str, Any]], None]
+    ) -> bool:
+        """응답을 보낸 뒤에 저장소의 세션 데이터를 직접 수정 (세션이 없으면 False)"""
+        with self._update_lock:
+            value = self.backend.get(sid)
+            if value is None:
+                return False
+            data = self.serializer.loads(value)
+            update(data)
+            self.backend.set(
+                sid, self.serializer.dumps(data), app.permanent_session_lifetime
+            )
+        return True
+
+    @timed("session_store_open")
+    def open_session(self, app, request) -> ServerSideSession:
+        cookie = request.cookies.get(self.get_cookie_name(app))
+        if cookie:
+            try:
+                sid = self._signer(app).unsign(cookie).decode("utf-8")
+            except BadSignature:
+                sid = None
+            if sid:
+                value = self.backend.get(sid)
+                if value is not None:
+                    try:
+                        return ServerSideSession(self.serializer.loads(value), sid=sid)
+                    except ValueError:
+                        pass
+        return ServerSideSession(sid=uuid.uuid4().hex, new=True)
+
+    @timed("session_store_save")
+    def save_session(self, app, session: ServerSideSession, response) -> None:
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        if session.accessed:
+            response.vary.add("Cookie")
+
+        if not session:
+            if session.modified:
+                self.backend.delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path)
+                response.vary.add("Cookie")
+            return
+
+        if not self.should_set_cookie(app, session):
+            return
+
+        self.backend.set(
+            session.sid,
+            self.serializer.dumps(dict(session)),
+            app.permanent_session_lifetime,
+        )
+        response.set_cookie(
+            name,
+            self._signer(app).sign(session.sid).decode("utf-8"),
+            expires=self.get_expiration_time(app, session),
+            httponly=self.get_cookie_httponly(app),
+            domain=domain,
+            path=path,
+            secure=self.get_cookie_secure(app),
+            samesite=self.get_cookie_samesite(app),
+        )
+        response.vary.add("Cookie")
+        self._maybe_cleanup()
+
+
+def create_session_interface(session_type: str = None) -> Optional[SessionInterface]:
+    """설정된 세션 종류에 맞는 세션 인터페이스 생성 (cookie이면 None: Flask 기본값 사용)"""
+    if session_type is None:
+        session_type = Config.SESSION_TYPE
+
+    if session_type == "cookie":
+        return None
+    if session_type == "memory":
+        return ServerSideSessionInterface(MemorySessionBackend())
+    if session_type == "filesystem":
+        return ServerSideSessionInterface(
+            FileSystemSessionBackend(Config.SESSION_STORE_DIR)
+        )
+    if session_type == "sqlite":
+        return ServerSideSessionInterface(
+            SQLiteSessionBackend(Config.SESSION_SQLITE_PATH)
+        )
+    raise ValueError(f"지원하지 않는 세션 종류입니다: {session_type}")
@@ -0,0 +1,291 @@
+"""
+중복 요청 병합(single-flight) 서비스
+
+같은 세션에서 같은 내용의 요청이 동시에 여러 번 들어오면(전송 버튼 두 번 클릭,
+클라이언트 재시도 등) 처음 요청 하나만 실제로 처리하고, 나머지 요청은 그 결과를
+기다렸다가 그대로 돌려받는다. 이미 끝난 요청의 결과는 보관하지 않으므로
+처리가 끝난 뒤 다시 보낸 요청은 새로 처리된다.
+처음 요청의 스트림이 한 번도 읽히지 않고 닫히거나 첫 항목이 너무 늦으면
+기다리던 요청들은 각자 따로 처리한다.
+
+SingleFlight는 스레드(WSGI) 환경용, AsyncSingleFlight는 이벤트 루프(ASGI) 환경용이다.
+"""
+
+from typing import Any, Callable, Dict, Iterator, AsyncIterator, List, Optional
+import json
+import asyncio
+import hashlib
+import threading
+import logging
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+def make_flight_key(session_key: Optional[str], payload: Any) -> Optional[str]:
+    """세션과 요청 내용으로 병합 키 생성 (세션을 알 수 없으면 None: 병합하지 않음)"""
+    if not session_key:
+        return None
+    if isinstance(payload, bytes):
+        body = payload
+    else:
+        body = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    digest = hashlib.sha256(session_key.encode("utf-8") + b"\x00" + body)
+    return digest.hexdigest()
+
+
+class _Flight:
+    """진행 중인 요청 하나의 결과 (스트림이면 지금까지 생성된 항목 목록)"""
+
+    def __init__(self):
+        self.items: List[Any] = []
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.done = False
+        self.abandoned = False  # 처음 요청이 읽지 않고 닫음 (기다리던 요청은 따로 처리)
+        self.changed: Optional[asyncio.Event] = None  # AsyncSingleFlight용
+
+
+class SingleFlight:
+    """스레드 간 중복 요청 병합"""
+
+    def __init__(self, wait_timeout: float = None):
+        # 스트림을 함께 받는 요청이 첫 항목을 기다리는 최대 시간
+        self.wait_timeout = wait_timeout or Config.SINGLEFLIGHT_WAIT_TIMEOUT_SECONDS
+        self._flights: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+
+    def _join(self, key: str):
+        """(진행 중인 요청, 새로 시작하는지 여부) 반환 (잠금 상태에서 호출)"""
+        flight = self._flights.get(key)
+        if flight is not None:
+            return flight, False
+        flight = _Flight()
+        self._flights[key] = flight
+        return flight, True
+
+    def _finish(self, key: str, flight: _Flight, error=None, abandoned=False) -> None:
+        with self._changed:
+            flight.error = error
+            flight.abandoned = abandoned
+            flight.done = True
+            self._forget(key, flight)
+            self._changed.notify_all()
+
+    def _forget(self, key: str, flight: _Flight) -> None:
+        """새 요청이 이 요청을 기다리지 않도록 목록에서 제거 (잠금 상태에서 호출)"""
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def do(self, key: Optional[str], fn: Callable[[], Any]) -> Any:
+        """같은 키의 요청이 진행 중이면 그 결과를, 아니면 fn()을 실행한 결과를 반환"""
+        if key is None:
+            return fn()
+
+        with self._changed:
+            flight, leader = self._join(key)
+            if not leader:
+                logger.debug(
+                    "중복 요청 병합: 진행 중인 요청의 결과를 기다립니다 (%s)", key[:8]
+                )
+                self._changed.wait_for(lambda: flight.done)
+                if flight.error is not None:
+                    raise flight.error
+                return flight.result
+
+        try:
+            flight.result = fn()
+        except BaseException as e:
+            self._finish(key, flight, e)
+            raise
+        self._finish(key, flight)
+        return flight.result
+
+    def stream(
+        self, key: Optional[str], start: Callable[[], Iterator[Any]]
+    ) -> Iterator[Any]:
+        """같은 키의 스트림이 진행 중이면 그 항목들을, 아니면 start()의 항목들을 반환
+
+        start()는 처음 요청에서 바로 호출되므로 요청 컨텍스트가 필요한 준비 작업을
+        할 수 있다. 처음 요청의 연결이 끊겨도 스트림은 끝까지 진행되어
+        기다리는 요청들이 결과를 받는다. 기다리는 요청이 따로 처리하게 되면
+        그 요청에서 start()를 호출한다.
+        """
+        if key is None:
+            return start()
+
+        with self._changed:
+            flight, leader = self._join(key)
+        if not leader:
+            logger.debug(
+                "중복 요청 병합: 진행 중인 스트림을 함께 받습니다 (%s)", key[:8]
+            )
+            return self._follow(key, flight, start)
+
+        try:
+            source = start()
+        except BaseException as e:
+            self._finish(key, flight, e)
+            raise
+        return _LeadStream(self, key, flight, source)
+
+    def _lead(self, key: str, flight: _Flight, source: Iterator[Any]):
+        error = None
+        try:
+            for item in source:
+                with self._changed:
+                    flight.items.append(item)
+                    self._changed.notify_all()
+                yield item
+        except GeneratorExit:
+            # 연결이 끊겨도 기다리는 요청과 기록 저장을 위해 끝까지 진행
+            for item in source:
+                with self._changed:
+                    flight.items.append(item)
+                    self._changed.notify_all()
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self._finish(key, flight, error)
+
+    def _follow(self, key: str, flight: _Flight, start: Callable[[], Iterator[Any]]):
+        index = 0
+        while True:
+            with self._changed:
+                ready = self._changed.wait_for(
+                    lambda: len(flight.items) > index or flight.done,
+                    self.wait_timeout if index == 0 else None,
+                )
+                if index == 0 and (not ready or flight.abandoned):
+                    # 처음 요청이 시작하지 않았거나 멈춤: 이후 요청도 기다리지 않도록 제거
+                    self._forget(key, flight)
+                    logger.warning(
+                        "중복 요청 병합: 처음 요청의 응답이 없어 따로 처리합니다 (%s)",
+                        key[:8],
+                    )
+                    break
+                items = flight.items[index:]
+                done = flight.done
+                error = flight.error
+            for item in items:
+                yield item
+            index += len(items)
+            if done and index >= len(flight.items):
+                if error is not None:
+                    raise error
+                return
+        yield from start()
+
+
+class _LeadStream:
+    """처음 요청이 받는 스트림
+
+    한 번도 읽지 않고 닫히면(응답을 보내기 전 연결 종료, 오류 등) 원본 스트림을 닫고
+    기다리던 요청들이 따로 처리하도록 병합을 끝낸다. 읽기 시작한 뒤에는 _lead가
+    정리한다.
+    """
+
+    def __init__(self, group: SingleFlight, key: str, flight: _Flight, source):
+        self._group = group
+        self._key = key
+        self._flight = flight
+        self._source = source
+        self._generator = None
+        self._closed = False
+
+    def __iter__(self) -> "_LeadStream":
+        return self
+
+    def __next__(self) -> Any:
+        if self._generator is None:
+            if self._closed:
+                raise StopIteration
+            self._generator = self._group._lead(self._key, self._flight, self._source)
+        return next(self._generator)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        if self._generator is not None:
+            self._generator.close()
+            return
+        close = getattr(self._source, "close", None)
+        if close is not None:
+            close()
+        self._group._finish(self._key, self._flight, abandoned=True)
+
+    def __del__(self):
+        self.close()
+
+
+class AsyncSingleFlight:
+    """이벤트 루프 안에서의 중복 요청 병합 (작업은 요청과 별개의 Task로 실행)"""
+
+    def __init__(self):
+        self._flights: Dict[str, _Flight] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    async def do(self, key: Optional[str], start: Callable[[], Any]) -> Any:
+        """같은 키의 요청이 진행 중이면 그 결과를, 아니면 start() 코루틴의 결과를 반환"""
+        if key is None:
+            return await start()
+
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(start())
+            self._tasks[key] = task
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+        else:
+            logger.debug(
+                "중복 요청 병합: 진행 중인 요청의 결과를 기다립니다 (%s)", key[:8]
+            )
+        return await asyncio.shield(task)
+
+    async def stream(
+        self, key: Optional[str], start: Callable[[], AsyncIterator[Any]]
+    ) -> AsyncIterator[Any]:
+        """같은 키의 스트림이 진행 중이면 그 항목들을, 아니면 start()의 항목들을 반환"""
+        if key is None:
+            async for item in start():
+                yield item
+            return
+
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight()
+            flight.changed = asyncio.Event()
+            self._flights[key] = flight
+            asyncio.ensure_future(self._pump(key, flight, start()))
+        else:
+            logger.debug(
+                "중복 요청 병합: 진행 중인 스트림을 함께 받습니다 (%s)", key[:8]
+            )
+
+        index = 0
+        while True:
+            while index < len(flight.items):
+                yield flight.items[index]
+                index += 1
+            if flight.done:
+                if flight.error is not None:
+                    raise flight.error
+                return
+            flight.changed.clear()
+            await flight.changed.wait()
+
+    async def _pump(self, key: str, flight: _Flight, source: AsyncIterator[Any]):
+        """연결과 무관하게 스트림을 끝까지 읽어 항목 목록에 추가"""
+        try:
+            async for item in source:
+                flight.items.append(item)
+                flight.changed.set()
+        except Exception as e:
+            flight.error = e
+        finally:
+            flight.done = True
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+            flight.changed.set()
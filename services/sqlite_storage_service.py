@@ -0,0 +1,309 @@
+"""
+SQLite 저장소 서비스
+
+Config.STORAGE_BACKEND가 "sqlite"이면 대화 기록과 저장된 세션을
+JSON 파일 대신 SQLite 데이터베이스에 메시지 단위 행으로 저장한다.
+"""
+
+from typing import List, Dict, Any, Optional
+import os
+import json
+import time
+import sqlite3
+import threading
+import logging
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS conversation_messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_key TEXT NOT NULL,
+    role TEXT NOT NULL,
+    content TEXT NOT NULL,
+    extra TEXT,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_conversation_messages_user
+    ON conversation_messages (user_key, id);
+
+CREATE TABLE IF NOT EXISTS conversation_summaries (
+    user_key TEXT PRIMARY KEY,
+    summary TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS saved_sessions (
+    filename TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    message_count INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_saved_sessions_timestamp
+    ON saved_sessions (timestamp);
+CREATE INDEX IF NOT EXISTS idx_saved_sessions_name ON saved_sessions (name);
+
+CREATE TABLE IF NOT EXISTS session_messages (
+    filename TEXT NOT NULL REFERENCES saved_sessions (filename) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    role TEXT NOT NULL,
+    content TEXT NOT NULL,
+    extra TEXT,
+    PRIMARY KEY (filename, position)
+);
+"""
+
+SORT_COLUMNS = {
+    "timestamp": "timestamp",
+    "name": "name",
+    "message_count": "message_count",
+}
+
+
+def _split_message(message: Dict[str, Any]):
+    """메시지를 (role, content, 나머지 필드 JSON)으로 분리"""
+    extra = {k: v for k, v in message.items() if k not in ("role", "content")}
+    return (
+        message["role"],
+        message["content"],
+        json.dumps(extra, ensure_ascii=False) if extra else None,
+    )
+
+
+def _join_message(role: str, content: str, extra: Optional[str]) -> Dict[str, Any]:
+    message = {"role": role, "content": content}
+    if extra:
+        message.update(json.loads(extra))
+    return message
+
+
+class SQLiteStorage:
+    """스레드마다 연결을 하나씩 두고 WAL 모드로 동작하는 저장소"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.connection().executescript(SCHEMA)
+
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    # 대화 기록
+
+    def append_message(self, user_key: str, message: Dict[str, Any]) -> None:
+        conn = self.connection()
+        with conn:
+            conn.execute(
+                "INSERT INTO conversation_messages "
+                "(user_key, role, content, extra, created_at) VALUES (?, ?, ?, ?, ?)",
+                (user_key, *_split_message(message), time.time()),
+            )
+
+    def replace_messages(self, user_key: str, messages: List[Dict[str, Any]]) -> None:
+        conn = self.connection()
+        now = time.time()
+        with conn:
+            conn.execute(
+                "DELETE FROM conversation_messages WHERE user_key = ?", (user_key,)
+            )
+            conn.executemany(
+                "INSERT INTO conversation_messages "
+                "(user_key, role, content, extra, created_at) VALUES (?, ?, ?, ?, ?)",
+                [(user_key, *_split_message(m), now) for m in messages],
+            )
+
+    def load_messages(self, user_key: str, limit: int) -> List[Dict[str, Any]]:
+        rows = (
+            self.connection()
+            .execute(
+                "SELECT role, content, extra FROM conversation_messages "
+                "WHERE user_key = ? ORDER BY id DESC LIMIT ?",
+                (user_key, limit),
+            )
+            .fetchall()
+        )
+        return [_join_message(*row) for row in reversed(rows)]
+
+    def load_summary(self, user_key: str) -> Optional[Dict[str, Any]]:
+        row = (
+            self.connection()
+            .execute(
+                "SELECT summary FROM conversation_summaries WHERE user_key = ?",
+                (user_key,),
+            )
+            .fetchone()
+        )
+        return json.loads(row[0]) if row else None
+
+    def save_summary(self, user_key: str, summary: Optional[Dict[str, Any]]) -> None:
+        conn = self.connection()
+        with conn:
+            if summary is None:
+                conn.execute(
+                    "DELETE FROM conversation_summaries WHERE user_key = ?",
+                    (user_key,),
+                )
+                return
+            conn.execute(
+                "INSERT OR REPLACE INTO conversation_summaries "
+                "(user_key, summary, updated_at) VALUES (?, ?, ?)",
+                (user_key, json.dumps(summary, ensure_ascii=False), time.time()),
+            )
+
+    # 저장된 세션
+
+    def save_session(
+        self, filename: str, name: str, timestamp: str, messages: List[Dict[str, Any]]
+    ) -> None:
+        conn = self.connection()
+        with conn:
+            conn.execute("DELETE FROM saved_sessions WHERE filename = ?", (filename,))
+            conn.execute(
+                "INSERT INTO saved_sessions (filename, name, timestamp, message_count) "
+                "VALUES (?, ?, ?, ?)",
+                (filename, name, timestamp, len(messages)),
+            )
+            conn.executemany(
+                "INSERT INTO session_messages "
+                "(filename, position, role, content, extra) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (filename, position, *_split_message(message))
+                    for position, message in enumerate(messages)
+                ],
+            )
+
+    def list_sessions(
+        self,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        sort: str = "timestamp",
+        reverse: bool = True,
+    ) -> Dict[str, Any]:
+        if sort not in SORT_COLUMNS:
+            raise ValueError(f"지원하지 않는 정렬 기준입니다: {sort}")
+        order = "DESC" if reverse else "ASC"
+        conn = self.connection()
+        rows = conn.execute(
+            "SELECT filename, name, timestamp, message_count FROM saved_sessions "
+            f"ORDER BY {SORT_COLUMNS[sort]} {order}, filename {order} "
+            "LIMIT ? OFFSET ?",
+            (-1 if limit is None else limit, offset),
+        ).fetchall()
+        total = conn.execute("SELECT COUNT(*) FROM saved_sessions").fetchone()[0]
+        sessions = [
+            {
+                "filename": filename,
+                "name": name,
+                "timestamp": timestamp,
+                "message_count": message_count,
+            }
+            for filename, name, timestamp, message_count in rows
+        ]
+        return {"sessions": sessions, "total": total}
+
+    def load_session(self, filename: str) -> Optional[Dict[str, Any]]:
+        conn = self.connection()
+        row = conn.execute(
+            "SELECT name, timestamp FROM saved_sessions WHERE filename = ?",
+            (filename,),
+        ).fetchone()
+        if row is None:
+            return None
+        messages = conn.execute(
+            "SELECT role, content, extra FROM session_messages "
+            "WHERE filename = ? ORDER BY position",
+            (filename,),
+        ).fetchall()
+        return {
+            "name": row[0],
+            "timestamp": row[1],
+            "messages": [_join_message(*message) for message in messages],
+        }
+
+    def delete_session(self, filename: str) -> bool:
+        conn = self.connection()
+        with conn:
+            cursor = conn.execute(
+                "DELETE FROM saved_sessions WHERE filename = ?", (filename,)
+            )
+        return cursor.rowcount > 0
+
+
+_storage: Optional[SQLiteStorage] = None
+_storage_lock = threading.Lock()
+
+
+def use_sqlite_storage() -> bool:
+    """SQLite 저장소 사용 여부"""
+    return Config.STORAGE_BACKEND == "sqlite"
+
+
+def get_storage() -> SQLiteStorage:
+    """설정된 경로의 SQLite 저장소 반환 (처음 호출 시 생성)"""
+    global _storage
+    with _storage_lock:
+        if _storage is None or _storage.path != Config.SQLITE_DB_PATH:
+            _storage = SQLiteStorage(Config.SQLITE_DB_PATH)
+        return _storage
+
+
+def migrate_json_to_sqlite(storage: SQLiteStorage = None) -> Dict[str, int]:
+    """data/ 아래 기존 JSON 대화 기록과 세션 파일을 SQLite로 가져오기
+
+    STORAGE_BACKEND 설정과 관계없이 파일을 직접 읽고, 메시지는 모두 가져온다.
+    """
+    from services.conversation_service import (
+        USERS_DIR_NAME,
+        load_file_conversation_history,
+    )
+
+    if storage is None:
+        storage = get_storage()
+    counts = {"conversations": 0, "sessions": 0}
+
+    # 공용 대화 기록 (기존 JSON 파일도 이 과정에서 로그로 옮겨짐)
+    history = load_file_conversation_history()
+    if history:
+        storage.replace_messages("", history)
+        counts["conversations"] += 1
+
+    users_dir = os.path.join(Config.CONVERSATIONS_DIR, USERS_DIR_NAME)
+    for root, _, files in os.walk(users_dir):
+        for filename in files:
+            if not filename.endswith(".jsonl"):
+                continue
+            user_id = filename[: -len(".jsonl")]
+            storage.replace_messages(user_id, load_file_conversation_history(user_id))
+            counts["conversations"] += 1
+
+    if os.path.isdir(Config.SESSIONS_DIR):
+        for filename in os.listdir(Config.SESSIONS_DIR):
+            if filename.startswith(".") or not filename.endswith(".json"):
+                continue
+            try:
+                with open(
+                    os.path.join(Config.SESSIONS_DIR, filename), "r", encoding="utf-8"
+                ) as f:
+                    session_data = json.load(f)
+                storage.save_session(
+                    filename,
+                    session_data["name"],
+                    session_data["timestamp"],
+                    session_data["messages"],
+                )
+                counts["sessions"] += 1
+            except (json.JSONDecodeError, KeyError) as e:
+                logger.warning("세션 파일 '%s' 가져오기 오류: %s", filename, e)
+
+    return counts
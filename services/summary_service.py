@@ -0,0 +1,133 @@
+"""
+대화 요약 서비스
+
+대화가 길어지면 최근 메시지를 제외한 이전 메시지를 누적 요약 하나로 접는다.
+요약은 대화 기록 옆에 저장되며, 요청 처리를 막지 않도록 백그라운드에서 갱신되어
+다음 요청부터 반영된다.
+
+요약 정보: {"content": 요약 내용, "upto": 마지막으로 요약에 포함된 메시지들의 지문}
+"""
+
+from typing import Dict, Any, List, Optional, Callable, Tuple
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import json
+import threading
+import logging
+from config import Config
+from services.conversation_service import (
+    load_conversation_history,
+    load_conversation_summary,
+    save_conversation_summary,
+)
+
+logger = logging.getLogger(__name__)
+
+# 요약 경계를 찾을 때 비교하는 메시지 수 (같은 내용의 짧은 메시지 오인 방지)
+FINGERPRINT_MESSAGES = 2
+
+_summary_executor = ThreadPoolExecutor(
+    max_workers=1, thread_name_prefix="conversation-summary"
+)
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+
+def fingerprint(messages: List[Dict[str, Any]]) -> str:
+    """메시지 목록의 role/content로 지문 생성"""
+    payload = json.dumps(
+        [[m["role"], m["content"]] for m in messages], ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def summarized_until(
+    history: List[Dict[str, Any]], summary: Optional[Dict[str, Any]]
+) -> int:
+    """history에서 요약에 포함된 메시지 수 반환
+
+    지문이 보이지 않으면 요약된 메시지가 이미 보관 범위 밖으로 밀려난 것이므로 0.
+    """
+    if not summary:
+        return 0
+    for end in range(len(history), 0, -1):
+        if _tail_fingerprint(history, end) == summary["upto"]:
+            return end
+    return 0
+
+
+def _tail_fingerprint(history: List[Dict[str, Any]], end: int) -> str:
+    """history[:end]의 마지막 FINGERPRINT_MESSAGES개 메시지 지문"""
+    return fingerprint(history[max(0, end - FINGERPRINT_MESSAGES) : end])
+
+
+def get_summary_context(
+    user_id: Optional[str], history: List[Dict[str, Any]]
+) -> Tuple[Optional[str], List[Dict[str, Any]]]:
+    """(요약 내용, 요약되지 않은 메시지 목록) 반환"""
+    summary = load_conversation_summary(user_id)
+    if not summary:
+        return None, history
+    return summary["content"], history[summarized_until(history, summary) :]
+
+
+def refresh_summary(
+    user_id: Optional[str],
+    history: List[Dict[str, Any]],
+    summarize: Callable[[Optional[str], List[Dict[str, Any]]], str] = None,
+) -> bool:
+    """최근 메시지를 제외한 요약되지 않은 메시지를 요약에 반영 (갱신 여부 반환)"""
+    if summarize is None:
+        from services.llm_service import summarize_conversation
+
+        summarize = summarize_conversation
+
+    summary = load_conversation_summary(user_id)
+    boundary = summarized_until(history, summary)
+    end = len(history) - Config.SUMMARY_KEEP_RECENT_MESSAGES
+    if end - boundary < Config.SUMMARY_BATCH_MESSAGES:
+        return False
+
+    folded = history[boundary:end]
+    content = summarize(summary["content"] if summary else None, folded)
+    new_summary = {"content": content, "upto": _tail_fingerprint(history, end)}
+
+    # 요약하는 동안 대화가 초기화되거나 교체되었으면 저장하지 않음
+    if summarized_until(load_conversation_history(user_id), new_summary) == 0:
+        return False
+    save_conversation_summary(new_summary, user_id)
+    logger.info("대화 요약 갱신 완료: %d개의 메시지 반영", len(folded))
+    return True
+
+
+def schedule_summary_refresh(
+    user_id: Optional[str],
+    history: List[Dict[str, Any]],
+    unsummarized_count: Optional[int] = None,
+    summarize=None,
+) -> bool:
+    """요약 갱신이 필요하면 백그라운드 작업으로 등록 (사용자별 하나씩만 실행)"""
+    if unsummarized_count is None:
+        unsummarized_count = len(history)
+    foldable = unsummarized_count - Config.SUMMARY_KEEP_RECENT_MESSAGES
+    if foldable < Config.SUMMARY_BATCH_MESSAGES:
+        return False
+
+    with _refreshing_lock:
+        if user_id in _refreshing:
+            return False
+        _refreshing.add(user_id)
+
+    snapshot = list(history)
+
+    def run():
+        try:
+            refresh_summary(user_id, snapshot, summarize)
+        except Exception as e:
+            logger.exception("대화 요약 갱신 중 오류 발생: %s", e)
+        finally:
+            with _refreshing_lock:
+                _refreshing.discard(user_id)
+
+    _summary_executor.submit(run)
+    return True
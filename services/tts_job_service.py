@@ -0,0 +1,133 @@
+"""
+음성 변환 백그라운드 작업 서비스
+"""
+
+from typing import Optional, Dict, Any, Callable, List
+import time
+import uuid
+import threading
+import contextvars
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from config import Config
+from services.tts_service import create_audio_playlist
+
+logger = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(
+    max_workers=Config.TTS_MAX_WORKERS, thread_name_prefix="tts"
+)
+_jobs: Dict[str, Dict[str, Any]] = {}
+_jobs_lock = threading.Lock()
+
+
+def _prune_jobs(now: float) -> None:
+    """보관 기간이 지난 완료 작업 제거 (잠금 상태에서 호출)"""
+    expired = [
+        job_id
+        for job_id, job in _jobs.items()
+        if job["status"] != "pending"
+        and now - job["finished_at"] > Config.TTS_JOB_TTL_SECONDS
+    ]
+    for job_id in expired:
+        del _jobs[job_id]
+
+
+def _record_segment(job_id: str, index: int, audio_url: Optional[str]) -> None:
+    """완료된 청크의 URL을 작업 재생 목록에 기록"""
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+        if job is None:
+            return
+        segments = job["segments"]
+        if index >= len(segments):
+            segments.extend([None] * (index + 1 - len(segments)))
+        segments[index] = audio_url
+
+
+def _run_job(
+    job_id: str,
+    text: str,
+    style_settings: Dict[str, Any],
+    synthesize: Callable[..., List[Optional[str]]],
+) -> None:
+    """작업 스레드에서 음성 변환을 실행하고 결과 기록"""
+    try:
+        playlist = synthesize(
+            text,
+            style_settings,
+            on_segment=lambda index, url: _record_segment(job_id, index, url),
+        )
+    except Exception as e:
+        logger.exception("음성 변환 작업 실패 (%s): %s", job_id, e)
+        playlist = []
+
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+        if job is not None:
+            job["segments"] = list(playlist)
+            job["status"] = "done" if playlist and all(playlist) else "failed"
+            job["finished_at"] = time.time()
+
+
+def submit_audio_job(
+    text: str,
+    style_settings: Dict[str, Any],
+    synthesize: Callable[..., List[Optional[str]]] = None,
+) -> Optional[str]:
+    """음성 변환 작업을 큐에 등록하고 작업 ID 반환 (큐가 가득 차면 None)"""
+    if synthesize is None:
+        synthesize = create_audio_playlist
+    if not text or not text.strip():
+        return None
+
+    now = time.time()
+    with _jobs_lock:
+        _prune_jobs(now)
+        pending = sum(1 for job in _jobs.values() if job["status"] == "pending")
+        if pending >= Config.TTS_MAX_PENDING_JOBS:
+            logger.warning("음성 변환 대기 작업이 너무 많습니다: %d개", pending)
+            return None
+
+        job_id = uuid.uuid4().hex
+        _jobs[job_id] = {
+            "status": "pending",
+            "segments": [],
+            "created_at": now,
+            "finished_at": None,
+        }
+
+    # 작업 스레드의 로그에도 요청 ID가 남도록 컨텍스트 복사
+    _executor.submit(
+        contextvars.copy_context().run,
+        _run_job,
+        job_id,
+        text,
+        style_settings,
+        synthesize,
+    )
+    return job_id
+
+
+def get_audio_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """작업 상태 반환
+
+    audio_urls에는 앞에서부터 연속으로 준비된 구간만 담기므로
+    클라이언트는 변환이 끝나기 전에도 순서대로 재생을 시작할 수 있다.
+    """
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+        if job is None:
+            return None
+
+        ready = []
+        for audio_url in job["segments"]:
+            if not audio_url:
+                break
+            ready.append(audio_url)
+
+        return {
+            "status": job["status"],
+            "audio_url": ready[0] if ready else None,
+            "audio_urls": ready,
+        }
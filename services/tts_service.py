@@ -2,93 +2,250 @@
 TTS(음성 변환) 서비스
 """
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Callable
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import os
+import re
+import json
 import uuid
-import traceback
+import hashlib
+import threading
+import contextvars
+import logging
 from navertts import NaverTTS
 from config import Config
+from services.logging_service import log_payload
+from services.metrics_service import record_upstream_error, timed
+
+logger = logging.getLogger(__name__)
+
+CACHE_FILE_PREFIX = "tts_"
+SENTENCE_PATTERN = re.compile(r"[^.!?\n]*(?:[.!?]+|\n|$)")
+
+# 여러 요청의 청크 변환이 공유하는 풀 (Naver TTS 동시 호출 수 상한)
+_chunk_executor = ThreadPoolExecutor(
+    max_workers=Config.TTS_CHUNK_WORKERS, thread_name_prefix="tts-chunk"
+)
+
+# 캐시 파일명 -> 파일 크기 (오래 사용되지 않은 순서)
+_cache_index: "OrderedDict[str, int]" = OrderedDict()
+_cache_index_loaded = False
+_cache_lock = threading.Lock()
+_cache_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+
+def make_cache_key(text: str, speaker: str, style_settings: Dict[str, Any]) -> str:
+    """정규화된 텍스트, 화자, 스타일로 캐시 키 생성"""
+    normalized = re.sub(r"\s+", " ", text).strip()
+    style = json.dumps(style_settings or {}, sort_keys=True, ensure_ascii=False)
+    payload = "\x00".join([normalized, speaker or "", style])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _load_cache_index() -> None:
+    """오디오 디렉토리를 한 번 스캔하여 캐시 인덱스 구성 (잠금 상태에서 호출)"""
+    global _cache_index_loaded
+    if _cache_index_loaded:
+        return
+    entries = []
+    if os.path.isdir(Config.AUDIO_DIR):
+        for entry in os.scandir(Config.AUDIO_DIR):
+            if entry.name.startswith(CACHE_FILE_PREFIX) and entry.name.endswith(".mp3"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.name, stat.st_size))
+    for _, name, size in sorted(entries):
+        _cache_index[name] = size
+    _cache_index_loaded = True
+
+
+def _lookup_cached_audio(filename: str) -> bool:
+    """캐시된 파일이 있으면 최근 사용으로 표시하고 True 반환"""
+    with _cache_lock:
+        _load_cache_index()
+        if filename in _cache_index:
+            if os.path.exists(os.path.join(Config.AUDIO_DIR, filename)):
+                _cache_index.move_to_end(filename)
+                _cache_stats["hits"] += 1
+                return True
+            del _cache_index[filename]
+        _cache_stats["misses"] += 1
+        return False
+
+
+def _register_cached_audio(filename: str, size: int) -> None:
+    """새 캐시 파일을 등록하고 최대 크기를 넘으면 오래된 파일부터 삭제"""
+    with _cache_lock:
+        _load_cache_index()
+        _cache_index[filename] = size
+        _cache_index.move_to_end(filename)
+
+        total = sum(_cache_index.values())
+        while total > Config.TTS_CACHE_MAX_BYTES and len(_cache_index) > 1:
+            old_name, old_size = _cache_index.popitem(last=False)
+            total -= old_size
+            try:
+                os.remove(os.path.join(Config.AUDIO_DIR, old_name))
+            except OSError:
+                pass
+            _cache_stats["evictions"] += 1
+
+
+def get_tts_cache_stats() -> Dict[str, int]:
+    """캐시 적중/실패/삭제 횟수와 현재 크기 반환"""
+    with _cache_lock:
+        _load_cache_index()
+        return {
+            **_cache_stats,
+            "files": len(_cache_index),
+            "bytes": sum(_cache_index.values()),
+        }
+
+
+def split_text(text: str, max_length: int = None) -> List[str]:
+    """텍스트를 문장 단위로 나누고 최대 길이 이하의 청크로 묶기"""
+    if max_length is None:
+        max_length = Config.TTS_CHUNK_LENGTH
+
+    sentences = []
+    for match in SENTENCE_PATTERN.finditer(text):
+        sentence = match.group().strip()
+        # 한 문장이 최대 길이를 넘으면 강제로 자름
+        while len(sentence) > max_length:
+            sentences.append(sentence[:max_length])
+            sentence = sentence[max_length:].strip()
+        if sentence:
+            sentences.append(sentence)
+
+    chunks = []
+    current = []
+    current_length = 0
+    for sentence in sentences:
+        if current and current_length + 1 + len(sentence) > max_length:
+            chunks.append(" ".join(current))
+            current = []
+            current_length = 0
+        current.append(sentence)
+        current_length += len(sentence) + (1 if current_length else 0)
+    if current:
+        chunks.append(" ".join(current))
+
+    return chunks
+
+
+def synthesize_chunk(chunk: str, style_settings: Dict[str, Any]) -> Optional[str]:
+    """텍스트 청크 하나를 mp3로 변환하고 URL 반환 (캐시 사용)"""
+    if not chunk or not chunk.strip():
+        return None
 
+    cache_key = make_cache_key(chunk, Config.NAVER_TTS_SPEAKER, style_settings)
+    audio_filename = f"{CACHE_FILE_PREFIX}{cache_key}.mp3"
+    audio_path = os.path.join(Config.AUDIO_DIR, audio_filename)
 
-def create_audio_response(text: str, style_settings: Dict[str, Any]) -> Optional[str]:
-    """텍스트를 mp3로 변환하고 파일 경로 반환"""
-    try:
-        print(f"\n=== 음성 변환 시작 ===")
-        print(f"입력 텍스트 길이: {len(text)} 문자")
-        print(f"스타일 설정: {style_settings}")
-
-        if not text or not text.strip():
-            print("텍스트가 비어있습니다.")
-            return None
-
-        def split_text(text: str, max_length: int = Config.MAX_TTS_LENGTH):
-            """텍스트를 적절한 크기로 분할"""
-            sentences = []
-            current_sentence = ""
-
-            for char in text:
-                current_sentence += char
-                if char in [".", "!", "?"] and current_sentence.strip():
-                    sentences.append(current_sentence.strip())
-                    current_sentence = ""
-
-            if current_sentence.strip():
-                sentences.append(current_sentence.strip())
+    if _lookup_cached_audio(audio_filename):
+        logger.debug("TTS 캐시 적중: %s", audio_filename)
+        return f"/static/audio/{audio_filename}"
 
-            full_text = " ".join(sentences)
-            if len(full_text) > max_length:
-                print(f"텍스트가 너무 깁니다. 처음 {max_length}자만 사용합니다.")
-                return [full_text[:max_length]]
-            return [full_text]
+    # 오디오 디렉토리 생성
+    os.makedirs(Config.AUDIO_DIR, exist_ok=True)
 
-        text_chunks = split_text(text)
-        print(f"텍스트가 {len(text_chunks)}개의 청크로 나뉘었습니다.")
+    # 같은 텍스트를 동시에 변환해도 완성된 파일만 보이도록 임시 파일에 저장 후 교체
+    temp_path = f"{audio_path}.{uuid.uuid4().hex}.tmp"
 
-        if not text_chunks:
-            print("텍스트 청크가 없습니다.")
+    try:
+        log_payload(logger, "TTS 변환 텍스트", chunk)
+
+        with timed("tts"):
+            tts = NaverTTS(chunk)
+            tts.save(temp_path)
+
+        if os.path.exists(temp_path):
+            os.replace(temp_path, audio_path)
+            file_size = os.path.getsize(audio_path)
+            logger.debug("TTS 파일 생성 성공: %s (%d bytes)", audio_filename, file_size)
+            _register_cached_audio(audio_filename, file_size)
+            return f"/static/audio/{audio_filename}"
+        else:
+            logger.warning("TTS 파일이 생성되지 않았습니다: %s", audio_path)
             return None
 
-        # 첫 번째 청크 내용 출력 (디버깅용)
-        print(f"\n첫 번째 청크 내용 (처음 100자):")
-        print(text_chunks[0][:100])
-        print(f"첫 번째 청크 길이: {len(text_chunks[0])} 문자")
-
-        audio_filename = f"response_{uuid.uuid4()}.mp3"
-        audio_path = os.path.join(Config.AUDIO_DIR, audio_filename)
+    except Exception as e:
+        record_upstream_error("naver_tts", e)
+        logger.exception("TTS 생성 실패: %s: %s", type(e).__name__, e)
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        return None
 
-        # 오디오 디렉토리 생성
-        os.makedirs(Config.AUDIO_DIR, exist_ok=True)
 
+def create_audio_playlist(
+    text: str,
+    style_settings: Dict[str, Any],
+    on_segment: Callable[[int, Optional[str]], None] = None,
+) -> List[Optional[str]]:
+    """텍스트를 청크별로 병렬 변환하여 순서대로 정렬된 URL 목록 반환
+
+    on_segment(index, url)는 각 청크가 완료되는 즉시 호출되므로
+    앞 구간을 뒤 구간 변환이 끝나기 전에 재생할 수 있다.
+    """
+    if not text or not text.strip():
+        logger.debug("음성 변환할 텍스트가 비어있습니다.")
+        return []
+
+    chunks = split_text(text)
+    logger.debug(
+        "음성 변환 시작: %d자, %d개 청크, 스타일 %s",
+        len(text),
+        len(chunks),
+        style_settings,
+    )
+
+    playlist: List[Optional[str]] = [None] * len(chunks)
+    futures = {
+        # 작업 스레드의 로그에도 요청 ID가 남도록 컨텍스트 복사
+        _chunk_executor.submit(
+            contextvars.copy_context().run, synthesize_chunk, chunk, style_settings
+        ): index
+        for index, chunk in enumerate(chunks)
+    }
+    for future in as_completed(futures):
+        index = futures[future]
         try:
-            first_chunk = text_chunks[0]
-            if not first_chunk or not first_chunk.strip():
-                print("첫 번째 청크가 비어있습니다.")
-                return None
+            playlist[index] = future.result()
+        except Exception as e:
+            logger.exception("청크 %d 음성 변환 중 예외 발생: %s", index, e)
+        if on_segment is not None:
+            on_segment(index, playlist[index])
+
+    return playlist
 
-            print("\n=== TTS 변환 시도 ===")
-            print(f"변환할 텍스트 (처음 100자): {first_chunk[:100]}")
 
-            tts = NaverTTS(first_chunk)
-            tts.save(audio_path)
+def get_cached_playlist(
+    text: str, style_settings: Dict[str, Any]
+) -> Optional[List[str]]:
+    """모든 청크의 음성 파일이 캐시에 있으면 URL 목록 반환 (하나라도 없으면 None)"""
+    if not text or not text.strip():
+        return None
 
-            if os.path.exists(audio_path):
-                file_size = os.path.getsize(audio_path)
-                print(f"TTS 파일 생성 성공: {audio_path} (크기: {file_size} bytes)")
-                return f"/static/audio/{audio_filename}"
-            else:
-                print(f"TTS 파일이 생성되지 않았습니다: {audio_path}")
+    playlist = []
+    with _cache_lock:
+        _load_cache_index()
+        for chunk in split_text(text):
+            cache_key = make_cache_key(chunk, Config.NAVER_TTS_SPEAKER, style_settings)
+            audio_filename = f"{CACHE_FILE_PREFIX}{cache_key}.mp3"
+            if audio_filename not in _cache_index or not os.path.exists(
+                os.path.join(Config.AUDIO_DIR, audio_filename)
+            ):
                 return None
+            _cache_index.move_to_end(audio_filename)
+            playlist.append(f"/static/audio/{audio_filename}")
+    return playlist
 
-        except Exception as e:
-            print(f"\nTTS 생성 실패:")
-            print(f"에러 타입: {type(e).__name__}")
-            print(f"에러 메시지: {str(e)}")
-            traceback.print_exc()
-            return None
 
+def create_audio_response(text: str, style_settings: Dict[str, Any]) -> Optional[str]:
+    """텍스트를 mp3로 변환하고 첫 번째 구간의 파일 경로 반환"""
+    try:
+        playlist = create_audio_playlist(text, style_settings)
+        return playlist[0] if playlist else None
     except Exception as e:
-        print(f"\n음성 변환 중 예외 발생:")
-        print(f"에러 타입: {type(e).__name__}")
-        print(f"에러 메시지: {str(e)}")
-        traceback.print_exc()
+        logger.exception("음성 변환 중 예외 발생: %s: %s", type(e).__name__, e)
         return None
@@ -0,0 +1,36 @@
+"""
+WSGI 앱을 스레드 풀에서 실행하는 ASGI 어댑터
+
+asgiref의 WsgiToAsgi는 요청을 thread_sensitive=True로 처리해 모든 WSGI 요청이
+스레드 하나에서 차례로 실행된다. 느린 요청 하나가 다른 경로를 모두 막지 않도록
+크기가 정해진 스레드 풀에서 요청마다 따로 실행한다.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from asgiref.sync import sync_to_async
+from asgiref.wsgi import WsgiToAsgi, WsgiToAsgiInstance
+
+# asgiref가 sync_to_async로 감싸기 전의 원래 함수
+_run_wsgi_app = WsgiToAsgiInstance.__dict__["run_wsgi_app"].func
+
+
+class ThreadPoolWsgiToAsgi(WsgiToAsgi):
+    """스레드 풀에서 WSGI 앱을 실행하는 WsgiToAsgi"""
+
+    def __init__(self, wsgi_application, max_workers: int):
+        super().__init__(wsgi_application)
+        self.executor = ThreadPoolExecutor(max_workers, thread_name_prefix="wsgi")
+
+    async def __call__(self, scope, receive, send):
+        instance = WsgiToAsgiInstance(self.wsgi_application)
+        # 요청 본문 수신과 응답 전송은 그대로 두고 WSGI 앱 실행만 스레드 풀로 보냄
+        instance.run_wsgi_app = sync_to_async(
+            _run_wsgi_app.__get__(instance),
+            thread_sensitive=False,
+            executor=self.executor,
+        )
+        await instance(scope, receive, send)
+
+    def shutdown(self) -> None:
+        """스레드 풀 종료"""
+        self.executor.shutdown(wait=False)
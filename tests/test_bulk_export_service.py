@@ -0,0 +1,81 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import zipfile
+from unittest import mock
+from config import Config
+from services.bulk_export_service import (
+    generate_sessions_zip,
+    resolve_session_filenames,
+)
+from services.session_service import save_session, delete_session
+
+
+class TestBulkExportService(unittest.TestCase):
+    def setUp(self):
+        self.original_sessions_dir = Config.SESSIONS_DIR
+        Config.SESSIONS_DIR = tempfile.mkdtemp()
+        self.filenames = [
+            save_session(
+                [
+                    {"role": "user", "content": f"질문 {i}"},
+                    {"role": "assistant", "content": f"답변 {i}"},
+                ],
+                f"bulk{i}",
+            )
+            for i in range(3)
+        ]
+
+    def tearDown(self):
+        shutil.rmtree(Config.SESSIONS_DIR, ignore_errors=True)
+        Config.SESSIONS_DIR = self.original_sessions_dir
+
+    def read_zip(self, chunks):
+        return zipfile.ZipFile(io.BytesIO(b"".join(chunks)))
+
+    def test_all_sessions_in_all_formats(self):
+        filenames = resolve_session_filenames()
+        self.assertEqual(sorted(filenames), sorted(self.filenames))
+
+        with mock.patch.object(Config, "BULK_EXPORT_PREFETCH", 2):
+            archive = self.read_zip(
+                generate_sessions_zip(filenames, ["txt", "pdf", "json"])
+            )
+        names = archive.namelist()
+        self.assertEqual(len(names), 9)
+        # 요청한 세션 순서대로 추가
+        self.assertEqual(
+            [n for n in names if n.endswith(".txt")],
+            [os.path.splitext(f)[0] + ".txt" for f in filenames],
+        )
+
+        stem = os.path.splitext(self.filenames[1])[0]
+        self.assertIn("답변 1", archive.read(f"{stem}.txt").decode("utf-8"))
+        self.assertTrue(archive.read(f"{stem}.pdf").startswith(b"%PDF"))
+        self.assertEqual(json.loads(archive.read(f"{stem}.json"))["name"], "bulk1")
+
+    def test_selected_sessions(self):
+        selected = resolve_session_filenames([self.filenames[0], self.filenames[0]])
+        archive = self.read_zip(generate_sessions_zip(selected, "txt"))
+        self.assertEqual(
+            archive.namelist(), [os.path.splitext(self.filenames[0])[0] + ".txt"]
+        )
+
+    def test_rejects_unknown_session_and_format(self):
+        with self.assertRaises(ValueError):
+            resolve_session_filenames(["../config.py"])
+        with self.assertRaises(ValueError):
+            generate_sessions_zip(self.filenames, ["docx"])
+
+    def test_session_deleted_during_export_is_skipped(self):
+        filenames = resolve_session_filenames()
+        delete_session(self.filenames[0])
+        archive = self.read_zip(generate_sessions_zip(filenames, ["json"]))
+        self.assertEqual(len(archive.namelist()), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+from unittest import mock
+from services import context_service
+from services.context_service import (
+    build_context_messages,
+    count_tokens,
+    message_tokens,
+    MESSAGE_OVERHEAD_TOKENS,
+)
+
+
+class TestContextService(unittest.TestCase):
+    def test_count_tokens_grows_with_text(self):
+        self.assertEqual(count_tokens(""), 0)
+        self.assertLess(count_tokens("안녕"), count_tokens("안녕하세요 반갑습니다"))
+
+    def test_message_tokens_cached_on_message(self):
+        message = {"role": "user", "content": "안녕하세요"}
+        count = message_tokens(message)
+        self.assertEqual(message["token_count"]["count"], count)
+        with mock.patch.object(context_service, "count_tokens") as counter:
+            self.assertEqual(message_tokens(message), count)
+            counter.assert_not_called()
+
+    def test_cache_ignored_for_other_tokenizer(self):
+        message = {
+            "role": "user",
+            "content": "안녕",
+            "token_count": {"tokenizer": "other", "count": 999},
+        }
+        self.assertNotEqual(message_tokens(message), 999)
+
+    def test_newest_messages_packed_into_budget(self):
+        history = [
+            {"role": "user", "content": "오래된 " * 200},
+            {"role": "assistant", "content": "짧은 답"},
+            {"role": "user", "content": "질문"},
+            {"role": "assistant", "content": "답변"},
+        ]
+        fixed = message_tokens({"role": "system", "content": "시스템"})
+        fixed += message_tokens({"role": "user", "content": "새 질문"})
+        recent = sum(message_tokens(m) for m in history[1:])
+
+        messages = build_context_messages(
+            "시스템", history, "새 질문", token_budget=fixed + recent
+        )
+        self.assertEqual(messages[0], {"role": "system", "content": "시스템"})
+        self.assertEqual(messages[-1], {"role": "user", "content": "새 질문"})
+        self.assertEqual(
+            [m["content"] for m in messages[1:-1]], ["짧은 답", "질문", "답변"]
+        )
+        self.assertNotIn("token_count", messages[1])
+
+    def test_no_history_when_budget_exhausted(self):
+        history = [{"role": "user", "content": "이전 질문"}]
+        messages = build_context_messages(
+            "시스템", history, "새 질문", token_budget=MESSAGE_OVERHEAD_TOKENS
+        )
+        self.assertEqual(len(messages), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,50 @@
+import json
+import os
+import time
+import shutil
+import tempfile
 import unittest
+import multiprocessing
+from collections import OrderedDict
+from unittest import mock
+import services.conversation_service as conversation_service
+from services import file_lock_service
 from services.conversation_service import (
     save_conversation_history,
     load_conversation_history,
+    append_conversation_message,
+    clear_conversation_history,
 )
+from config import Config
 
 
-class TestConversationService(unittest.TestCase):
+def append_messages(prefix, count):
+    """다른 워커 프로세스처럼 같은 로그에 메시지 추가"""
+    for i in range(count):
+        append_conversation_message({"role": "user", "content": f"{prefix}-{i}"})
+
+
+class TestConversationLog(unittest.TestCase):
+    def setUp(self):
+        self.original_dir = Config.CONVERSATIONS_DIR
+        Config.CONVERSATIONS_DIR = tempfile.mkdtemp()
+        self.state_patch = mock.patch.object(
+            conversation_service, "_log_states", OrderedDict()
+        )
+        self.state_patch.start()
+        self.log_path = os.path.join(
+            Config.CONVERSATIONS_DIR, conversation_service.CONVERSATION_LOG_NAME
+        )
+
+    def tearDown(self):
+        self.state_patch.stop()
+        shutil.rmtree(Config.CONVERSATIONS_DIR)
+        Config.CONVERSATIONS_DIR = self.original_dir
+
+    def count_lines(self):
+        with open(self.log_path, encoding="utf-8") as f:
+            return sum(1 for _ in f)
+
     def test_save_and_load(self):
         test_history = [
             {"role": "user", "content": "안녕"},
@@ -15,6 +54,100 @@ class TestConversationService(unittest.TestCase):
         loaded = load_conversation_history()
         self.assertEqual(loaded, test_history)
 
+    def test_append_writes_one_line_per_message(self):
+        append_conversation_message({"role": "user", "content": "첫 번째"})
+        append_conversation_message({"role": "assistant", "content": "두 번째"})
+        self.assertEqual(self.count_lines(), 2)
+        self.assertEqual(
+            [m["content"] for m in load_conversation_history()], ["첫 번째", "두 번째"]
+        )
+
+    def test_clear(self):
+        append_conversation_message({"role": "user", "content": "안녕"})
+        clear_conversation_history()
+        self.assertEqual(load_conversation_history(), [])
+
+    def test_truncated_last_line_is_ignored(self):
+        append_conversation_message({"role": "user", "content": "안녕"})
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write('{"op": "append", "mess')
+        self.assertEqual(
+            load_conversation_history(), [{"role": "user", "content": "안녕"}]
+        )
+
+    def test_compaction_keeps_recent_messages(self):
+        with mock.patch.object(
+            Config, "CONVERSATION_LOG_COMPACT_LINES", 30
+        ), mock.patch.object(Config, "MAX_CONTEXT_MESSAGES", 20):
+            for i in range(31):
+                append_conversation_message({"role": "user", "content": str(i)})
+            self.assertEqual(self.count_lines(), 20)
+        history = load_conversation_history()
+        self.assertEqual(history[-1]["content"], "30")
+
+    def test_deferred_fsync_is_flushed_by_timer(self):
+        with mock.patch.object(
+            Config, "CONVERSATION_FSYNC_INTERVAL_SECONDS", 0.05
+        ), mock.patch.object(Config, "CONVERSATION_FSYNC_BATCH", 100):
+            append_conversation_message({"role": "user", "content": "첫 번째"})
+            append_conversation_message({"role": "user", "content": "두 번째"})
+            state = conversation_service._log_states[self.log_path]
+            self.assertEqual(state["unsynced"], 1)
+
+            deadline = time.time() + 2
+            while state["unsynced"] and time.time() < deadline:
+                time.sleep(0.01)
+        self.assertEqual(state["unsynced"], 0)
+
+    @unittest.skipIf(file_lock_service.fcntl is None, "프로세스 간 잠금 미지원")
+    def test_processes_do_not_lose_messages_during_compaction(self):
+        with mock.patch.object(
+            Config, "CONVERSATION_LOG_COMPACT_LINES", 20
+        ), mock.patch.object(Config, "MAX_CONTEXT_MESSAGES", 1000):
+            context = multiprocessing.get_context("fork")
+            workers = [
+                context.Process(target=append_messages, args=(f"p{i}", 50))
+                for i in range(4)
+            ]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            history = load_conversation_history()
+        self.assertEqual(len(history), 200)
+
+    def test_migrates_legacy_json_file(self):
+        legacy = [{"role": "user", "content": "예전 대화"}]
+        legacy_path = os.path.join(
+            Config.CONVERSATIONS_DIR,
+            conversation_service.LEGACY_CONVERSATION_FILE_NAME,
+        )
+        with open(legacy_path, "w", encoding="utf-8") as f:
+            json.dump(legacy, f, ensure_ascii=False)
+        self.assertEqual(load_conversation_history(), legacy)
+        self.assertTrue(os.path.exists(self.log_path))
+
+    def test_users_have_separate_logs(self):
+        append_conversation_message({"role": "user", "content": "A"}, "abcdef01")
+        append_conversation_message({"role": "user", "content": "B"}, "12345678")
+        self.assertEqual(
+            load_conversation_history("abcdef01"), [{"role": "user", "content": "A"}]
+        )
+        clear_conversation_history("12345678")
+        self.assertEqual(load_conversation_history("12345678"), [])
+        self.assertTrue(
+            os.path.exists(
+                os.path.join(
+                    Config.CONVERSATIONS_DIR, "users", "ab", "cd", "abcdef01.jsonl"
+                )
+            )
+        )
+        self.assertFalse(os.path.exists(self.log_path))
+
+    def test_rejects_unsafe_user_id(self):
+        with self.assertRaises(ValueError):
+            conversation_service._conversation_log_path("../escape")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,52 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from services import file_lock_service
+from services.file_lock_service import ReentrantFileLock, wait_lock
+
+
+class TestFileLockService(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.lock_path = os.path.join(self.temp_dir, "locks", "test.lock")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    @unittest.skipIf(file_lock_service.fcntl is None, "프로세스 간 잠금 미지원")
+    def test_wait_lock_waits_until_released(self):
+        held = wait_lock(self.lock_path)
+        acquired = threading.Event()
+
+        def other_thread():
+            wait_lock(self.lock_path).close()
+            acquired.set()
+
+        thread = threading.Thread(target=other_thread)
+        thread.start()
+        self.assertFalse(acquired.wait(0.1))
+        held.close()
+        thread.join(2)
+        self.assertTrue(acquired.is_set())
+
+    def test_reentrant_lock(self):
+        lock = ReentrantFileLock(lambda: self.lock_path)
+        entered = threading.Event()
+
+        def other_thread():
+            with lock:
+                entered.set()
+
+        with lock:
+            with lock:  # 같은 스레드에서 다시 잡아도 멈추지 않음
+                thread = threading.Thread(target=other_thread)
+                thread.start()
+                self.assertFalse(entered.wait(0.1))
+        thread.join(2)
+        self.assertTrue(entered.is_set())
+
+
+if __name__ == "__main__":
+    unittest.main()
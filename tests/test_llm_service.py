@@ -0,0 +1,166 @@
+import asyncio
+import time
+import unittest
+from unittest.mock import patch
+from openai import AsyncOpenAI, OpenAI
+from config import Config
+from benchmarks.fake_servers import FakeOpenAIServer
+from services.llm_service import ResilientChatClient
+from services.resilience_service import (
+    CircuitBreaker,
+    CircuitOpenError,
+    DeadlineExceededError,
+)
+
+MESSAGES = [{"role": "user", "content": "안녕"}]
+
+
+class TestResilientChatClient(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeOpenAIServer().start()
+        patcher = patch.multiple(
+            Config,
+            OPENAI_RETRY_BASE_DELAY_SECONDS=0.01,
+            OPENAI_RETRY_MAX_DELAY_SECONDS=0.02,
+            CIRCUIT_FAILURE_THRESHOLD=2,
+            CIRCUIT_RESET_SECONDS=60,
+            OPENAI_HEDGE_MIN_SAMPLES=3,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.server.stop()
+
+    def make_client(self, **kwargs):
+        options = {"api_key": "test", "base_url": self.server.base_url}
+        client = OpenAI(max_retries=0, **options)
+        async_factory = lambda: AsyncOpenAI(max_retries=0, **options)
+        kwargs.setdefault("model", "primary")
+        kwargs.setdefault("fallback_model", "")
+        kwargs.setdefault("hedge", False)
+        return ResilientChatClient(client, async_factory, **kwargs)
+
+    def test_retries_server_error(self):
+        self.server.push(status=500)
+        self.server.push(content="재시도 성공")
+        chat = self.make_client(max_retries=2)
+
+        self.assertEqual(chat.complete(MESSAGES), "재시도 성공")
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_client_error_is_not_retried(self):
+        self.server.push(status=400)
+        chat = self.make_client(max_retries=2)
+
+        with self.assertRaises(Exception):
+            chat.complete(MESSAGES)
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertEqual(chat.breaker("primary").state, "closed")
+
+    def test_client_error_does_not_close_half_open_circuit(self):
+        chat = self.make_client()
+        breaker = chat.breaker("primary")
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker.reset_seconds = 0
+
+        self.server.push(status=400)
+        with self.assertRaises(Exception):
+            chat.complete(MESSAGES)
+        self.assertEqual(breaker.state, "half_open")
+        self.assertTrue(breaker.allow())  # 다음 요청이 다시 시험 호출
+
+    def test_deadline_exceeded_counts_as_failure(self):
+        chat = self.make_client()
+        for _ in range(2):
+            with self.assertRaises(DeadlineExceededError):
+                chat._on_failure(
+                    "primary", DeadlineExceededError(), 0, time.monotonic()
+                )
+        self.assertEqual(chat.breaker("primary").state, "open")
+
+    def test_timeout_is_retried(self):
+        self.server.push(delay=0.5)
+        self.server.push(content="두 번째 응답")
+        chat = self.make_client(timeout=0.2, max_retries=1)
+
+        self.assertEqual(chat.complete(MESSAGES), "두 번째 응답")
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_open_circuit_uses_fallback_model(self):
+        for _ in range(2):
+            self.server.push(status=503)
+        chat = self.make_client(max_retries=1, fallback_model="cheap")
+
+        with self.assertRaises(Exception):
+            chat.complete(MESSAGES)
+        self.assertEqual(chat.breaker("primary").state, "open")
+
+        self.assertEqual(chat.complete(MESSAGES), "기본 응답")
+        self.assertEqual(self.server.requests[-1]["model"], "cheap")
+
+    def test_open_circuit_fails_fast_without_fallback(self):
+        for _ in range(2):
+            self.server.push(status=503)
+        chat = self.make_client(max_retries=1)
+        with self.assertRaises(Exception):
+            chat.complete(MESSAGES)
+
+        with self.assertRaises(CircuitOpenError):
+            chat.complete(MESSAGES)
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_slow_request_is_hedged(self):
+        chat = self.make_client(hedge=True)
+        for _ in range(3):
+            chat.latencies.record(0.05)
+        self.server.push(delay=1.0, content="느린 응답")
+        self.server.push(content="헤지 응답")
+
+        started = time.monotonic()
+        self.assertEqual(chat.complete(MESSAGES), "헤지 응답")
+        self.assertLess(time.monotonic() - started, 0.8)
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_stream_retries_before_first_token(self):
+        self.server.push(status=502)
+        self.server.push(content="스트리밍 응답 입니다")
+        chat = self.make_client(max_retries=1)
+
+        tokens = list(chat.stream(MESSAGES))
+        self.assertEqual("".join(tokens).strip(), "스트리밍 응답 입니다")
+        self.assertTrue(self.server.requests[-1]["stream"])
+
+    def test_async_retry_and_hedge(self):
+        self.server.push(status=429)
+        self.server.push(content="비동기 응답")
+        chat = self.make_client(max_retries=1, hedge=True)
+        for _ in range(3):
+            chat.latencies.record(0.05)
+
+        async def run():
+            answer = await chat.acomplete(MESSAGES)
+            tokens = [token async for token in chat.astream(MESSAGES)]
+            return answer, "".join(tokens)
+
+        answer, streamed = asyncio.run(run())
+        self.assertEqual(answer, "비동기 응답")
+        self.assertEqual(streamed.strip(), "기본 응답")
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_half_open_allows_single_probe(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0)
+        breaker.record_failure()
+        self.assertEqual(breaker.state, "open")
+
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())
+        breaker.record_success()
+        self.assertEqual(breaker.state, "closed")
+        self.assertTrue(breaker.allow())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+import requests
+from benchmarks.fake_servers import FakeNaverTTSServer
+from benchmarks.load_test import compare, percentile, summarize
+
+
+def make_report(p95_ms, rps, errors=0):
+    return {
+        "results": {
+            "ask": {"p50_ms": p95_ms, "p95_ms": p95_ms, "rps": rps, "errors": errors}
+        }
+    }
+
+
+class TestLoadTest(unittest.TestCase):
+    def test_percentile_nearest_rank(self):
+        values = [float(i) for i in range(1, 101)]
+        self.assertEqual(percentile(values, 50), 50.0)
+        self.assertEqual(percentile(values, 99), 99.0)
+        self.assertEqual(percentile([0.3], 95), 0.3)
+        self.assertEqual(percentile([], 95), 0.0)
+
+    def test_summarize(self):
+        result = summarize([0.2, 0.1, 0.4, 0.3], errors=1, elapsed=2.0)
+        self.assertEqual(result["requests"], 4)
+        self.assertEqual(result["errors"], 1)
+        self.assertEqual(result["p50_ms"], 200.0)
+        self.assertEqual(result["p99_ms"], 400.0)
+        self.assertEqual(result["rps"], 2.0)
+
+    def test_compare_reports_regressions(self):
+        baseline = make_report(200.0, 30.0)
+        self.assertEqual(compare(baseline, make_report(230.0, 28.0), 0.25, 20), [])
+
+        regressions = compare(baseline, make_report(300.0, 20.0, errors=2), 0.25, 20)
+        self.assertEqual(len(regressions), 3)
+        self.assertTrue(regressions[0].startswith("ask: p95"))
+
+    def test_compare_ignores_small_absolute_changes(self):
+        baseline = make_report(10.0, 300.0)
+        self.assertEqual(compare(baseline, make_report(16.0, 200.0), 0.25, 20), [])
+
+    def test_fake_tts_server_returns_audio(self):
+        server = FakeNaverTTSServer(bytes_per_char=10).start()
+        try:
+            url = server.endpoint.format(tld="com")
+            response = requests.get(url, params={"text": "안녕하세요"}, timeout=5)
+        finally:
+            server.stop()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content.startswith(b"ID3"))
+        self.assertEqual(len(response.content), 3 + 5 * 10)
+        self.assertEqual(server.requests, [{"text": "안녕하세요"}])
+
+
+if __name__ == "__main__":
+    unittest.main()
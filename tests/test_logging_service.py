@@ -0,0 +1,108 @@
+import json
+import queue
+import logging
+import unittest
+from unittest import mock
+from config import Config
+from services import logging_service
+from services.logging_service import (
+    JsonFormatter,
+    NonBlockingQueueHandler,
+    RequestIdFilter,
+    bind_request_id,
+    get_request_id,
+    log_payload,
+    reset_request_id,
+)
+
+
+def make_record(message, *args, exc_info=None):
+    return logging.LogRecord(
+        "test", logging.ERROR, __file__, 1, message, args, exc_info
+    )
+
+
+class TestLoggingService(unittest.TestCase):
+    def test_json_formatter_includes_request_id(self):
+        token = bind_request_id("abc123")
+        try:
+            record = make_record("저장 완료: %d개", 3)
+            RequestIdFilter().filter(record)
+        finally:
+            reset_request_id(token)
+
+        entry = json.loads(JsonFormatter().format(record))
+        self.assertEqual(entry["message"], "저장 완료: 3개")
+        self.assertEqual(entry["request_id"], "abc123")
+        self.assertEqual(entry["level"], "ERROR")
+        self.assertEqual(get_request_id(), "-")
+
+    def test_queue_handler_formats_exception_in_caller(self):
+        handler = NonBlockingQueueHandler(queue.Queue())
+        try:
+            raise ValueError("실패")
+        except ValueError:
+            import sys
+
+            record = make_record("오류", exc_info=sys.exc_info())
+        handler.handle(record)
+
+        queued = handler.queue.get_nowait()
+        self.assertIsNone(queued.exc_info)
+        self.assertIn("ValueError: 실패", queued.exc_text)
+        self.assertIn(
+            "ValueError", json.loads(JsonFormatter().format(queued))["exception"]
+        )
+
+    def test_full_queue_drops_records(self):
+        handler = NonBlockingQueueHandler(queue.Queue(maxsize=1))
+        dropped = logging_service.dropped_log_count()
+        handler.handle(make_record("첫 번째"))
+        handler.handle(make_record("두 번째"))
+
+        self.assertEqual(handler.queue.qsize(), 1)
+        self.assertEqual(logging_service.dropped_log_count(), dropped + 1)
+
+    def test_log_payload_is_sampled_and_truncated(self):
+        logger = logging.getLogger("test_payload")
+        logger.setLevel(logging.DEBUG)
+        with mock.patch.object(Config, "LOG_PAYLOAD_MAX_CHARS", 5):
+            with mock.patch.object(Config, "LOG_PAYLOAD_SAMPLE_RATE", 1.0):
+                with self.assertLogs(logger, "DEBUG") as logs:
+                    log_payload(logger, "AI 응답", "가나다라마바사")
+            with mock.patch.object(Config, "LOG_PAYLOAD_SAMPLE_RATE", 0.0):
+                with mock.patch.object(logger, "debug") as debug:
+                    log_payload(logger, "AI 응답", "가나다라마바사")
+
+        self.assertIn("AI 응답: 가나다라마... (7자)", logs.output[0])
+        debug.assert_not_called()
+
+    def test_log_payload_sampling_is_decided_once_per_request(self):
+        logger = logging.getLogger("test_payload_request")
+        logger.setLevel(logging.DEBUG)
+        with mock.patch.object(Config, "LOG_PAYLOAD_SAMPLE_RATE", 0.5), mock.patch(
+            "services.logging_service.random.random", side_effect=[0.4, 0.9]
+        ) as draw:
+            token = bind_request_id("sampled")
+            try:
+                with self.assertLogs(logger, "DEBUG") as logs:
+                    log_payload(logger, "프롬프트", "질문")
+                    log_payload(logger, "AI 응답", "답변")
+            finally:
+                reset_request_id(token)
+
+            token = bind_request_id("skipped")
+            try:
+                with mock.patch.object(logger, "debug") as debug:
+                    log_payload(logger, "프롬프트", "질문")
+                    log_payload(logger, "AI 응답", "답변")
+            finally:
+                reset_request_id(token)
+
+        self.assertEqual(len(logs.output), 2)
+        debug.assert_not_called()
+        self.assertEqual(draw.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import threading
+import unittest
+from unittest import mock
+from config import Config
+from services.metrics_service import (
+    Counter,
+    Histogram,
+    begin_trace,
+    end_trace,
+    render_metrics,
+    timed,
+)
+
+
+class TestMetricsService(unittest.TestCase):
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = Histogram("test_seconds", "test", ("stage",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.5, 5.0):
+            histogram.observe(value, "llm")
+
+        lines = histogram.render()
+        self.assertIn('test_seconds_bucket{stage="llm",le="0.1"} 1', lines)
+        self.assertIn('test_seconds_bucket{stage="llm",le="1"} 3', lines)
+        self.assertIn('test_seconds_bucket{stage="llm",le="+Inf"} 4', lines)
+        self.assertIn('test_seconds_sum{stage="llm"} 6.05', lines)
+        self.assertIn('test_seconds_count{stage="llm"} 4', lines)
+
+    def test_counter_escapes_labels(self):
+        counter = Counter("test_total", "test", ("error",))
+        counter.inc('a"b')
+        counter.inc('a"b')
+        self.assertIn('test_total{error="a\\"b"} 2', counter.render())
+
+    def test_timed_records_stage_and_errors(self):
+        @timed("test_stage")
+        def work(fail):
+            if fail:
+                raise ValueError("실패")
+
+        threads = [threading.Thread(target=work, args=(False,)) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        with self.assertRaises(ValueError):
+            work(True)
+
+        text = render_metrics()
+        self.assertIn(
+            'assistant_stage_duration_seconds_count{stage="test_stage"} 5', text
+        )
+        self.assertIn('assistant_stage_errors_total{stage="test_stage"} 1', text)
+
+    def test_trace_collects_spans(self):
+        with mock.patch.object(Config, "TRACE_REQUESTS", False):
+            self.assertIsNone(begin_trace("GET /"))
+
+        with mock.patch.object(Config, "TRACE_REQUESTS", True):
+            trace = begin_trace("POST /ask")
+            with timed("llm"):
+                pass
+            with self.assertLogs("services.metrics_service", "INFO") as logs:
+                end_trace(trace, 200)
+
+        self.assertEqual([span["stage"] for span in trace["spans"]], ["llm"])
+        self.assertIn('"name": "POST /ask"', logs.output[0])
+        # 추적이 끝난 뒤의 단계는 기록하지 않음
+        with timed("llm"):
+            pass
+        self.assertEqual(len(trace["spans"]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,230 @@
+import os
+import json
+import time
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from config import Config
+from services.notification_service import NotificationScheduler, public_notification
+
+
+class TestNotificationService(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.log_path = os.path.join(self.temp_dir, "notifications.jsonl")
+        self.schedulers = []
+
+    def tearDown(self):
+        for scheduler in self.schedulers:
+            scheduler.stop()
+        shutil.rmtree(self.temp_dir)
+
+    def make_scheduler(self, start=True):
+        scheduler = NotificationScheduler(self.log_path)
+        self.schedulers.append(scheduler)
+        return scheduler.start() if start else scheduler
+
+    def read_log(self):
+        with open(self.log_path, "r", encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    def test_fires_in_due_order(self):
+        scheduler = self.make_scheduler()
+        subscriber = scheduler.subscribe("user")
+        scheduler.schedule("user", "두 번째", 0.2)
+        scheduler.schedule("user", "첫 번째", 0.05)
+
+        first = subscriber.get(timeout=2)
+        second = subscriber.get(timeout=2)
+        self.assertEqual(first["message"], "첫 번째")
+        self.assertEqual(second["message"], "두 번째")
+        self.assertGreaterEqual(time.time(), second["due_at"])
+        self.assertEqual(scheduler.stats()["pending"], 0)
+
+    def test_cancel(self):
+        scheduler = self.make_scheduler()
+        subscriber = scheduler.subscribe("user")
+        cancelled = scheduler.schedule("user", "취소됨", 0.05)
+        scheduler.schedule("user", "발송됨", 0.1)
+
+        self.assertFalse(scheduler.cancel("other", cancelled["id"]))
+        self.assertTrue(scheduler.cancel("user", cancelled["id"]))
+        self.assertFalse(scheduler.cancel("user", cancelled["id"]))
+
+        self.assertEqual(subscriber.get(timeout=2)["message"], "발송됨")
+        self.assertTrue(subscriber.empty())
+
+    def test_list_pending_is_per_user(self):
+        scheduler = self.make_scheduler(start=False)
+        scheduler.schedule("user", "나중", 60)
+        scheduler.schedule("user", "먼저", 30)
+        scheduler.schedule("other", "다른 사용자", 10)
+
+        messages = [n["message"] for n in scheduler.list_pending("user")]
+        self.assertEqual(messages, ["먼저", "나중"])
+        self.assertEqual(scheduler.list_pending("nobody"), [])
+
+    def test_rejects_invalid_requests(self):
+        scheduler = self.make_scheduler(start=False)
+        with self.assertRaises(ValueError):
+            scheduler.schedule("user", "알림", 0)
+        with self.assertRaises(ValueError):
+            scheduler.schedule(
+                "user", "알림", Config.NOTIFICATION_MAX_DELAY_SECONDS + 1
+            )
+        with self.assertRaises(ValueError):
+            scheduler.schedule("user", "", 10)
+
+        with mock.patch.object(Config, "NOTIFICATION_MAX_PENDING_PER_USER", 2):
+            scheduler.schedule("user", "알림", 10)
+            scheduler.schedule("user", "알림", 10)
+            with self.assertRaises(ValueError):
+                scheduler.schedule("user", "알림", 10)
+            scheduler.schedule("other", "알림", 10)
+
+    def test_restores_pending_and_unacknowledged_after_restart(self):
+        scheduler = self.make_scheduler()
+        subscriber = scheduler.subscribe("user")
+        acked = scheduler.schedule("user", "확인됨", 0.01)
+        unacked = scheduler.schedule("user", "확인 안 됨", 0.02)
+        pending = scheduler.schedule("user", "예약됨", 60)
+        cancelled = scheduler.schedule("user", "취소됨", 60)
+        scheduler.cancel("user", cancelled["id"])
+
+        received = [subscriber.get(timeout=2), subscriber.get(timeout=2)]
+        self.assertEqual([n["id"] for n in received], [acked["id"], unacked["id"]])
+        scheduler.acknowledge("user", acked["id"])
+        scheduler.stop()
+
+        restored = self.make_scheduler(start=False)
+        self.assertEqual(
+            [n["id"] for n in restored.list_pending("user")], [pending["id"]]
+        )
+        self.assertEqual(restored.stats()["undelivered"], 1)
+
+        # 전달 확인 전이던 알림은 다시 발송하지 않고 다음 연결에 전달
+        subscriber = restored.subscribe("user")
+        self.assertEqual(subscriber.get(timeout=2)["id"], unacked["id"])
+        self.assertTrue(subscriber.empty())
+
+    def test_subscribe_receives_undelivered_backlog(self):
+        scheduler = self.make_scheduler()
+        notification = scheduler.schedule("user", "접속 전 발송", 0.01)
+        deadline = time.time() + 2
+        while scheduler.stats()["undelivered"] == 0 and time.time() < deadline:
+            time.sleep(0.01)
+
+        subscriber = scheduler.subscribe("user")
+        self.assertEqual(subscriber.get(timeout=1)["id"], notification["id"])
+        scheduler.unsubscribe("user", subscriber)
+
+        # 전달 확인 전에는 다시 연결해도 받음
+        subscriber = scheduler.subscribe("user")
+        self.assertEqual(subscriber.get(timeout=1)["id"], notification["id"])
+        scheduler.acknowledge("user", notification["id"])
+        scheduler.unsubscribe("user", subscriber)
+
+        self.assertTrue(scheduler.subscribe("user").empty())
+        self.assertEqual(scheduler.stats()["undelivered"], 0)
+
+    def test_compacts_log(self):
+        scheduler = self.make_scheduler(start=False)
+        kept = scheduler.schedule("user", "남는 알림", 60)
+        with mock.patch.object(Config, "NOTIFICATION_COMPACT_MIN_LINES", 5):
+            for _ in range(5):
+                notification = scheduler.schedule("user", "취소됨", 60)
+                scheduler.cancel("user", notification["id"])
+
+        records = self.read_log()
+        self.assertLessEqual(len(records), 5)
+        restored = self.make_scheduler(start=False)
+        self.assertEqual([n["id"] for n in restored.list_pending("user")], [kept["id"]])
+
+    def test_ignores_truncated_log_line(self):
+        scheduler = self.make_scheduler(start=False)
+        notification = scheduler.schedule("user", "알림", 60)
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write('{"op": "sched')
+
+        with self.assertLogs("services.notification_service", "WARNING"):
+            restored = self.make_scheduler(start=False)
+        self.assertEqual(
+            [n["id"] for n in restored.list_pending("user")], [notification["id"]]
+        )
+
+    def test_only_one_scheduler_fires(self):
+        # 같은 로그를 쓰는 스케줄러 둘 (워커 프로세스 둘과 같음)
+        first = self.make_scheduler()
+        second = self.make_scheduler()
+        deadline = time.time() + 2
+        while first.stats()["owner"] + second.stats()["owner"] == 0:
+            self.assertLess(time.time(), deadline)
+            time.sleep(0.01)
+        self.assertEqual(first.stats()["owner"] + second.stats()["owner"], 1)
+
+        subscribers = [first.subscribe("user"), second.subscribe("user")]
+        notification = second.schedule("user", "한 번만", 0.05)
+        for subscriber in subscribers:
+            self.assertEqual(subscriber.get(timeout=2)["id"], notification["id"])
+
+        first.acknowledge("user", notification["id"])
+        second.acknowledge("user", notification["id"])
+
+        ops = [record["op"] for record in self.read_log()]
+        self.assertEqual(ops, ["schedule", "fire", "done"])
+
+    def test_other_scheduler_takes_over_when_owner_stops(self):
+        owner = self.make_scheduler()
+        deadline = time.time() + 2
+        while not owner.is_owner():
+            self.assertLess(time.time(), deadline)
+            time.sleep(0.01)
+        follower = self.make_scheduler()
+        subscriber = follower.subscribe("user")
+        notification = owner.schedule("user", "이어서 발송", 0.3)
+        owner.stop()
+
+        self.assertEqual(subscriber.get(timeout=2)["id"], notification["id"])
+        self.assertTrue(follower.is_owner())
+
+    def test_idle_scheduler_does_not_poll(self):
+        owner = self.make_scheduler()
+        follower = self.make_scheduler()
+        owner.schedule("user", "나중에", 60)
+        time.sleep(0.1)
+        with mock.patch.object(
+            owner, "_sync", wraps=owner._sync
+        ) as owner_sync, mock.patch.object(
+            follower, "_sync", wraps=follower._sync
+        ) as follower_sync:
+            time.sleep(0.3)
+        self.assertEqual(owner_sync.call_count + follower_sync.call_count, 0)
+
+    def test_earlier_schedule_from_other_scheduler_wakes_owner(self):
+        owner = self.make_scheduler()
+        deadline = time.time() + 2
+        while not owner.is_owner():
+            self.assertLess(time.time(), deadline)
+            time.sleep(0.01)
+        subscriber = owner.subscribe("user")
+        owner.schedule("user", "나중에", 60)
+        other = self.make_scheduler(start=False)
+        notification = other.schedule("user", "먼저", 0.05)
+        self.assertEqual(subscriber.get(timeout=2)["id"], notification["id"])
+
+    def test_public_notification(self):
+        scheduler = self.make_scheduler(start=False)
+        notification = scheduler.schedule("user", "알림", 10)
+        self.assertEqual(
+            public_notification(notification),
+            {
+                "id": notification["id"],
+                "message": "알림",
+                "notification_time": notification["due_at"],
+            },
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,26 +1,169 @@
 import unittest
 import os
-from services.pdf_service import export_conversation_to_pdf, export_conversation_to_txt
+from unittest.mock import patch
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfbase import pdfmetrics
+from config import Config
+from services import pdf_service
+from services.pdf_service import (
+    MARGIN,
+    ExportCache,
+    export_filename,
+    generate_conversation_pdf,
+    generate_conversation_txt,
+    get_conversation_export,
+    get_font_name,
+    wrap_text,
+)
 
 
 class TestPDFService(unittest.TestCase):
-    def test_export_conversation_to_pdf(self):
+    def test_generate_conversation_pdf(self):
         history = [
             {"role": "user", "content": "안녕"},
             {"role": "assistant", "content": "안녕하세요!"},
         ]
-        filepath = export_conversation_to_pdf(history)
-        self.assertTrue(os.path.exists(filepath))
-        os.remove(filepath)
+        os.makedirs(Config.EXPORTS_DIR, exist_ok=True)
+        before = set(os.listdir(Config.EXPORTS_DIR))
+        data = b"".join(generate_conversation_pdf(history))
+        self.assertTrue(data.startswith(b"%PDF"))
+        self.assertTrue(data.rstrip().endswith(b"%%EOF"))
+        # 내보내기 폴더에 임시 파일을 만들지 않음
+        self.assertEqual(set(os.listdir(Config.EXPORTS_DIR)), before)
 
-    def test_export_conversation_to_txt(self):
+    def test_long_history_spans_pages(self):
+        history = [
+            {
+                "role": "user",
+                "content": "한글 문장과 English words 섞인 긴 메시지 " * 40,
+            }
+        ] * 30
+        data = b"".join(generate_conversation_pdf(history))
+        self.assertGreater(data.count(b"/Type /Page\n"), 1)
+
+    def test_generate_conversation_txt(self):
         history = [
             {"role": "user", "content": "안녕"},
             {"role": "assistant", "content": "안녕하세요!"},
         ]
-        filepath = export_conversation_to_txt(history)
-        self.assertTrue(os.path.exists(filepath))
-        os.remove(filepath)
+        text = b"".join(generate_conversation_txt(history)).decode("utf-8")
+        self.assertIn("[사용자]\n안녕\n", text)
+        self.assertIn("[AI 비서]\n안녕하세요!\n", text)
+
+    def test_export_filename(self):
+        self.assertRegex(export_filename("pdf"), r"^conversation_\d{8}_\d{6}\.pdf$")
+
+
+class TestExportCache(unittest.TestCase):
+    def test_unchanged_history_is_served_from_cache(self):
+        history = [{"role": "user", "content": "안녕"}]
+        with patch(
+            "services.pdf_service.get_export_cache", return_value=ExportCache(10**6)
+        ):
+            with patch(
+                "services.pdf_service._txt_messages",
+                side_effect=pdf_service._txt_messages,
+            ) as generate:
+                first = get_conversation_export(history, "txt")
+                second = get_conversation_export(list(history), "txt")
+                self.assertEqual(first, second)
+                self.assertEqual(generate.call_count, 1)
+
+                get_conversation_export(
+                    history + [{"role": "assistant", "content": "네"}], "txt"
+                )
+                self.assertEqual(generate.call_count, 2)
+
+    def test_cached_export_shows_current_time(self):
+        history = [{"role": "user", "content": "안녕"}]
+        with patch(
+            "services.pdf_service.get_export_cache", return_value=ExportCache(10**6)
+        ):
+            with patch(
+                "services.pdf_service.export_time",
+                side_effect=["2026-10-18 09:00:00", "2026-10-18 10:30:00"],
+            ):
+                first = get_conversation_export(history, "txt").decode("utf-8")
+                second = get_conversation_export(history, "txt").decode("utf-8")
+        self.assertIn("내보내기 시간: 2026-10-18 09:00:00", first)
+        self.assertIn("내보내기 시간: 2026-10-18 10:30:00", second)
+        self.assertTrue(second.endswith("[사용자]\n안녕\n\n"))
+
+    def test_pdf_is_reused_across_export_times(self):
+        history = [{"role": "user", "content": "안녕"}]
+        with patch(
+            "services.pdf_service.get_export_cache", return_value=ExportCache(10**6)
+        ), patch(
+            "services.pdf_service.generate_conversation_pdf",
+            side_effect=generate_conversation_pdf,
+        ) as generate, patch(
+            "services.pdf_service.export_time",
+            side_effect=["2026-10-18 09:00:00", "2026-10-18 10:30:00"],
+        ):
+            first = get_conversation_export(history, "pdf")
+            second = get_conversation_export(history, "pdf")
+            get_conversation_export(
+                history + [{"role": "assistant", "content": "네"}], "pdf"
+            )
+        self.assertEqual(first, second)
+        self.assertEqual(generate.call_count, 2)
+
+    def test_format_is_part_of_key(self):
+        history = [{"role": "user", "content": "안녕"}]
+        with patch(
+            "services.pdf_service.get_export_cache", return_value=ExportCache(10**6)
+        ):
+            self.assertTrue(get_conversation_export(history, "pdf").startswith(b"%PDF"))
+            self.assertFalse(
+                get_conversation_export(history, "txt").startswith(b"%PDF")
+            )
+        with self.assertRaises(ValueError):
+            get_conversation_export(history, "docx")
+
+    def test_evicts_oldest_when_over_size(self):
+        cache = ExportCache(max_bytes=10)
+        cache.set("a", b"12345")
+        cache.set("b", b"12345")
+        cache.set("c", b"12345")
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("c"), b"12345")
+        self.assertEqual(cache.stats()["bytes"], 10)
+
+
+class TestWrapText(unittest.TestCase):
+    def setUp(self):
+        self.font = get_font_name()
+        self.width = A4[0] - 2 * MARGIN
+
+    def assert_fits(self, lines):
+        for line in lines:
+            self.assertLessEqual(
+                pdfmetrics.stringWidth(line, self.font, 12), self.width + 0.01
+            )
+
+    def test_korean_without_spaces_is_split_by_character(self):
+        text = "가나다라마바사아자차카타파하" * 20
+        lines = list(wrap_text(text, self.font, 12, self.width))
+        self.assertGreater(len(lines), 1)
+        self.assertEqual("".join(lines), text)
+        self.assert_fits(lines)
+
+    def test_english_is_split_at_spaces(self):
+        words = ["word%d" % i for i in range(100)]
+        lines = list(wrap_text(" ".join(words), self.font, 12, self.width))
+        self.assertGreater(len(lines), 1)
+        self.assertEqual(" ".join(lines).split(), words)
+        self.assert_fits(lines)
+
+    def test_blank_lines_are_kept(self):
+        self.assertEqual(
+            list(wrap_text("첫 줄\n\n셋째 줄", self.font, 12, 500)),
+            [
+                "첫 줄",
+                "",
+                "셋째 줄",
+            ],
+        )
 
 
 if __name__ == "__main__":
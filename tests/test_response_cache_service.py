@@ -0,0 +1,76 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+from services.response_cache_service import (
+    MemoryResponseCacheBackend,
+    ResponseCache,
+    SQLiteResponseCacheBackend,
+    make_response_cache_key,
+)
+
+MESSAGES = [
+    {"role": "system", "content": "전문 비서"},
+    {"role": "user", "content": "영업시간이 어떻게 되나요?"},
+]
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_key_depends_on_messages_and_model(self):
+        key = make_response_cache_key(MESSAGES, "gpt-4.1-nano")
+        self.assertEqual(key, make_response_cache_key(list(MESSAGES), "gpt-4.1-nano"))
+        self.assertNotEqual(key, make_response_cache_key(MESSAGES, "gpt-4.1-mini"))
+        self.assertNotEqual(key, make_response_cache_key(MESSAGES[1:], "gpt-4.1-nano"))
+
+    def test_key_ignores_stored_message_fields(self):
+        with_count = [dict(m, token_count={"count": 3}) for m in MESSAGES]
+        self.assertEqual(
+            make_response_cache_key(with_count, "m"),
+            make_response_cache_key(MESSAGES, "m"),
+        )
+
+    def test_hit_and_miss_counted(self):
+        cache = ResponseCache(MemoryResponseCacheBackend(10), ttl=60)
+        self.assertIsNone(cache.get(MESSAGES, "m"))
+        cache.set(MESSAGES, "m", "9시부터 6시까지입니다.")
+        self.assertEqual(cache.get(MESSAGES, "m"), "9시부터 6시까지입니다.")
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+        self.assertEqual(stats["hit_rate"], 0.5)
+
+    def test_expired_entry_is_miss(self):
+        cache = ResponseCache(MemoryResponseCacheBackend(10), ttl=60)
+        cache.set(MESSAGES, "m", "응답")
+        with mock.patch("time.time", return_value=time.time() + 61):
+            self.assertIsNone(cache.get(MESSAGES, "m"))
+
+    def test_lru_eviction(self):
+        backend = MemoryResponseCacheBackend(2)
+        for value in ("a", "b", "c"):
+            backend.set(value, value, 60)
+        self.assertIsNone(backend.get("a"))
+        self.assertEqual(backend.get("c"), "c")
+
+    def test_shared_tier_fills_memory(self):
+        path = os.path.join(self.temp_dir, "cache.db")
+        ResponseCache(
+            MemoryResponseCacheBackend(10), SQLiteResponseCacheBackend(path), ttl=60
+        ).set(MESSAGES, "m", "공유 응답")
+        other = ResponseCache(
+            MemoryResponseCacheBackend(10), SQLiteResponseCacheBackend(path), ttl=60
+        )
+        self.assertEqual(other.get(MESSAGES, "m"), "공유 응답")
+        self.assertEqual(other.stats()["shared_hits"], 1)
+        self.assertEqual(other.stats()["entries"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import unittest
+from collections import OrderedDict
+from unittest import mock
+import services.search_service as search_service
+from services.search_service import (
+    tokenize,
+    search,
+    index_conversation,
+    append_to_conversation,
+    index_session,
+    remove_session,
+)
+
+
+class TestSearchService(unittest.TestCase):
+    def setUp(self):
+        self.patches = [
+            mock.patch.object(search_service, "_postings", {}),
+            mock.patch.object(search_service, "_documents", {}),
+            mock.patch.object(search_service, "_sources", {}),
+            mock.patch.object(search_service, "_conversation_keys", OrderedDict()),
+            mock.patch.object(search_service, "_sessions_loaded", True),
+        ]
+        for patch in self.patches:
+            patch.start()
+
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+
+    def test_tokenize_korean_ngrams(self):
+        self.assertEqual(
+            tokenize("파이썬 OK"), ["파", "이", "썬", "파이", "이썬", "ok"]
+        )
+
+    def test_finds_korean_substring_with_particles(self):
+        index_conversation(
+            "user1",
+            [
+                {"role": "user", "content": "파이썬으로 웹서버 만드는 법"},
+                {"role": "assistant", "content": "Flask를 사용해 보세요."},
+            ],
+        )
+        page = search("웹서버", "user1")
+        self.assertEqual(page["total"], 1)
+        result = page["results"][0]
+        self.assertEqual(result["index"], 0)
+        self.assertEqual(result["after"]["content"], "Flask를 사용해 보세요.")
+        self.assertEqual(result["source"]["type"], "current")
+
+    def test_query_is_literal_not_regex(self):
+        index_conversation("user1", [{"role": "user", "content": "(a+)+$ 패턴"}])
+        self.assertEqual(search("(a+)+$", "user1")["total"], 1)
+        self.assertEqual(search("a.*", "user1")["total"], 0)
+
+    def test_searches_saved_sessions_and_other_users_are_hidden(self):
+        index_conversation("user1", [{"role": "user", "content": "운동 루틴"}])
+        index_conversation("user2", [{"role": "user", "content": "운동 계획"}])
+        index_session("s.json", "건강", [{"role": "user", "content": "운동 식단"}])
+
+        page = search("운동", "user1")
+        self.assertEqual(page["total"], 2)
+        sources = {r["source"]["type"] for r in page["results"]}
+        self.assertEqual(sources, {"current", "session"})
+
+        self.assertEqual(search("운동", "user1", include_sessions=False)["total"], 1)
+        remove_session("s.json")
+        self.assertEqual(search("운동", "user1")["total"], 1)
+
+    def test_ranking_and_pagination(self):
+        index_session(
+            "s.json",
+            "검색",
+            [
+                {
+                    "role": "user",
+                    "content": "날씨 이야기와 다른 긴 이야기들이 섞인 문장",
+                },
+                {"role": "user", "content": "날씨 날씨"},
+                {"role": "user", "content": "날씨"},
+            ],
+        )
+        page = search("날씨", None, offset=0, limit=2)
+        self.assertEqual(page["total"], 3)
+        self.assertEqual(len(page["results"]), 2)
+        self.assertEqual(page["results"][0]["match"]["content"], "날씨 날씨")
+        self.assertEqual(len(search("날씨", None, offset=2, limit=2)["results"]), 1)
+
+    def test_append_indexes_only_new_messages(self):
+        history = [{"role": "user", "content": "첫 질문"}]
+        index_conversation("user1", history)
+        with mock.patch.object(
+            search_service, "tokenize", wraps=search_service.tokenize
+        ) as tokenize_mock:
+            for i in range(4):
+                history = (history + [{"role": "user", "content": f"질문 {i}"}])[-3:]
+                append_to_conversation("user1", history, 1)
+        self.assertEqual(tokenize_mock.call_count, 4)
+
+        # 최대 개수를 넘어 빠진 메시지는 검색되지 않고 위치는 현재 대화 기준
+        self.assertEqual(search("첫", "user1")["total"], 0)
+        self.assertEqual(search("질문 0", "user1")["total"], 0)
+        result = search("질문 3", "user1")["results"][0]
+        self.assertEqual(result["index"], 2)
+        self.assertEqual(result["before"]["content"], "질문 2")
+        self.assertEqual(len(search_service._documents), 3)
+
+    def test_append_rebuilds_when_index_does_not_match(self):
+        append_to_conversation("user1", [{"role": "user", "content": "사과"}], 1)
+        self.assertEqual(search("사과", "user1")["total"], 1)
+
+        # 다른 워커가 처리한 메시지가 빠져 있으면 전체를 다시 색인
+        history = [
+            {"role": "user", "content": "사과"},
+            {"role": "assistant", "content": "바나나"},
+            {"role": "user", "content": "포도"},
+        ]
+        append_to_conversation("user1", history, 1)
+        self.assertEqual(search("바나나", "user1")["total"], 1)
+        self.assertEqual(search("포도", "user1")["results"][0]["index"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import unittest
+from unittest import mock
+from config import Config
+from services.semantic_cache_service import SemanticCache, embed_text, split_request
+
+
+class TestSemanticCache(unittest.TestCase):
+    def test_embedding_is_unit_length(self):
+        vector = embed_text("영업시간이 어떻게 되나요?")
+        self.assertAlmostEqual(float(vector @ vector), 1.0, places=5)
+
+    def test_paraphrase_scores_higher_than_other_question(self):
+        question = embed_text("영업시간이 어떻게 되나요?")
+        paraphrase = embed_text("영업 시간이 어떻게 돼요?")
+        other = embed_text("환불은 어떻게 하나요?")
+        self.assertGreater(question @ paraphrase, question @ other)
+
+    def test_lookup_returns_answer_above_threshold(self):
+        cache = SemanticCache(threshold=0.7, max_entries=10)
+        cache.store("concise", "영업시간이 어떻게 되나요?", "9시부터 6시까지입니다.")
+        match = cache.lookup("concise", "영업 시간이 어떻게 되나요")
+        self.assertEqual(match[0], "9시부터 6시까지입니다.")
+        self.assertIsNone(cache.lookup("concise", "환불은 어떻게 하나요?"))
+        self.assertEqual(cache.stats()["hits"], 1)
+
+    def test_partitions_are_separate(self):
+        cache = SemanticCache(threshold=0.7, max_entries=10)
+        cache.store("concise", "영업시간이 어떻게 되나요?", "9시-6시")
+        self.assertIsNone(cache.lookup("detailed", "영업시간이 어떻게 되나요?"))
+
+    def test_oldest_entry_replaced_when_full(self):
+        cache = SemanticCache(threshold=0.9, max_entries=2)
+        for question in ("첫 번째 질문", "두 번째 질문", "세 번째 질문"):
+            cache.store("p", question, question)
+        self.assertIsNone(cache.lookup("p", "첫 번째 질문"))
+        self.assertEqual(cache.lookup("p", "세 번째 질문")[0], "세 번째 질문")
+        self.assertEqual(cache.stats()["entries"], 2)
+
+    def test_partition_grows_on_demand(self):
+        cache = SemanticCache(threshold=0.9, max_entries=40, dimensions=64)
+        cache.store("p", "질문 0", "답 0")
+        partition = cache._partitions["p"]
+        self.assertEqual(len(partition.vectors), 16)
+
+        for i in range(1, 45):
+            cache.store("p", f"질문 {i}", f"답 {i}")
+        self.assertEqual(len(partition.vectors), 40)
+        self.assertEqual(cache.stats()["entries"], 40)
+        self.assertEqual(cache.lookup("p", "질문 44")[0], "답 44")
+        self.assertEqual(cache.lookup("p", "질문 16")[0], "답 16")
+        self.assertIsNone(cache.lookup("p", "질문 3"))  # 가장 오래된 항목은 교체됨
+
+    def test_numbers_must_match(self):
+        cache = SemanticCache(threshold=0.8, max_entries=10)
+        cache.store("p", "What is 12 times 13?", "156")
+        self.assertIsNone(cache.lookup("p", "What is 12 times 14?"))
+        self.assertIsNone(cache.lookup("p", "What is 13 times 12?"))
+        self.assertEqual(cache.lookup("p", "what is 12 times 13")[0], "156")
+
+        # 숫자가 다른 질문이 더 비슷해도 숫자가 같은 질문의 응답을 반환
+        cache.store("p", "3 더하기 4는?", "7")
+        cache.store("p", "3 더하기 5는?", "8")
+        self.assertEqual(cache.lookup("p", "3 더하기 4는 얼마?")[0], "7")
+
+    def test_reminders_and_time_sensitive_questions_are_not_cached(self):
+        cache = SemanticCache(threshold=0.8, max_entries=10)
+        for question in (
+            "10분 뒤에 알려줘",
+            "remind me in 5 minutes",
+            "오늘 날씨 어때?",
+            "지금 몇 시야?",
+            "What's the latest news?",
+        ):
+            cache.store("p", question, "응답")
+            self.assertIsNone(cache.lookup("p", question))
+        self.assertEqual(cache.stats()["entries"], 0)
+        self.assertEqual(cache.stats()["skipped"], 5)
+
+    def test_entries_expire(self):
+        cache = SemanticCache(threshold=0.8, max_entries=10, ttl_seconds=60)
+        with mock.patch("services.semantic_cache_service.time.time") as now:
+            now.return_value = 1000.0
+            cache.store("p", "영업시간이 어떻게 되나요?", "9시-6시")
+            now.return_value = 1059.0
+            self.assertIsNotNone(cache.lookup("p", "영업시간이 어떻게 되나요?"))
+            now.return_value = 1061.0
+            self.assertIsNone(cache.lookup("p", "영업시간이 어떻게 되나요?"))
+
+    def test_split_request_only_standalone_questions(self):
+        standalone = [
+            {"role": "system", "content": "간결하게"},
+            {"role": "user", "content": "영업시간?"},
+        ]
+        partition, question = split_request(standalone)
+        self.assertEqual(question, "영업시간?")
+
+        follow_up = (
+            standalone[:1]
+            + [{"role": "assistant", "content": "9시부터입니다."}]
+            + standalone[1:]
+        )
+        self.assertIsNone(split_request(follow_up))
+        with mock.patch.object(Config, "SEMANTIC_CACHE_STANDALONE_ONLY", False):
+            self.assertEqual(split_request(follow_up), (partition, "영업시간?"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,29 +1,37 @@
 import unittest
 import os
+import json
+import shutil
+import tempfile
+import multiprocessing
+from unittest import mock
+import services.session_service as session_service
 from services.session_service import (
     save_session,
     list_sessions,
+    list_sessions_page,
     load_session,
     delete_session,
 )
+from services import file_lock_service
 from config import Config
 
 
+def save_sessions(sessions_dir, prefix, count):
+    """다른 워커 프로세스처럼 같은 디렉토리에 세션 저장"""
+    for i in range(count):
+        save_session([], f"{prefix}{i}", sessions_dir)
+
+
 class TestSessionService(unittest.TestCase):
     def setUp(self):
         """테스트 전 임시 세션 디렉토리 설정"""
         self.original_sessions_dir = Config.SESSIONS_DIR
-        Config.SESSIONS_DIR = "data/sessions/test"
-        # 테스트 디렉토리 생성
-        os.makedirs(Config.SESSIONS_DIR, exist_ok=True)
+        Config.SESSIONS_DIR = tempfile.mkdtemp()
 
     def tearDown(self):
         """테스트 후 설정 복원 및 정리"""
-        # 테스트 파일들 정리
-        if os.path.exists(Config.SESSIONS_DIR):
-            for file in os.listdir(Config.SESSIONS_DIR):
-                os.remove(os.path.join(Config.SESSIONS_DIR, file))
-            os.rmdir(Config.SESSIONS_DIR)
+        shutil.rmtree(Config.SESSIONS_DIR, ignore_errors=True)
         Config.SESSIONS_DIR = self.original_sessions_dir
 
     def test_session_lifecycle(self):
@@ -49,6 +57,60 @@ class TestSessionService(unittest.TestCase):
         filepath = os.path.join(Config.SESSIONS_DIR, filename)
         self.assertFalse(os.path.exists(filepath))
 
+    def test_list_uses_index_without_reading_session_files(self):
+        for name in ["b", "a", "c"]:
+            save_session([{"role": "user", "content": name}], name, Config.SESSIONS_DIR)
+
+        with mock.patch.object(session_service.json, "load") as json_load:
+            page = list_sessions_page(
+                Config.SESSIONS_DIR, offset=1, limit=1, sort="name", reverse=False
+            )
+            json_load.assert_not_called()
+        self.assertEqual(page["total"], 3)
+        self.assertEqual([s["name"] for s in page["sessions"]], ["b"])
+
+    def test_index_is_rebuilt_when_missing(self):
+        filename = save_session([], "rebuild", Config.SESSIONS_DIR)
+        os.remove(os.path.join(Config.SESSIONS_DIR, session_service.SESSION_INDEX_NAME))
+        sessions = list_sessions(Config.SESSIONS_DIR)
+        self.assertEqual([s["filename"] for s in sessions], [filename])
+
+        delete_session(filename, Config.SESSIONS_DIR)
+        self.assertEqual(list_sessions(Config.SESSIONS_DIR), [])
+
+    def test_index_heals_when_directory_changes_outside_index(self):
+        kept = save_session([], "kept", Config.SESSIONS_DIR)
+        removed = save_session([], "removed", Config.SESSIONS_DIR)
+        list_sessions(Config.SESSIONS_DIR)
+
+        # 색인을 거치지 않고 파일을 복사/삭제
+        os.remove(os.path.join(Config.SESSIONS_DIR, removed))
+        with open(
+            os.path.join(Config.SESSIONS_DIR, "copied.json"), "w", encoding="utf-8"
+        ) as f:
+            json.dump({"name": "copied", "timestamp": "1", "messages": []}, f)
+
+        filenames = {s["filename"] for s in list_sessions(Config.SESSIONS_DIR)}
+        self.assertEqual(filenames, {kept, "copied.json"})
+
+    @unittest.skipIf(file_lock_service.fcntl is None, "프로세스 간 잠금 미지원")
+    def test_processes_do_not_lose_index_updates(self):
+        context = multiprocessing.get_context("fork")
+        workers = [
+            context.Process(target=save_sessions, args=(Config.SESSIONS_DIR, p, 10))
+            for p in "abcd"
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        index_path = os.path.join(
+            Config.SESSIONS_DIR, session_service.SESSION_INDEX_NAME
+        )
+        with open(index_path, encoding="utf-8") as f:
+            self.assertEqual(len(json.load(f)), 40)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,113 @@
+import shutil
+import tempfile
+import os
+import unittest
+from datetime import timedelta
+from flask import Flask, session
+from services.session_store_service import (
+    ServerSideSessionInterface,
+    MemorySessionBackend,
+    FileSystemSessionBackend,
+    SQLiteSessionBackend,
+)
+
+
+def make_app(backend):
+    app = Flask(__name__)
+    app.secret_key = "test-secret"
+    app.session_interface = ServerSideSessionInterface(backend)
+
+    @app.route("/set/<value>")
+    def set_value(value):
+        session["history"] = [{"role": "user", "content": value * 1000}]
+        return "ok"
+
+    @app.route("/get")
+    def get_value():
+        history = session.get("history", [])
+        return history[0]["content"][:1] if history else ""
+
+    @app.route("/clear")
+    def clear():
+        session.clear()
+        return "ok"
+
+    return app
+
+
+class BackendTestMixin:
+    def make_backend(self):
+        raise NotImplementedError
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.backend = self.make_backend()
+        self.app = make_app(self.backend)
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_only_session_id_travels_in_cookie(self):
+        self.client.get("/set/가")
+        cookie = self.client.get_cookie("session")
+        self.assertLess(len(cookie.value), 100)
+        self.assertEqual(self.client.get("/get").get_data(as_text=True), "가")
+
+    def test_tampered_cookie_starts_new_session(self):
+        self.client.get("/set/가")
+        cookie = self.client.get_cookie("session")
+        tampered = ("b" if cookie.value[0] == "a" else "a") + cookie.value[1:]
+        self.client.set_cookie("session", tampered)
+        self.assertEqual(self.client.get("/get").get_data(as_text=True), "")
+
+    def test_clear_deletes_stored_session(self):
+        self.client.get("/set/가")
+        self.client.get("/clear")
+        self.assertEqual(self.client.get("/get").get_data(as_text=True), "")
+
+    def test_update_stored_session_after_response(self):
+        self.client.get("/set/가")
+        interface = self.app.session_interface
+        sid = interface._signer(self.app).unsign(
+            self.client.get_cookie("session").value
+        )
+
+        def replace_history(data):
+            data["history"] = [{"role": "user", "content": "나"}]
+
+        self.assertTrue(
+            interface.update_stored_session(self.app, sid.decode(), replace_history)
+        )
+        self.assertEqual(self.client.get("/get").get_data(as_text=True), "나")
+        self.assertFalse(
+            interface.update_stored_session(self.app, "missing", replace_history)
+        )
+
+    def test_expired_sessions_are_evicted(self):
+        self.backend.set("expired", "{}", timedelta(seconds=-1))
+        self.backend.set("alive", "{}", timedelta(days=1))
+        self.assertIsNone(self.backend.get("expired"))
+        self.backend.set("expired2", "{}", timedelta(seconds=-1))
+        self.assertGreaterEqual(self.backend.cleanup(), 1)
+        self.assertIsNone(self.backend.get("expired2"))
+        self.assertEqual(self.backend.get("alive"), "{}")
+
+
+class TestMemorySessionBackend(BackendTestMixin, unittest.TestCase):
+    def make_backend(self):
+        return MemorySessionBackend()
+
+
+class TestFileSystemSessionBackend(BackendTestMixin, unittest.TestCase):
+    def make_backend(self):
+        return FileSystemSessionBackend(self.temp_dir)
+
+
+class TestSQLiteSessionBackend(BackendTestMixin, unittest.TestCase):
+    def make_backend(self):
+        return SQLiteSessionBackend(os.path.join(self.temp_dir, "sessions.db"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,176 @@
+import asyncio
+import threading
+import time
+import unittest
+from services.singleflight_service import (
+    AsyncSingleFlight,
+    SingleFlight,
+    make_flight_key,
+)
+
+
+class TestSingleFlight(unittest.TestCase):
+    def test_key_requires_session(self):
+        self.assertIsNone(make_flight_key(None, {"question": "안녕"}))
+        self.assertEqual(
+            make_flight_key("s1", {"a": 1, "b": 2}),
+            make_flight_key("s1", {"b": 2, "a": 1}),
+        )
+        self.assertNotEqual(
+            make_flight_key("s1", {"a": 1}), make_flight_key("s2", {"a": 1})
+        )
+
+    def test_concurrent_calls_share_one_result(self):
+        flight = SingleFlight()
+        calls = []
+        release = threading.Event()
+
+        def work():
+            calls.append(1)
+            release.wait(5)
+            return "응답"
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(flight.do("k", work)))
+            for _ in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(calls, [1])
+        self.assertEqual(results, ["응답"] * 3)
+
+    def test_finished_flight_is_not_reused(self):
+        flight = SingleFlight()
+        self.assertEqual(flight.do("k", lambda: 1), 1)
+        self.assertEqual(flight.do("k", lambda: 2), 2)
+
+    def test_error_is_shared(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        errors = []
+
+        def fail():
+            release.wait(5)
+            raise ValueError("실패")
+
+        def run():
+            try:
+                flight.do("k", fail)
+            except ValueError as e:
+                errors.append(str(e))
+
+        threads = [threading.Thread(target=run) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(errors, ["실패", "실패"])
+
+    def test_follower_receives_whole_stream(self):
+        flight = SingleFlight()
+        starts = []
+
+        def start():
+            starts.append(1)
+            return iter(["a", "b", "c"])
+
+        leader = flight.stream("k", start)
+        self.assertEqual(next(leader), "a")
+        follower = flight.stream("k", start)
+        self.assertEqual(list(leader), ["b", "c"])
+        self.assertEqual(list(follower), ["a", "b", "c"])
+        self.assertEqual(starts, [1])
+
+    def test_stream_completes_when_leader_disconnects(self):
+        flight = SingleFlight()
+        produced = []
+
+        def source():
+            for item in ("a", "b", "c"):
+                produced.append(item)
+                yield item
+
+        leader = flight.stream("k", source)
+        next(leader)
+        follower = flight.stream("k", source)
+        leader.close()
+        self.assertEqual(produced, ["a", "b", "c"])
+        self.assertEqual(list(follower), ["a", "b", "c"])
+
+    def test_unstarted_leader_hands_over_when_closed(self):
+        flight = SingleFlight()
+        starts = []
+
+        def start():
+            starts.append(1)
+            return iter(["a", "b"])
+
+        leader = flight.stream("k", start)
+        follower = flight.stream("k", start)
+        leader.close()
+        self.assertEqual(list(follower), ["a", "b"])
+        self.assertEqual(list(leader), [])
+        self.assertEqual(starts, [1, 1])
+
+    def test_dropped_leader_is_cleaned_up(self):
+        flight = SingleFlight()
+        flight.stream("k", lambda: iter(["a"]))  # 읽지 않고 버림
+        self.assertEqual(list(flight.stream("k", lambda: iter(["b"]))), ["b"])
+
+    def test_follower_runs_alone_when_leader_stalls(self):
+        flight = SingleFlight(wait_timeout=0.05)
+        leader = flight.stream("k", lambda: iter(["a"]))
+        started = time.monotonic()
+        self.assertEqual(list(flight.stream("k", lambda: iter(["b"]))), ["b"])
+        self.assertLess(time.monotonic() - started, 2)
+        # 멈춘 요청은 목록에서 빠져 이후 요청은 기다리지 않음
+        self.assertEqual(list(flight.stream("k", lambda: iter(["c"]))), ["c"])
+        self.assertEqual(list(leader), ["a"])
+
+
+class TestAsyncSingleFlight(unittest.TestCase):
+    def test_concurrent_streams_share_source(self):
+        flight = AsyncSingleFlight()
+        starts = []
+
+        async def source():
+            starts.append(1)
+            for item in ("a", "b"):
+                await asyncio.sleep(0.01)
+                yield item
+
+        async def consume():
+            return [item async for item in flight.stream("k", source)]
+
+        async def main():
+            return await asyncio.gather(consume(), consume())
+
+        self.assertEqual(asyncio.run(main()), [["a", "b"], ["a", "b"]])
+        self.assertEqual(starts, [1])
+
+    def test_concurrent_calls_share_result(self):
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "응답"
+
+        async def main():
+            return await asyncio.gather(*(flight.do("k", work) for _ in range(3)))
+
+        self.assertEqual(asyncio.run(main()), ["응답"] * 3)
+        self.assertEqual(calls, [1])
+
+
+if __name__ == "__main__":
+    unittest.main()
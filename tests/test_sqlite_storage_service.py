@@ -0,0 +1,128 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from config import Config
+from services.conversation_service import (
+    append_conversation_message,
+    load_conversation_history,
+    clear_conversation_history,
+    load_conversation_summary,
+    save_conversation_summary,
+)
+from services.session_service import (
+    save_session,
+    list_sessions_page,
+    load_session,
+    delete_session,
+)
+from services.sqlite_storage_service import SQLiteStorage, migrate_json_to_sqlite
+
+
+class TestSQLiteStorage(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.config_patch = mock.patch.multiple(
+            Config,
+            STORAGE_BACKEND="sqlite",
+            SQLITE_DB_PATH=os.path.join(self.temp_dir, "assistant.db"),
+            CONVERSATIONS_DIR=os.path.join(self.temp_dir, "conversations"),
+            SESSIONS_DIR=os.path.join(self.temp_dir, "sessions"),
+        )
+        self.config_patch.start()
+
+    def tearDown(self):
+        self.config_patch.stop()
+        shutil.rmtree(self.temp_dir)
+
+    def test_conversation_messages_round_trip(self):
+        append_conversation_message({"role": "user", "content": "안녕"}, "user1")
+        append_conversation_message(
+            {"role": "assistant", "content": "반가워요", "audio_url": "/a.mp3"}, "user1"
+        )
+        append_conversation_message({"role": "user", "content": "다른 사용자"}, "user2")
+        self.assertEqual(
+            load_conversation_history("user1"),
+            [
+                {"role": "user", "content": "안녕"},
+                {"role": "assistant", "content": "반가워요", "audio_url": "/a.mp3"},
+            ],
+        )
+        clear_conversation_history("user1")
+        self.assertEqual(load_conversation_history("user1"), [])
+        self.assertEqual(len(load_conversation_history("user2")), 1)
+
+    def test_conversation_summary_round_trip(self):
+        summary = {"content": "요약", "upto": "abc"}
+        save_conversation_summary(summary, "user1")
+        self.assertEqual(load_conversation_summary("user1"), summary)
+        self.assertIsNone(load_conversation_summary("user2"))
+        clear_conversation_history("user1")
+        self.assertIsNone(load_conversation_summary("user1"))
+
+    def test_session_lifecycle(self):
+        history = [{"role": "user", "content": "테스트"}]
+        filename = save_session(history, "sqlite")
+        page = list_sessions_page(sort="name")
+        self.assertEqual(page["total"], 1)
+        self.assertEqual(page["sessions"][0]["message_count"], 1)
+        self.assertEqual(load_session(filename)["messages"], history)
+
+        delete_session(filename)
+        with self.assertRaises(FileNotFoundError):
+            load_session(filename)
+        with self.assertRaises(FileNotFoundError):
+            delete_session(filename)
+
+    def test_migrates_json_data(self):
+        os.makedirs(Config.SESSIONS_DIR)
+        with open(
+            os.path.join(Config.SESSIONS_DIR, "old_20250101_000000.json"),
+            "w",
+            encoding="utf-8",
+        ) as f:
+            json.dump(
+                {
+                    "name": "old",
+                    "timestamp": "20250101_000000",
+                    "messages": [{"role": "user", "content": "예전"}],
+                },
+                f,
+            )
+        os.makedirs(Config.CONVERSATIONS_DIR)
+        with open(
+            os.path.join(Config.CONVERSATIONS_DIR, "conversation_history.json"),
+            "w",
+            encoding="utf-8",
+        ) as f:
+            json.dump([{"role": "user", "content": "공용 기록"}], f)
+
+        with mock.patch.object(Config, "STORAGE_BACKEND", "json"):
+            storage = SQLiteStorage(Config.SQLITE_DB_PATH)
+            counts = migrate_json_to_sqlite(storage)
+            counts = migrate_json_to_sqlite(storage)  # 다시 실행해도 중복 없음
+        self.assertEqual(counts, {"conversations": 1, "sessions": 1})
+
+        self.assertEqual(load_session("old_20250101_000000.json")["name"], "old")
+        self.assertEqual(
+            load_conversation_history(), [{"role": "user", "content": "공용 기록"}]
+        )
+
+    def test_migration_reads_files_with_sqlite_backend(self):
+        messages = [{"role": "user", "content": f"메시지 {i}"} for i in range(6)]
+        with mock.patch.object(Config, "STORAGE_BACKEND", "json"):
+            for message in messages:
+                append_conversation_message(message, "user1")
+
+        # STORAGE_BACKEND가 sqlite여도 파일을 읽고 최근 메시지만 남기지 않음
+        with mock.patch.object(Config, "MAX_CONTEXT_MESSAGES", 4):
+            storage = SQLiteStorage(Config.SQLITE_DB_PATH)
+            counts = migrate_json_to_sqlite(storage)
+        self.assertEqual(counts["conversations"], 1)
+        self.assertEqual(storage.load_messages("user1", 100), messages)
+
+
+if __name__ == "__main__":
+    unittest.main()
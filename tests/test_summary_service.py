@@ -0,0 +1,97 @@
+import shutil
+import tempfile
+import unittest
+from collections import OrderedDict
+from unittest import mock
+import services.conversation_service as conversation_service
+from services.conversation_service import (
+    save_conversation_history,
+    load_conversation_summary,
+)
+from services.summary_service import get_summary_context, refresh_summary
+from config import Config
+
+USER_ID = "abcd1234"
+
+
+def make_history(count):
+    return [
+        {"role": "user" if i % 2 == 0 else "assistant", "content": f"메시지 {i}"}
+        for i in range(count)
+    ]
+
+
+class TestSummaryService(unittest.TestCase):
+    def setUp(self):
+        self.original_dir = Config.CONVERSATIONS_DIR
+        Config.CONVERSATIONS_DIR = tempfile.mkdtemp()
+        self.patches = [
+            mock.patch.object(conversation_service, "_log_states", OrderedDict()),
+            mock.patch.object(Config, "SUMMARY_KEEP_RECENT_MESSAGES", 4),
+            mock.patch.object(Config, "SUMMARY_BATCH_MESSAGES", 4),
+        ]
+        for patch in self.patches:
+            patch.start()
+        self.calls = []
+
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+        shutil.rmtree(Config.CONVERSATIONS_DIR, ignore_errors=True)
+        Config.CONVERSATIONS_DIR = self.original_dir
+
+    def summarize(self, previous, messages):
+        self.calls.append((previous, [m["content"] for m in messages]))
+        return f"요약{len(self.calls)}"
+
+    def test_no_refresh_below_threshold(self):
+        history = make_history(7)
+        save_conversation_history(history, USER_ID)
+        self.assertFalse(refresh_summary(USER_ID, history, self.summarize))
+        self.assertEqual(get_summary_context(USER_ID, history), (None, history))
+
+    def test_old_messages_folded_into_summary(self):
+        history = make_history(10)
+        save_conversation_history(history, USER_ID)
+        self.assertTrue(refresh_summary(USER_ID, history, self.summarize))
+        self.assertEqual(self.calls[0][1], [f"메시지 {i}" for i in range(6)])
+
+        summary, recent = get_summary_context(USER_ID, history)
+        self.assertEqual(summary, "요약1")
+        self.assertEqual(recent, history[6:])
+
+    def test_summary_is_incremental(self):
+        history = make_history(10)
+        save_conversation_history(history, USER_ID)
+        refresh_summary(USER_ID, history, self.summarize)
+
+        history = make_history(14)
+        for message in history[10:]:
+            conversation_service.append_conversation_message(message, USER_ID)
+        self.assertTrue(refresh_summary(USER_ID, history, self.summarize))
+        self.assertEqual(
+            self.calls[1], ("요약1", [f"메시지 {i}" for i in range(6, 10)])
+        )
+        self.assertEqual(get_summary_context(USER_ID, history)[1], history[10:])
+
+    def test_replacing_history_discards_summary(self):
+        history = make_history(10)
+        save_conversation_history(history, USER_ID)
+        refresh_summary(USER_ID, history, self.summarize)
+        save_conversation_history([], USER_ID)
+        self.assertIsNone(load_conversation_summary(USER_ID))
+
+    def test_summary_not_saved_if_cleared_meanwhile(self):
+        history = make_history(10)
+        save_conversation_history(history, USER_ID)
+
+        def clear_then_summarize(previous, messages):
+            save_conversation_history([], USER_ID)
+            return "요약"
+
+        self.assertFalse(refresh_summary(USER_ID, history, clear_then_summarize))
+        self.assertIsNone(load_conversation_summary(USER_ID))
+
+
+if __name__ == "__main__":
+    unittest.main()
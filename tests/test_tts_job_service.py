@@ -0,0 +1,65 @@
+import time
+import threading
+import unittest
+from services.tts_job_service import submit_audio_job, get_audio_job
+
+
+def wait_for_job(job_id, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = get_audio_job(job_id)
+        if job["status"] != "pending":
+            return job
+        time.sleep(0.01)
+    return get_audio_job(job_id)
+
+
+class TestTTSJobService(unittest.TestCase):
+    def test_job_completes_with_audio_url(self):
+        job_id = submit_audio_job(
+            "테스트 음성입니다.",
+            {},
+            synthesize=lambda text, style, on_segment: ["/static/audio/x.mp3"],
+        )
+        job = wait_for_job(job_id)
+        self.assertEqual(job["status"], "done")
+        self.assertEqual(job["audio_url"], "/static/audio/x.mp3")
+        self.assertEqual(job["audio_urls"], ["/static/audio/x.mp3"])
+
+    def test_ready_prefix_is_exposed_while_pending(self):
+        release = threading.Event()
+
+        def partial(text, style, on_segment):
+            on_segment(2, "/static/audio/c.mp3")
+            on_segment(0, "/static/audio/a.mp3")
+            release.wait(5)
+            on_segment(1, "/static/audio/b.mp3")
+            return ["/static/audio/a.mp3", "/static/audio/b.mp3", "/static/audio/c.mp3"]
+
+        job_id = submit_audio_job("가. 나. 다.", {}, synthesize=partial)
+        deadline = time.time() + 5
+        while not get_audio_job(job_id)["audio_urls"] and time.time() < deadline:
+            time.sleep(0.01)
+        job = get_audio_job(job_id)
+        self.assertEqual(job["status"], "pending")
+        self.assertEqual(job["audio_urls"], ["/static/audio/a.mp3"])
+
+        release.set()
+        job = wait_for_job(job_id)
+        self.assertEqual(len(job["audio_urls"]), 3)
+
+    def test_failed_synthesis(self):
+        def broken(text, style, on_segment):
+            raise RuntimeError("tts down")
+
+        job = wait_for_job(submit_audio_job("테스트", {}, synthesize=broken))
+        self.assertEqual(job["status"], "failed")
+        self.assertIsNone(job["audio_url"])
+
+    def test_empty_text_and_unknown_job(self):
+        self.assertIsNone(submit_audio_job("  ", {}))
+        self.assertIsNone(get_audio_job("missing"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,13 +1,141 @@
+import os
+import shutil
+import tempfile
 import unittest
-from services.tts_service import create_audio_response
+from collections import OrderedDict
+from unittest import mock
+import services.tts_service as tts_service
+from services.tts_service import (
+    create_audio_response,
+    create_audio_playlist,
+    get_cached_playlist,
+    get_tts_cache_stats,
+    split_text,
+)
+from config import Config
+
+
+class FakeNaverTTS:
+    """요청 횟수를 기록하는 가짜 NaverTTS"""
+
+    calls = 0
+
+    def __init__(self, text):
+        self.text = text
+
+    def save(self, path):
+        FakeNaverTTS.calls += 1
+        with open(path, "wb") as f:
+            f.write(b"x" * 100)
 
 
 class TestTTSService(unittest.TestCase):
+    def setUp(self):
+        self.original_audio_dir = Config.AUDIO_DIR
+        Config.AUDIO_DIR = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(Config.AUDIO_DIR)
+        Config.AUDIO_DIR = self.original_audio_dir
+
     def test_create_audio_response(self):
         # 실제로 파일이 생성되는지 여부만 테스트 (환경에 따라 실패할 수 있음)
         url = create_audio_response("테스트 음성입니다.", {})
         self.assertTrue(url is None or url.startswith("/static/audio/"))
 
 
+class TestSplitText(unittest.TestCase):
+    def test_groups_sentences_up_to_max_length(self):
+        text = "첫 문장입니다. 두 번째 문장! 세 번째 문장인가요? 마지막"
+        self.assertEqual(
+            split_text(text, max_length=20),
+            ["첫 문장입니다. 두 번째 문장!", "세 번째 문장인가요? 마지막"],
+        )
+
+    def test_long_text_is_not_truncated(self):
+        text = "가나다라마바사. " * 1000
+        chunks = split_text(text, max_length=300)
+        self.assertTrue(all(len(chunk) <= 300 for chunk in chunks))
+        self.assertEqual("".join(chunks).replace(" ", ""), text.replace(" ", ""))
+
+    def test_splits_overlong_sentence(self):
+        self.assertEqual(
+            split_text("가" * 25, max_length=10), ["가" * 10, "가" * 10, "가" * 5]
+        )
+
+
+class TestTTSCache(unittest.TestCase):
+    def setUp(self):
+        self.original_audio_dir = Config.AUDIO_DIR
+        self.original_max_bytes = Config.TTS_CACHE_MAX_BYTES
+        Config.AUDIO_DIR = tempfile.mkdtemp()
+        FakeNaverTTS.calls = 0
+        self.patches = [
+            mock.patch.object(tts_service, "NaverTTS", FakeNaverTTS),
+            mock.patch.object(tts_service, "_cache_index", OrderedDict()),
+            mock.patch.object(tts_service, "_cache_index_loaded", False),
+            mock.patch.dict(
+                tts_service._cache_stats, {"hits": 0, "misses": 0, "evictions": 0}
+            ),
+        ]
+        for patch in self.patches:
+            patch.start()
+
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+        shutil.rmtree(Config.AUDIO_DIR)
+        Config.AUDIO_DIR = self.original_audio_dir
+        Config.TTS_CACHE_MAX_BYTES = self.original_max_bytes
+
+    def test_identical_text_reuses_audio(self):
+        first = create_audio_response("안녕하세요.", {"response_length": "normal"})
+        second = create_audio_response("  안녕하세요.  ", {"response_length": "normal"})
+        self.assertEqual(first, second)
+        self.assertEqual(FakeNaverTTS.calls, 1)
+        stats = get_tts_cache_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+
+    def test_style_changes_cache_key(self):
+        first = create_audio_response("안녕하세요.", {"response_length": "normal"})
+        second = create_audio_response("안녕하세요.", {"response_length": "concise"})
+        self.assertNotEqual(first, second)
+        self.assertEqual(FakeNaverTTS.calls, 2)
+
+    def test_cached_playlist_only_when_fully_cached(self):
+        self.assertIsNone(get_cached_playlist("안녕하세요.", {}))
+        url = create_audio_response("안녕하세요.", {})
+        self.assertEqual(get_cached_playlist("안녕하세요.", {}), [url])
+        self.assertEqual(FakeNaverTTS.calls, 1)
+
+    def test_evicts_least_recently_used(self):
+        Config.TTS_CACHE_MAX_BYTES = 250
+        first = create_audio_response("첫 번째.", {})
+        create_audio_response("두 번째.", {})
+        create_audio_response("첫 번째.", {})  # 최근 사용으로 갱신
+        create_audio_response("세 번째.", {})
+
+        files = os.listdir(Config.AUDIO_DIR)
+        self.assertEqual(len(files), 2)
+        self.assertIn(os.path.basename(first), files)
+        self.assertEqual(get_tts_cache_stats()["evictions"], 1)
+
+    def test_playlist_keeps_chunk_order(self):
+        Config_chunk_length = Config.TTS_CHUNK_LENGTH
+        Config.TTS_CHUNK_LENGTH = 10
+        try:
+            completed = []
+            playlist = create_audio_playlist(
+                "첫 번째 문장. 두 번째 문장. 세 번째 문장.",
+                {},
+                on_segment=lambda index, url: completed.append(index),
+            )
+        finally:
+            Config.TTS_CHUNK_LENGTH = Config_chunk_length
+        self.assertEqual(len(playlist), 3)
+        self.assertEqual(len(set(playlist)), 3)
+        self.assertEqual(sorted(completed), [0, 1, 2])
+
+
 if __name__ == "__main__":
     unittest.main()
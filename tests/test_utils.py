@@ -0,0 +1,82 @@
+import unittest
+from datetime import datetime
+from utils import parse_notification_time, parse_notification_times
+
+# 2026-10-18 (일) 14:20:00
+NOW = datetime(2026, 10, 18, 14, 20, 0)
+
+
+def parse(text):
+    return parse_notification_times(text, NOW)
+
+
+class TestParseNotificationTimes(unittest.TestCase):
+    def test_korean_relative(self):
+        self.assertEqual(parse("5분 뒤에 알려줘"), [300])
+        self.assertEqual(parse("30초 후에 알려줘"), [30])
+        self.assertEqual(parse("1시간 30분 뒤에 알려줘"), [5400])
+        self.assertEqual(parse("두 시간 반 있다가 알려줘"), [9000])
+        self.assertEqual(parse("1.5시간 뒤에 깨워줘"), [5400])
+        self.assertEqual(parse("2일 뒤 알림"), [172800])
+
+    def test_english_relative(self):
+        self.assertEqual(parse("remind me in 30 minutes"), [1800])
+        self.assertEqual(parse("remind me 30 minutes later"), [1800])
+        self.assertEqual(parse("remind me in 1 hour and 30 minutes"), [5400])
+        self.assertEqual(parse("notify me 2 hours, 15 minutes from now"), [8100])
+        self.assertEqual(parse("remind me in 1h30m"), [5400])
+        self.assertEqual(parse("In half an hour, wake me up"), [1800])
+        self.assertEqual(parse("remind me an hour later"), [3600])
+
+    def test_korean_clock_time(self):
+        self.assertEqual(parse("내일 오전 9시에 알려줘"), [67200])  # 내일 09:00
+        self.assertEqual(parse("오후 3시 30분에 알려줘"), [4200])  # 오늘 15:30
+        self.assertEqual(parse("3시 반에 깨워줘"), [4200])  # 오늘 15:30
+        self.assertEqual(parse("13시에 알려줘"), [81600])  # 내일 13:00
+        self.assertEqual(parse("내일 3시에 알려줘"), [88800])  # 내일 15:00
+        self.assertEqual(parse("밤 12시에 알려줘"), [34800])  # 자정
+        self.assertEqual(parse("밤 1시에 알려줘"), [38400])  # 내일 01:00
+        self.assertEqual(parse("열한 시에 알려줘"), [31200])  # 오늘 23:00
+
+    def test_english_clock_time(self):
+        self.assertEqual(parse("remind me tomorrow at 9:30pm"), [112200])
+        self.assertEqual(parse("remind me at 7am"), [60000])
+        self.assertEqual(parse("wake me at 5 p.m. tomorrow"), [96000])
+
+    def test_multiple_reminders(self):
+        self.assertEqual(parse("5분 뒤랑 10분 뒤에 알려줘"), [300, 600])
+        self.assertEqual(
+            parse("in 5 minutes and again tomorrow at 9am remind me"), [300, 67200]
+        )
+        self.assertEqual(parse("5분 뒤, 그리고 5분 후에 알려줘"), [300])
+
+    def test_ignores_non_reminders(self):
+        self.assertEqual(parse("파이썬의 sorted 함수 설명해줘"), [])
+        self.assertEqual(parse("3시에 회의가 있어"), [])
+        self.assertEqual(parse("내일 오전 9시"), [])
+        self.assertEqual(parse("세일 뒤에 뭐 사지?"), [])
+        self.assertEqual(parse("as soon as possible, and in a mess"), [])
+        self.assertEqual(parse("오늘 오전 9시에 알려줘"), [])  # 이미 지난 시각
+        self.assertEqual(parse("remind me at 25:00"), [])
+
+    def test_requires_reminder_request(self):
+        # 시간 표현만 있고 알림 요청이 없는 일반 질문
+        self.assertEqual(parse("Can I learn Python in 3 days?"), [])
+        self.assertEqual(parse("What happened 2 hours later in the movie?"), [])
+        self.assertEqual(parse("파이썬을 3일 후에 시작하려는데 뭐부터 할까?"), [])
+        self.assertEqual(parse("I run 5 km in 20 min"), [])
+        self.assertEqual(parse("30초 후"), [])
+
+    def test_ignores_huge_numbers(self):
+        self.assertEqual(parse("9" * 400 + "일 뒤 알려줘"), [])
+        self.assertEqual(parse("remind me in " + "9" * 400 + " days"), [])
+        self.assertEqual(parse("1234567분 뒤에 알려줘"), [])
+        self.assertEqual(parse("999999초 뒤에 알려줘"), [999999])
+
+    def test_parse_notification_time_returns_first(self):
+        self.assertEqual(parse_notification_time("10초 뒤, 1분 뒤에 알려줘"), 10)
+        self.assertIsNone(parse_notification_time("안녕하세요"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import time
+import asyncio
+import threading
+import unittest
+from asgiref.wsgi import WsgiToAsgi
+from services.wsgi_pool_service import ThreadPoolWsgiToAsgi
+
+
+def make_slow_app(delay, spans):
+    lock = threading.Lock()
+
+    def slow_app(environ, start_response):
+        started = time.perf_counter()
+        time.sleep(delay)
+        with lock:
+            spans.append((started, time.perf_counter()))
+        start_response("200 OK", [("Content-Type", "text/plain")])
+        return [b"ok"]
+
+    return slow_app
+
+
+async def call(application):
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/slow",
+        "query_string": b"",
+        "http_version": "1.1",
+        "headers": [],
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await application(scope, receive, send)
+    return messages
+
+
+def run_concurrently(application, count):
+    async def main():
+        return await asyncio.gather(*(call(application) for _ in range(count)))
+
+    return asyncio.run(main())
+
+
+class TestThreadPoolWsgiToAsgi(unittest.TestCase):
+    def test_slow_requests_overlap(self):
+        spans = []
+        application = ThreadPoolWsgiToAsgi(make_slow_app(0.3, spans), max_workers=4)
+        try:
+            results = run_concurrently(application, 2)
+        finally:
+            application.shutdown()
+
+        for messages in results:
+            self.assertEqual(messages[0]["status"], 200)
+            self.assertEqual(messages[1]["body"], b"ok")
+        (first_start, first_end), (second_start, _) = sorted(spans)
+        self.assertLess(second_start, first_end)
+
+    def test_plain_wsgi_to_asgi_runs_serially(self):
+        # 비교용: asgiref 기본 어댑터는 요청을 한 스레드에서 차례로 처리
+        spans = []
+        run_concurrently(WsgiToAsgi(make_slow_app(0.1, spans)), 2)
+        (_, first_end), (second_start, _) = sorted(spans)
+        self.assertGreaterEqual(second_start, first_end)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,40 +3,205 @@
 """
 
 import re
+from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
 
-
-def parse_notification_time(text: str) -> Optional[int]:
-    """자연어에서 알림 시간을 파싱하여 초 단위로 반환"""
-    time_pattern = r"(\d+)\s*(분|초|시간)\s*뒤"
-    match = re.search(time_pattern, text)
-    if not match:
+# 알림 시간 표현
+# /ask 요청마다 실행되므로 모든 표현을 정규식 하나로 미리 컴파일해 두고 입력을 한 번만 훑는다.
+# - 상대 시간: "1시간 30분 뒤", "두 시간 반 후", "in 1 hour and 30 minutes", "30 minutes later"
+# - 절대 시각: "내일 오전 9시", "3시 반에", "tomorrow at 9:30pm", "at 7am"
+# 시간 표현만으로는 알림으로 보지 않고 "알려줘", "remind" 같은 알림 요청 표현이 함께 있어야 함
+# ("3일 후에 시작하려는데", "2 hours later in the movie" 같은 일반 질문 제외)
+
+_NATIVE_NUMBERS = {
+    "한": 1, "두": 2, "세": 3, "네": 4, "다섯": 5, "여섯": 6,
+    "일곱": 7, "여덟": 8, "아홉": 9, "열": 10, "열한": 11, "열두": 12,
+}  # fmt: skip
+# 긴 것부터 (열한 시간이 열 시간으로 잘리지 않도록), 다른 낱말의 일부는 제외
+_NATIVE = "(?<![가-힣])(?:{})".format(
+    "|".join(sorted(_NATIVE_NUMBERS, key=len, reverse=True))
+)
+
+# 자릿수를 제한해 아주 긴 숫자가 무한대(float)가 되지 않도록 함 (더 긴 숫자는 시간으로 보지 않음)
+_NUMBER = r"(?<![\d.])\d{1,6}(?:\.\d{1,3})?(?![\d.])"
+_KO_PART = rf"(?:{_NUMBER}\s*(?:일|시간|분|초)|{_NATIVE}\s*시간)(?:\s*반)?"
+_EN_UNIT = r"(?:days?|d|hours?|hrs?|h|minutes?|mins?|m|seconds?|secs?|s)(?![a-z])"
+_EN_PART = rf"(?:half\s+an?\s+hour|(?:{_NUMBER}\s*|\ban?\s+){_EN_UNIT})"
+_EN_DURATION = rf"{_EN_PART}(?:(?:\s*,\s*|\s+and\s+|\s*){_EN_PART})*"
+
+_NOTIFICATION_PATTERN = re.compile(
+    rf"""
+    (?P<ko_rel>(?:{_KO_PART}\s*)+)(?:뒤|후|있다가|지나서)
+    | \b(?:in|after)\s+(?P<en_in>{_EN_DURATION})
+    | (?P<en_later>{_EN_DURATION})\s+(?:later|from\s+now)\b
+    | (?P<ko_abs>
+        (?:(?P<ko_day>오늘|내일|모레)\s*)?
+        (?:(?P<ko_period>오전|오후|아침|낮|저녁|밤|새벽)\s*)?
+        (?P<ko_hour>\d{{1,2}}|{_NATIVE})\s*시(?!간)
+        (?:\s*(?:(?P<ko_minute>\d{{1,2}})\s*분|(?P<ko_half>반)))?
+      )
+    | (?P<en_abs>
+        (?:\b(?P<en_day>today|tomorrow)\s+)?
+        (?:\bat\s+(?P<en_at_hour>\d{{1,2}})|(?P<en_hour>\d{{1,2}})(?=(?::\d{{2}})?\s*[ap]\.?m\b))
+        (?::(?P<en_minute>\d{{2}}))?
+        (?:\s*(?P<en_period>[ap])\.?m\b\.?)?
+        (?:\s+(?P<en_day_after>today|tomorrow)\b)?
+      )
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+_KO_PART_PATTERN = re.compile(rf"({_NUMBER}|{_NATIVE})\s*(일|시간|분|초)(\s*반)?")
+_EN_PART_PATTERN = re.compile(
+    rf"(half\s+an?\s+hour)|(?:({_NUMBER})\s*|\b(an?)\s+)({_EN_UNIT})", re.IGNORECASE
+)
+# 모든 알림 표현에 들어 있는 글자 (대부분의 질문은 이것만 확인하고 끝남)
+_NOTIFICATION_HINT = re.compile(r"\d|시|half|\ban?\s+[dhms]", re.IGNORECASE)
+_REMINDER_REQUEST = re.compile(
+    r"알려|알림|깨워|리마인드|remind|notify|alert|wake", re.IGNORECASE
+)
+
+_UNIT_SECONDS = {
+    "일": 86400, "시간": 3600, "분": 60, "초": 1,
+    "d": 86400, "h": 3600, "m": 60, "s": 1,
+}  # fmt: skip
+_DAY_OFFSETS = {"오늘": 0, "내일": 1, "모레": 2, "today": 0, "tomorrow": 1}
+_KO_PERIODS = {
+    "오전": "am", "아침": "am", "새벽": "am",
+    "오후": "pm", "낮": "pm", "저녁": "pm", "밤": "pm",
+}  # fmt: skip
+
+
+def _to_number(word: str) -> float:
+    if word[0].isdigit():
+        return float(word)
+    if word.lower() in ("a", "an"):
+        return 1
+    return _NATIVE_NUMBERS[word]
+
+
+def _korean_duration(text: str) -> int:
+    seconds = 0
+    for number, unit, half in _KO_PART_PATTERN.findall(text):
+        unit_seconds = _UNIT_SECONDS[unit]
+        seconds += _to_number(number) * unit_seconds
+        if half:
+            seconds += unit_seconds // 2
+    return int(seconds)
+
+
+def _english_duration(text: str) -> int:
+    seconds = 0
+    for half_hour, number, article, unit in _EN_PART_PATTERN.findall(text):
+        if half_hour:
+            seconds += 1800
+        else:
+            seconds += _to_number(number or article) * _UNIT_SECONDS[unit[0].lower()]
+    return int(seconds)
+
+
+def _clock_delay(
+    now: datetime,
+    hour: int,
+    minute: int,
+    day: Optional[str],
+    period: Optional[str],
+) -> Optional[int]:
+    """지정한 시각까지 남은 초 (지난 시각이거나 잘못된 시각이면 None)"""
+    if hour > 24 or minute >= 60:
         return None
+    if period == "am" and hour == 12:
+        hour = 0
+    elif period == "pm" and hour < 12:
+        hour += 12
+
+    if day is None:
+        # 날짜가 없으면 가장 가까운 다음 시각 (오전/오후가 없으면 둘 다 후보)
+        days = [0, 1]
+        hours = [hour, hour + 12] if period is None and hour < 12 else [hour]
+    else:
+        # 날짜만 있으면 1~6시는 오후로 봄 ("내일 3시" -> 15시)
+        days = [_DAY_OFFSETS[day.lower()]]
+        hours = [hour + 12 if period is None and 1 <= hour <= 6 else hour]
+
+    midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    candidates = sorted(
+        midnight + timedelta(days=d, hours=h, minutes=minute)
+        for d in days
+        for h in hours
+    )
+    for candidate in candidates:
+        if candidate > now:
+            return int((candidate - now).total_seconds())
+    return None
 
-    number = int(match.group(1))
-    unit = match.group(2)
 
-    # 초 단위로 변환
-    if unit == "초":
-        return number
-    elif unit == "분":
-        return number * 60
-    elif unit == "시간":
-        return number * 3600
+def _korean_clock_delay(match: re.Match, now: datetime) -> Optional[int]:
+    hour = int(_to_number(match.group("ko_hour")))
+    label = match.group("ko_period")
+    period = _KO_PERIODS.get(label)
+    if label == "밤":
+        # "밤 12시"는 자정, "밤 1시"는 새벽 1시
+        if hour == 12:
+            hour, period = 24, None
+        elif hour < 6:
+            period = "am"
+    if match.group("ko_half"):
+        minute = 30
+    else:
+        minute = int(match.group("ko_minute") or 0)
+    return _clock_delay(now, hour, minute, match.group("ko_day"), period)
+
+
+def _english_clock_delay(match: re.Match, now: datetime) -> Optional[int]:
+    hour = int(match.group("en_at_hour") or match.group("en_hour"))
+    minute = int(match.group("en_minute") or 0)
+    period = match.group("en_period")
+    day = match.group("en_day") or match.group("en_day_after")
+    return _clock_delay(now, hour, minute, day, period and f"{period.lower()}m")
+
+
+def parse_notification_times(text: str, now: Optional[datetime] = None) -> List[int]:
+    """자연어에서 알림 시간을 모두 찾아 초 단위 목록으로 반환 (나온 순서, 중복 제거)
+
+    절대 시각은 서버의 현지 시각(now) 기준으로 계산한다.
+    """
+    delays: List[int] = []
+    if not _NOTIFICATION_HINT.search(text) or not _REMINDER_REQUEST.search(text):
+        return delays
+    for match in _NOTIFICATION_PATTERN.finditer(text):
+        if match.group("ko_rel"):
+            delay = _korean_duration(match.group("ko_rel"))
+        elif match.group("en_in") or match.group("en_later"):
+            delay = _english_duration(match.group("en_in") or match.group("en_later"))
+        else:
+            now = now or datetime.now()
+            if match.group("ko_abs"):
+                delay = _korean_clock_delay(match, now)
+            else:
+                delay = _english_clock_delay(match, now)
+
+        if delay and delay not in delays:
+            delays.append(delay)
+    return delays
 
-    return None
+
+def parse_notification_time(text: str) -> Optional[int]:
+    """자연어에서 첫 번째 알림 시간을 파싱하여 초 단위로 반환"""
+    delays = parse_notification_times(text)
+    return delays[0] if delays else None
 
 
 def search_in_conversation(
     history: List[Dict[str, Any]], query: str
 ) -> List[Dict[str, Any]]:
-    """대화 기록에서 키워드 검색"""
+    """대화 기록에서 키워드 검색 (검색어는 정규식이 아닌 일반 문자열로 취급)"""
     if not query.strip():
         return []
 
+    needle = query.lower()
     results = []
     for i, msg in enumerate(history):
-        if re.search(query, msg["content"], re.IGNORECASE):
+        if needle in msg["content"].lower():
             # 검색 결과에 앞뒤 문맥 포함
             context = {
                 "before": history[i - 1] if i > 0 else None,